@@ -0,0 +1,58 @@
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_formatter import DataFormatter
+from src.iconicity_model import IconicityModel
+
+def dict_loop_by_rating(word_data, min_rating=None, max_rating=None):
+    """
+    Filtrado por rating recorriendo el diccionario de diccionarios (implementación anterior).
+    """
+    filtered_words = {}
+    for word, data in word_data.items():
+        rating = data['rating']
+        if (min_rating is None or rating >= min_rating) and \
+           (max_rating is None or rating <= max_rating):
+            filtered_words[word] = data
+    return filtered_words
+
+def time_queries(query, ranges, repetitions):
+    """
+    Ejecuta la consulta para cada rango repetidas veces y devuelve los segundos por consulta.
+    """
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        for min_value, max_value in ranges:
+            query(min_value, max_value)
+    return (time.perf_counter() - start) / (repetitions * len(ranges))
+
+def main(csv_path='iconicity_ratings_cleaned.csv', repetitions=20):
+    """Compara consultas por rango repetidas sobre el modelo indexado y sobre dicts."""
+    formatter = DataFormatter()
+    csv_data = formatter.format_csv_data_from(csv_path)
+    model = IconicityModel(csv_data)
+    word_data = model.get_all_word_data()
+    
+    # Rangos estrechos (pocas palabras) y anchos (muchas palabras)
+    narrow_ranges = [(r, r + 0.05) for r in (1.0, 2.0, 3.0, 4.0, 5.0, 6.0)]
+    wide_ranges = [(1.0, 4.0), (3.0, None)]
+    
+    print(f"\nPalabras en el modelo: {len(model.get_all_words())}")
+    for name, ranges in [('estrechos', narrow_ranges), ('anchos', wide_ranges)]:
+        dict_time = time_queries(lambda a, b: dict_loop_by_rating(word_data, a, b), ranges, repetitions)
+        array_time = time_queries(model.get_words_by_rating, ranges, repetitions)
+        print(f"\nRangos {name}:")
+        print(f"  Bucle sobre dict:   {dict_time * 1000:.3f} ms por consulta")
+        print(f"  Índice ordenado:    {array_time * 1000:.3f} ms por consulta")
+        print(f"  Aceleración:        {dict_time / array_time:.1f}x")
+    
+    top_time = time_queries(lambda a, b: model.get_top_words('rating', 50), [(None, None)], repetitions * 10)
+    combined_time = time_queries(lambda a, b: model.query(rating=(a, b), prop_known=(0.9, None)),
+                                 narrow_ranges, repetitions)
+    print(f"\nTop-50 por rating:                  {top_time * 1000:.3f} ms por consulta")
+    print(f"Rango de rating y prop_known >= 0.9: {combined_time * 1000:.3f} ms por consulta")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import sys
+import os
+import subprocess
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def time_import(statement, repetitions):
+    """
+    Ejecuta la importación en un intérprete nuevo repetidas veces y devuelve los segundos
+    por ejecución (incluye el arranque del intérprete).
+    """
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        subprocess.run([sys.executable, '-c', statement], cwd=ROOT_DIR, check=True)
+    return (time.perf_counter() - start) / repetitions
+
+def main(repetitions=5):
+    """Compara el tiempo de importación del plotter con el de las librerías de gráficas."""
+    baseline = time_import('pass', repetitions)
+    plotter = time_import('import src.data_analysis_plotter', repetitions)
+    stats_only = time_import('from src.data_analysis_plotter import print_valid_words_statistics', repetitions)
+    plotting_libraries = time_import('import matplotlib.pyplot, seaborn, pandas', repetitions)
+    
+    print(f"\nArranque del intérprete:               {baseline * 1000:.0f} ms")
+    print(f"Importar src.data_analysis_plotter:    {(plotter - baseline) * 1000:.0f} ms")
+    print(f"Importar print_valid_words_statistics: {(stats_only - baseline) * 1000:.0f} ms")
+    print(f"matplotlib.pyplot + seaborn + pandas:  {(plotting_libraries - baseline) * 1000:.0f} ms "
+          "(se pagan en la primera gráfica)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import sys
+import os
+import random
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.iconicity_model import IconicityModel
+from src.columnar_dictionary_merger import ColumnarDictionaryMerger
+from src.word_dictionary_merger import WordDictionaryMerger
+
+def union_then_intersect_merge(dictionaries):
+    """
+    Merge construyendo la unión de todas las claves e intersecando contra cada
+    diccionario (implementación anterior).
+    """
+    if not dictionaries:
+        return {}, []
+    all_words = set()
+    for dictionary in dictionaries:
+        all_words.update(dictionary.keys())
+    common_words = set(all_words)
+    for dictionary in dictionaries:
+        common_words.intersection_update(dictionary.keys())
+    merged_dict = {}
+    for word in common_words:
+        merged_data = {}
+        for dictionary in dictionaries:
+            merged_data.update(dictionary[word])
+        merged_dict[word] = merged_data
+    unmerged_dictionaries = []
+    for dictionary in dictionaries:
+        unmerged_dict = {}
+        for word, data in dictionary.items():
+            if word not in common_words:
+                unmerged_dict[word] = data
+        if unmerged_dict:
+            unmerged_dictionaries.append(unmerged_dict)
+    return merged_dict, unmerged_dictionaries
+
+def file_count_dictionaries(words, num_files, words_per_file, seed=0):
+    """
+    Genera diccionarios de conteos por archivo: palabras frecuentes del modelo
+    (presentes en todos los archivos) más una muestra aleatoria del resto y
+    palabras que no están en el modelo.
+    """
+    rng = random.Random(seed)
+    frequent = words[:50]
+    dictionaries = []
+    for file_number in range(num_files):
+        sample = frequent + rng.sample(words, words_per_file)
+        sample += [f'token{file_number}_{i}' for i in range(words_per_file // 5)]
+        dictionaries.append({word: {f'count_{file_number}': rng.randint(1, 50)} for word in sample})
+    return dictionaries
+
+def time_call(function, repetitions):
+    """
+    Ejecuta la función repetidas veces y devuelve los segundos por llamada.
+    """
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        function()
+    return (time.perf_counter() - start) / repetitions
+
+def main(csv_path='iconicity_ratings_cleaned.csv', repetitions=5):
+    """Compara el merge del diccionario de iconicidad con decenas de diccionarios de conteos."""
+    model = IconicityModel.from_csv(csv_path)
+    iconicity_dict = model.get_all_word_data()
+    words = model.get_all_words()
+    
+    for num_files in (12, 48):
+        dictionaries = [iconicity_dict] + file_count_dictionaries(words, num_files, 500)
+        
+        def merge_incrementally():
+            merger = WordDictionaryMerger()
+            for dictionary in dictionaries:
+                merger.add_dictionary(dictionary)
+            return merger.obtain_merge()
+        
+        old_time = time_call(lambda: union_then_intersect_merge(dictionaries), repetitions)
+        new_time = time_call(merge_incrementally, repetitions)
+        merged, unmerged = merge_incrementally()
+        print(f"\nIconicidad + {num_files} archivos de conteos "
+              f"({len(merged)} palabras mergeadas, {len(unmerged)} diccionarios no mergeados):")
+        print(f"  Unión e intersección:       {old_time * 1000:.1f} ms por merge")
+        print(f"  Merge incremental:          {new_time * 1000:.1f} ms por merge")
+        print(f"  Aceleración:                {old_time / new_time:.1f}x")
+        
+        columnar = ColumnarDictionaryMerger()
+        for dictionary in dictionaries:
+            columnar.add_dictionary(dictionary)
+        join_time = time_call(lambda: columnar.obtain_merge(as_dict=False), repetitions)
+        columnar_dict_time = time_call(columnar.obtain_merge, repetitions)
+        print(f"  Join por columnas (sin convertir a dict): {join_time * 1000:.1f} ms por merge")
+        print(f"  Join por columnas (convirtiendo a dict):  {columnar_dict_time * 1000:.1f} ms por merge")
+        
+        # Añadir un archivo más a un merge existente y volver a obtenerlo
+        merger = WordDictionaryMerger()
+        for dictionary in dictionaries:
+            merger.add_dictionary(dictionary)
+        extra = file_count_dictionaries(words, 1, 500, seed=num_files)[0]
+        start = time.perf_counter()
+        merger.add_dictionary(extra)
+        add_time = time.perf_counter() - start
+        # obtain_merge devuelve copias, así que su coste es proporcional al resultado
+        obtain_time = time_call(merger.obtain_merge, repetitions)
+        recompute_time = time_call(lambda: union_then_intersect_merge(dictionaries + [extra]), repetitions)
+        print(f"  Añadir un archivo más:      {add_time * 1000:.3f} ms "
+              f"(copiar el merge: {obtain_time * 1000:.1f} ms, recalcular todo: {recompute_time * 1000:.1f} ms)")
+
+    # Top-50 por rating frente a ordenar todo el diccionario
+    merger = WordDictionaryMerger()
+    merger.add_dictionary(iconicity_dict)
+    merger.query([('rating', 'desc')], limit=50)
+    sort_time = time_call(lambda: list(merger.sort_by_parameter('rating', 'gt'))[:50], repetitions)
+    query_time = time_call(lambda: merger.query([('rating', 'desc'), ('prop_known', 'desc')],
+                                                filters={'prop_known': ('ge', 0.9)}, limit=50),
+                           repetitions)
+    print(f"\nTop-50 por rating ({len(iconicity_dict)} palabras):")
+    print(f"  sort_by_parameter completo: {sort_time * 1000:.1f} ms")
+    print(f"  query con límite:           {query_time * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
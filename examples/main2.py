@@ -1,5 +1,7 @@
+import logging
 import sys
 import os
+import numpy as np
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from examples.initialize_corpuses import main as initialize_corpuses
@@ -7,7 +9,7 @@ from src.corpus_manipulator import CorpusManipulator
 from src.data_formatter import DataFormatter
 from src.iconicity_model import IconicityModel
 from src.reader import Reader
-from src.word_counter import WordCounter
+from src.word_counter import GroupedWordCounter
 from src.word_dictionary_merger import WordDictionaryMerger
 from src.data_analysis_plotter import DataAnalysisPlotter
 
@@ -129,23 +131,20 @@ def create_age_group_statistics(data_grouped_by_age, iconicity_model):
     all_iconicity_words = iconicity_model.get_all_word_data()
     
     for age_group, data in data_grouped_by_age.items():
-        # Crear contadores de palabras para niños y adultos
-        children_counter = WordCounter()
-        adults_counter = WordCounter()
-        
-        # Contar palabras de niños
-        for utterance in data['children_data'].values():
-            children_counter.count_words(utterance['text'])
-        
-        # Contar palabras de adultos
-        for utterance in data['adults_data'].values():
-            adults_counter.count_words(utterance['text'])
+        # Contar palabras de niños y adultos (y de cada hablante) en una sola pasada
+        grouped_counter = GroupedWordCounter()
+        grouped_counter.count_utterances(
+            [dict(utterance, role='children') for utterance in data['children_data'].values()] +
+            [dict(utterance, role='adults') for utterance in data['adults_data'].values()]
+        )
+        role_counts = grouped_counter.get_role_counts()
         
         # Crear entrada en el diccionario
         age_group_stats[age_group] = {
             'age_group': age_group,
-            'children_counted_words': children_counter.get_word_counts(),
-            'adults_counted_words': adults_counter.get_word_counts(),
+            'children_counted_words': role_counts.get('children', {}),
+            'adults_counted_words': role_counts.get('adults', {}),
+            'speaker_counted_words': grouped_counter.get_speaker_counts(),
             'all_iconicity_words': all_iconicity_words
         }
     
@@ -185,6 +184,38 @@ def print_age_group_statistics(age_group_stats, num_words=10):
         print(f"  Palabras con iconicidad usadas por adultos: {len(adults_iconic)}")
         print("-" * 50)
 
+def classify_counted_words(counted_words, iconicity_model):
+    """
+    Clasifica las palabras contadas de un grupo en icónicas y no icónicas con una
+    sola búsqueda vectorizada en el modelo de iconicidad.
+    
+    Args:
+        counted_words (dict): Conteos {palabra: {'count': int}}
+        iconicity_model (IconicityModel): Modelo de iconicidad
+    
+    Returns:
+        dict: Estadísticas de palabras icónicas y no icónicas del grupo
+    """
+    words = list(counted_words)
+    counts = np.fromiter((data['count'] for data in counted_words.values()),
+                         dtype=np.int64, count=len(words))
+    ratings, found = iconicity_model.lookup_many(words)
+    iconic_indices = np.flatnonzero(found).tolist()
+    non_iconic_indices = np.flatnonzero(~found).tolist()
+    counts_list = counts.tolist()
+    ratings_list = ratings.tolist()
+    return {
+        'total_words': int(counts.sum()),
+        'iconic_words': {words[i]: {'count': counts_list[i], 'rating': ratings_list[i]}
+                         for i in iconic_indices},
+        'non_iconic_words': {words[i]: counts_list[i] for i in non_iconic_indices},
+        'total_iconic_occurrences': int(counts[found].sum()),
+        'total_non_iconic_occurrences': int(counts[~found].sum()),
+        'unique_iconic_words': {words[i] for i in iconic_indices},
+        'unique_non_iconic_words': {words[i] for i in non_iconic_indices},
+        'rating_stats': iconicity_model.weighted_rating_stats(counted_words)
+    }
+
 def process_valid_words_by_age_group(age_group_stats, iconicity_model):
     """
     Procesa las palabras válidas por grupo de edad, clasificándolas en icónicas y no icónicas.
@@ -197,64 +228,12 @@ def process_valid_words_by_age_group(age_group_stats, iconicity_model):
         dict: Estadísticas de palabras válidas por grupo de edad
     """
     valid_words_stats = {}
-    all_iconicity_words = iconicity_model.get_all_word_data()
     
     for age_group, stats in age_group_stats.items():
-        # Inicializar contadores para este grupo de edad
-        group_stats = {
-            'adults': {
-                'total_words': 0,
-                'iconic_words': {},
-                'non_iconic_words': {},
-                'total_iconic_occurrences': 0,
-                'total_non_iconic_occurrences': 0,
-                'unique_iconic_words': set(),
-                'unique_non_iconic_words': set()
-            },
-            'children': {
-                'total_words': 0,
-                'iconic_words': {},
-                'non_iconic_words': {},
-                'total_iconic_occurrences': 0,
-                'total_non_iconic_occurrences': 0,
-                'unique_iconic_words': set(),
-                'unique_non_iconic_words': set()
-            }
+        valid_words_stats[age_group] = {
+            'adults': classify_counted_words(stats['adults_counted_words'], iconicity_model),
+            'children': classify_counted_words(stats['children_counted_words'], iconicity_model)
         }
-        
-        # Procesar palabras de adultos
-        for word, count_data in stats['adults_counted_words'].items():
-            count = count_data['count']
-            group_stats['adults']['total_words'] += count
-            if word in all_iconicity_words:
-                group_stats['adults']['iconic_words'][word] = {
-                    'count': count,
-                    'rating': all_iconicity_words[word]['rating']
-                }
-                group_stats['adults']['total_iconic_occurrences'] += count
-                group_stats['adults']['unique_iconic_words'].add(word)
-            else:
-                group_stats['adults']['non_iconic_words'][word] = count
-                group_stats['adults']['total_non_iconic_occurrences'] += count
-                group_stats['adults']['unique_non_iconic_words'].add(word)
-        
-        # Procesar palabras de niños
-        for word, count_data in stats['children_counted_words'].items():
-            count = count_data['count']
-            group_stats['children']['total_words'] += count
-            if word in all_iconicity_words:
-                group_stats['children']['iconic_words'][word] = {
-                    'count': count,
-                    'rating': all_iconicity_words[word]['rating']
-                }
-                group_stats['children']['total_iconic_occurrences'] += count
-                group_stats['children']['unique_iconic_words'].add(word)
-            else:
-                group_stats['children']['non_iconic_words'][word] = count
-                group_stats['children']['total_non_iconic_occurrences'] += count
-                group_stats['children']['unique_non_iconic_words'].add(word)
-        
-        valid_words_stats[age_group] = group_stats
     
     return valid_words_stats
 
@@ -280,6 +259,9 @@ def print_valid_words_statistics(valid_words_stats):
         print(f"  Número total de ocurrencias de palabras no icónicas: {total_non_iconic_occurrences_adults}")
         print(f"  Número de palabras icónicas diferentes: {len(stats['adults']['iconic_words'])}")
         print(f"  Número de palabras no icónicas diferentes: {len(stats['adults']['non_iconic_words'])}")
+        rating_stats = stats['adults']['rating_stats']
+        print(f"  Iconicidad media ponderada: {rating_stats['weighted_mean']:.3f} "
+              f"(DE {rating_stats['weighted_sd']:.3f}, EE {rating_stats['standard_error']:.3f})")
         
         # Estadísticas de niños
         print("\nEstadísticas de niños:")
@@ -293,6 +275,9 @@ def print_valid_words_statistics(valid_words_stats):
         print(f"  Número total de ocurrencias de palabras no icónicas: {total_non_iconic_occurrences_children}")
         print(f"  Número de palabras icónicas diferentes: {len(stats['children']['iconic_words'])}")
         print(f"  Número de palabras no icónicas diferentes: {len(stats['children']['non_iconic_words'])}")
+        rating_stats = stats['children']['rating_stats']
+        print(f"  Iconicidad media ponderada: {rating_stats['weighted_mean']:.3f} "
+              f"(DE {rating_stats['weighted_sd']:.3f}, EE {rating_stats['standard_error']:.3f})")
         
         # Top 10 palabras icónicas más usadas por adultos
         print("\nTop 10 palabras icónicas más usadas por adultos:")
@@ -469,6 +454,9 @@ def show_lew_early_expressions(processed_data):
 
 def main():
     """Función principal del programa"""
+    # Mostrar los mensajes informativos de los módulos (p. ej. el tiempo de carga del modelo)
+    logging.basicConfig(level=logging.INFO, format='%(name)s - %(message)s')
+    
     # Inicializar los corpus
     print("Inicializando corpus...")
     initialize_corpuses()
@@ -501,9 +489,9 @@ def main():
     
     # Crear el modelo de iconicidad
     print("\nCreando modelo de iconicidad...")
-    formatter = DataFormatter()
-    csv_data = formatter.format_csv_data_from('iconicity_ratings_cleaned.csv')
-    iconicity_model = IconicityModel(csv_data)
+    # Se reutiliza el snapshot binario mientras el CSV no cambie
+    iconicity_model = IconicityModel.load_or_build('iconicity_ratings_cleaned.csv',
+                                                   'iconicity_ratings_cleaned.npz')
     
     # Crear estadísticas por grupo de edad
     print("\nCreando estadísticas por grupo de edad...")
@@ -526,12 +514,10 @@ def main():
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
-    # Gráfica general sin porcentajes
-    plotter.plot_iconic_vs_non_iconic_by_age(os.path.join(output_dir, 'iconic_vs_non_iconic_by_age.png'))
-    
-    # Gráficas separadas con porcentajes
-    plotter.plot_iconic_vs_non_iconic_by_age_adults(os.path.join(output_dir, 'iconic_vs_non_iconic_by_age_adults.png'))
-    plotter.plot_iconic_vs_non_iconic_by_age_children(os.path.join(output_dir, 'iconic_vs_non_iconic_by_age_children.png'))
+    # Gráficas de barras y de distribución de iconicidad, generadas en paralelo sin pantalla
+    pruebas_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pruebas")
+    written_paths = plotter.render_figures(output_dir, distribution_dir=pruebas_dir)
+    print(f"Gráficas generadas: {len(written_paths)}")
     
     # Mostrar porcentajes de palabras icónicas y no icónicas para adultos
     print("\nPorcentajes de palabras icónicas y no icónicas para adultos por grupo de edad:")
@@ -543,10 +529,5 @@ def main():
         print(f"  Palabras icónicas: {iconic_pct:.1f}%")
         print(f"  Palabras no icónicas: {non_iconic_pct:.1f}%")
 
-    # Crear directorio de pruebas y generar gráficas de distribución de iconicidad
-    print("\nGenerando gráficas de distribución de iconicidad...")
-    pruebas_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pruebas")
-    os.makedirs(pruebas_dir, exist_ok=True)
-    plotter.plot_iconicity_distribution_by_age_group(save_dir=pruebas_dir)
 if __name__ == "__main__":
     main()  
@@ -0,0 +1,288 @@
+import math
+import numpy as np
+
+class ColumnarDictionaryMerger:
+    """
+    Alternativa a WordDictionaryMerger que guarda cada diccionario como un DataFrame
+    indexado por palabra y hace los merges como joins por columnas. Los resultados solo
+    se convierten al formato {palabra: {parámetro: valor}} cuando se piden así.
+    
+    A diferencia de WordDictionaryMerger, un parámetro con valor None o NaN se trata como
+    ausente: no aparece en los resultados ni sustituye al valor de otro diccionario.
+    
+    No es más rápido que WordDictionaryMerger, que mantiene el merge de forma incremental:
+    cada join paga un coste fijo de pandas por tabla, y pedir el resultado como
+    diccionarios recorre todas las filas no mergeadas. En benchmarks/bench_word_dictionary_merger.py
+    (iconicidad más 48 archivos de conteos) tarda unas dos veces más sin convertir a
+    diccionarios y unas cinco veces más convirtiéndolos. Conviene cuando se trabaja
+    directamente con las tablas (add_dataframe, join, as_dict=False).
+    """
+    
+    def __init__(self):
+        """
+        Inicializa el merger sin tablas.
+        """
+        self.frames = []
+    
+    def add_dictionary(self, dictionary):
+        """
+        Añade un diccionario {palabra: {parámetro: valor}} convirtiéndolo en un DataFrame.
+        
+        Args:
+            dictionary (dict): Diccionario que tiene strings como claves principales
+        """
+        import pandas as pd
+        
+        if not isinstance(dictionary, dict):
+            raise ValueError("El parámetro debe ser un diccionario")
+        # Desde la lista de registros se conserva el orden de las palabras, que from_dict
+        # no mantiene cuando los registros tienen claves distintas
+        records = list(dictionary.values())
+        df = pd.DataFrame(records, index=list(dictionary))
+        for column in df.columns:
+            # pandas convierte en float las columnas con valores ausentes o con enteros y
+            # float mezclados; las de enteros (int64) y object ya conservan los valores
+            if df[column].dtype.kind == 'f':
+                df[column] = self._typed_column(column, records)
+        self.frames.append(df)
+    
+    @staticmethod
+    def _typed_column(column, records):
+        """
+        Construye una columna numérica sin cambiar el tipo de sus valores: enteros nullable
+        si todos son enteros, float si todos son float y object si se mezclan tipos
+        (pandas convertiría los enteros en float). Los ausentes quedan como NA.
+        
+        Args:
+            column (str): Nombre del parámetro
+            records (list): Registros del diccionario, en orden
+        
+        Returns:
+            pandas.array: Valores de la columna, con NA en los ausentes
+        """
+        import pandas as pd
+        
+        values = [record.get(column) for record in records]
+        types = {type(value) for value in values
+                 if value is not None and not (isinstance(value, float) and math.isnan(value))}
+        if types == {int}:
+            return pd.array(values, dtype='Int64')
+        if types <= {float}:
+            return pd.array([np.nan if value is None else value for value in values], dtype=np.float64)
+        return pd.array(values, dtype=object)
+    
+    def add_dataframe(self, df, word_column=None):
+        """
+        Añade una tabla directamente, sin pasar por un diccionario.
+        
+        Args:
+            df (pandas.DataFrame): Tabla con una fila por palabra
+            word_column (str, optional): Columna con la palabra; si es None se usa el índice
+        """
+        if word_column is not None:
+            df = df.set_index(word_column)
+        if not df.index.is_unique:
+            raise ValueError("La tabla tiene palabras repetidas")
+        self.frames.append(df)
+    
+    def _joined_index(self, how):
+        """
+        Calcula las palabras del join: las comunes a todas las tablas en el orden de la
+        primera ('inner') o todas en orden de aparición ('outer').
+        """
+        import pandas as pd
+        
+        if how == 'inner':
+            # Intersecar desde la tabla más pequeña y recuperar después el orden de la primera.
+            # get_indexer reutiliza la tabla hash de cada índice, así que cada paso cuesta
+            # lo que el conjunto de palabras comunes, no lo que la tabla
+            frames = sorted(self.frames, key=len)
+            common = frames[0].index.to_numpy()
+            for frame in frames[1:]:
+                if len(common) == 0:
+                    break
+                common = common[frame.index.get_indexer(common) >= 0]
+            first_index = self.frames[0].index
+            return first_index.take(np.sort(first_index.get_indexer(common)))
+        if how == 'outer':
+            words = np.concatenate([frame.index.to_numpy(dtype=object) for frame in self.frames])
+            return pd.Index(pd.unique(words))
+        raise ValueError("how debe ser 'inner' u 'outer'")
+    
+    def join(self, how='inner'):
+        """
+        Une todas las tablas por palabra. Si varias tablas tienen la misma columna, gana
+        el valor de la última que lo tiene. Las columnas de enteros pasan a enteros nullable
+        y, si las tablas no coinciden en el tipo de una columna, se une como object, para
+        que los valores conserven su tipo.
+        
+        Args:
+            how (str): 'inner' para las palabras presentes en todas las tablas, 'outer'
+                para las presentes en alguna
+        
+        Returns:
+            pandas.DataFrame: Tabla indexada por palabra con todas las columnas
+        """
+        import pandas as pd
+        
+        if not self.frames:
+            return pd.DataFrame()
+        return self._join(how)[0]
+    
+    def _join(self, how):
+        """
+        Hace el join (ver join) y devuelve también, por cada tabla, la posición de cada
+        palabra del join en sus filas (-1 si no la tiene).
+        """
+        import pandas as pd
+        
+        index = self._joined_index(how)
+        columns = {}
+        positions = []
+        for frame in self.frames:
+            frame_positions = frame.index.get_indexer(index)
+            positions.append(frame_positions)
+            if (frame_positions >= 0).all():
+                # Todas las palabras están en la tabla: se toman sus filas de una vez
+                aligned = frame.take(frame_positions).set_axis(index)
+            else:
+                # Con int64, reindex convertiría en float las columnas con palabras ausentes
+                int_columns = {column: 'Int64' for column, dtype in frame.dtypes.items() if dtype.kind in 'iu'}
+                aligned = (frame.astype(int_columns) if int_columns else frame).reindex(index)
+            for column in aligned.columns:
+                values = aligned[column]
+                previous = columns.get(column)
+                if previous is None:
+                    columns[column] = values
+                    continue
+                if previous.dtype != values.dtype:
+                    previous, values = previous.astype(object), values.astype(object)
+                # Todas las columnas están alineadas con index, así que where conserva su orden
+                columns[column] = values.where(values.notna(), previous)
+        return pd.DataFrame(columns, index=index), positions
+    
+    @staticmethod
+    def _to_records(df):
+        """
+        Convierte una tabla al formato {palabra: {parámetro: valor}}, omitiendo los
+        valores ausentes. Se recorre por columnas, que es mucho más rápido que convertir
+        fila a fila con to_dict.
+        """
+        result = {word: {} for word in df.index.tolist()}
+        records = list(result.values())
+        for column in df.columns:
+            values = df[column]
+            # tolist devuelve escalares de Python (int, float) y no los de NumPy
+            value_list = values.tolist()
+            for position in np.flatnonzero(values.notna().to_numpy()).tolist():
+                records[position][column] = value_list[position]
+        return result
+    
+    def obtain_merge(self, as_dict=True):
+        """
+        Obtiene las palabras comunes a todas las tablas con sus datos mergeados y, por cada
+        tabla, las palabras que no se pudieron mergear (como WordDictionaryMerger.obtain_merge).
+        
+        Args:
+            as_dict (bool): Si es True, se devuelven diccionarios; si es False, DataFrames
+        
+        Returns:
+            tuple: (merged, unmerged) - palabras mergeadas y lista de las tablas no mergeadas
+                   que no están vacías
+        """
+        if not self.frames:
+            return ({}, []) if as_dict else (self.join(), [])
+        merged, positions = self._join('inner')
+        unmerged = []
+        for frame, frame_positions in zip(self.frames, positions):
+            # Las filas de la tabla que no están en el merge
+            keep = np.ones(len(frame), dtype=bool)
+            keep[frame_positions] = False
+            if keep.any():
+                unmerged.append(frame[keep])
+        if not as_dict:
+            return merged, unmerged
+        return self._to_records(merged), [self._to_records(frame) for frame in unmerged]
+    
+    def _numeric_column(self, df, parameter):
+        """
+        Devuelve un parámetro como columna numérica (NaN si falta o no es numérico).
+        """
+        import pandas as pd
+        
+        if parameter not in df.columns:
+            return pd.Series(np.nan, index=df.index)
+        column = df[parameter]
+        if column.dtype == object:
+            # Solo valores int/float, como WordDictionaryMerger (p. ej. 'alto' se descarta)
+            column = column.map(lambda value: value if isinstance(value, (int, float)) else np.nan)
+        column = pd.to_numeric(column, errors='coerce')
+        return pd.Series(column.to_numpy(dtype=np.float64, na_value=np.nan), index=df.index)
+    
+    def query(self, sort_by, filters=None, limit=None, as_dict=True):
+        """
+        Selecciona y ordena palabras de todas las tablas (join 'outer') por varios
+        parámetros, con la misma semántica que WordDictionaryMerger.query.
+        
+        Args:
+            sort_by (list): Claves de ordenación (parámetro, 'desc' o 'asc')
+            filters (dict, optional): Umbrales {parámetro: (operación, umbral)} con operación
+                'gt', 'lt', 'ge', 'le' o 'eq'
+            limit (int, optional): Número máximo de palabras a devolver
+            as_dict (bool): Si es True, se devuelve un diccionario; si es False, un DataFrame
+        
+        Returns:
+            dict or pandas.DataFrame: Palabras seleccionadas en orden
+        """
+        from src.word_dictionary_merger import WordDictionaryMerger
+        
+        operators = WordDictionaryMerger.COMPARISON_OPERATORS
+        if not sort_by:
+            raise ValueError("Debe indicarse al menos una clave de ordenación")
+        for parameter, order in sort_by:
+            if order not in ('desc', 'asc'):
+                raise ValueError(f"Orden no válido para {parameter}: {order}")
+        filters = filters or {}
+        for parameter, (comparison_op, _) in filters.items():
+            if comparison_op not in operators:
+                raise ValueError(f"Operación de comparación no válida para {parameter}: {comparison_op}")
+        
+        joined = self.join('outer')
+        if joined.empty or (limit is not None and limit <= 0):
+            return {} if as_dict else joined.iloc[:0]
+        
+        mask = np.ones(len(joined), dtype=bool)
+        keys = []
+        for parameter, order in sort_by:
+            values = self._numeric_column(joined, parameter).to_numpy()
+            mask &= ~np.isnan(values)
+            keys.append(values * (-1.0 if order == 'desc' else 1.0))
+        for parameter, (comparison_op, threshold) in filters.items():
+            mask &= operators[comparison_op](self._numeric_column(joined, parameter).to_numpy(), threshold)
+        candidates = np.flatnonzero(mask)
+        keys = [key[candidates] for key in keys]
+        if limit is not None and limit < len(candidates):
+            kth_value = keys[0][np.argpartition(keys[0], limit - 1)[limit - 1]]
+            keep = keys[0] <= kth_value
+            candidates = candidates[keep]
+            keys = [key[keep] for key in keys]
+        order = np.lexsort(keys[::-1])[:limit]
+        selected = joined.iloc[candidates[order]]
+        return self._to_records(selected) if as_dict else selected
+    
+    def sort_by_parameter(self, parameter, comparison_op, threshold=None):
+        """
+        Ordena las palabras por un parámetro, como WordDictionaryMerger.sort_by_parameter.
+        
+        Args:
+            parameter (str): Nombre del parámetro por el que se quiere ordenar
+            comparison_op (str): 'gt' (mayor que, orden descendente) o 'lt' (menor que, ascendente)
+            threshold (float, optional): Valor umbral para la comparación
+        
+        Returns:
+            dict: Diccionario con las palabras que cumplen la condición, ordenadas por el parámetro
+        """
+        if comparison_op not in ('gt', 'lt'):
+            return {}
+        filters = {parameter: (comparison_op, threshold)} if threshold is not None else None
+        return self.query([(parameter, 'desc' if comparison_op == 'gt' else 'asc')], filters)
@@ -1,10 +1,20 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
 import numpy as np
+import hashlib
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from typing import Dict, List, Union, Any
 
+# Manifiesto con el hash de los datos de cada gráfica generada por render_figures
+PLOT_MANIFEST_NAME = '.plot_manifest.json'
+# Cambiar al modificar el aspecto de las gráficas para invalidar las ya generadas
+PLOT_CACHE_VERSION = 1
+
+# matplotlib y seaborn se importan en la primera gráfica (ver _pyplot), para que usar
+# solo las estadísticas no pague su tiempo de importación
+_theme_applied = False
+
 class DataAnalysisPlotter:
     """
     Clase para analizar y visualizar datos estadísticos de palabras.
@@ -36,9 +46,6 @@ class DataAnalysisPlotter:
                 }
         """
         self.data = data
-        # Configurar el estilo de las gráficas
-        sns.set_theme(style="whitegrid")
-        sns.set_palette("husl")
         
     def _validate_data(self) -> bool:
         """
@@ -101,6 +108,7 @@ class DataAnalysisPlotter:
             non_iconic_adults.append(non_iconic_adults_pct)
         
         # Crear la gráfica
+        plt = _pyplot()
         fig, ax = plt.subplots(figsize=(12, 6))
         x = np.arange(len(age_groups))
         width = 0.2
@@ -151,6 +159,7 @@ class DataAnalysisPlotter:
             non_iconic_adults.append(non_iconic_adults_pct)
         
         # Crear la gráfica
+        plt = _pyplot()
         fig, ax = plt.subplots(figsize=(12, 6))
         x = np.arange(len(age_groups))
         width = 0.35
@@ -212,6 +221,7 @@ class DataAnalysisPlotter:
             non_iconic_children.append(non_iconic_children_pct)
         
         # Crear la gráfica
+        plt = _pyplot()
         fig, ax = plt.subplots(figsize=(12, 6))
         x = np.arange(len(age_groups))
         width = 0.35
@@ -249,6 +259,43 @@ class DataAnalysisPlotter:
             plt.show()
         plt.close()
 
+    def compute_cumulative_iconicity(self, bin_width: float = 0.25) -> Dict[str, Dict[str, Any]]:
+        """
+        Calcula, para cada grupo de edad, el porcentaje acumulado de ocurrencias de palabras
+        icónicas hasta cada valor de iconicidad, para adultos y niños.
+        
+        Args:
+            bin_width (float): Separación entre los valores de iconicidad evaluados
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Diccionario {grupo de edad: {'ratings': array de valores
+                de iconicidad, 'adults': array de porcentajes o None, 'children': array de
+                porcentajes o None}}. Los grupos sin palabras icónicas se omiten.
+        """
+        result = {}
+        for age_group, stats in sorted(self.data.items()):
+            arrays = {}
+            for group in ('adults', 'children'):
+                words_with_rating = stats[group]['iconic_words']
+                ratings = np.fromiter((word_data['rating'] for word_data in words_with_rating.values()),
+                                      dtype=np.float64, count=len(words_with_rating))
+                counts = np.fromiter((word_data['count'] for word_data in words_with_rating.values()),
+                                     dtype=np.float64, count=len(words_with_rating))
+                arrays[group] = (ratings, counts)
+            
+            all_ratings = np.concatenate([ratings for ratings, _ in arrays.values()])
+            if len(all_ratings) == 0:
+                continue
+            x_axis = np.arange(all_ratings.min(), all_ratings.max() + bin_width, bin_width)
+            
+            curves = {'ratings': x_axis}
+            for group, (ratings, counts) in arrays.items():
+                total = counts.sum()
+                curves[group] = (cumulative_counts(ratings, counts, x_axis) / total * 100
+                                 if total > 0 else None)
+            result[age_group] = curves
+        return result
+    
     def plot_iconicity_distribution_by_age_group(self, save_dir: str = None):
         """
         Genera gráficas de distribución acumulativa de iconicidad para cada grupo de edad,
@@ -259,113 +306,265 @@ class DataAnalysisPlotter:
             save_dir (str, optional): Directorio donde guardar las gráficas. Si es None, las gráficas se muestran en pantalla.
         """
         print_valid_words_statistics(self.data)
-
-        for age_group, stats in sorted(self.data.items()):
-            # Obtener las palabras con rating para adultos y niños
-            adults_words_with_rating = stats['adults']['iconic_words']
-            children_words_with_rating = stats['children']['iconic_words']
-
-            # Verificar si hay datos para adultos y niños
-            has_adult_data = len(adults_words_with_rating) > 0
-            has_children_data = len(children_words_with_rating) > 0
-
-            if not has_adult_data and not has_children_data:
+        
+        curves_by_age = self.compute_cumulative_iconicity()
+        for age_group in sorted(self.data):
+            if age_group not in curves_by_age:
                 print(f"\nNo hay datos de iconicidad para el grupo de edad {age_group}")
                 continue
+            save_path = None
+            if save_dir:
+                os.makedirs(save_dir, exist_ok=True)
+                save_path = os.path.join(save_dir, distribution_file_name(age_group))
+            plot_cumulative_curves(age_group, curves_by_age[age_group], save_path)
+    
+    def render_figures(self, output_dir: str, distribution_dir: str = None,
+                       max_workers: int = None, use_cache: bool = True) -> List[str]:
+        """
+        Genera en lote todas las gráficas como archivos PNG con el backend Agg (sin
+        pantalla), una tarea por gráfica repartidas en un pool de procesos. El backend
+        del proceso actual no cambia: si las gráficas se generan en él, se restaura el
+        anterior al terminar. Si use_cache es True, las gráficas cuyo archivo existe y
+        cuyos datos tienen el mismo hash que en la ejecución anterior (guardado en un
+        manifiesto en cada directorio) no se vuelven a generar.
+        
+        Args:
+            output_dir (str): Directorio de las gráficas de barras icónicas vs no icónicas
+            distribution_dir (str, optional): Directorio de las gráficas de distribución de
+                iconicidad por grupo de edad; por defecto output_dir
+            max_workers (int, optional): Número de procesos (por defecto, uno por núcleo).
+                Con 1 las gráficas se generan en el proceso actual
+            use_cache (bool): Si es True, se omiten las gráficas que no han cambiado
+        
+        Returns:
+            List[str]: Rutas de todas las gráficas, en el orden de las tareas
+        """
+        distribution_dir = distribution_dir or output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        os.makedirs(distribution_dir, exist_ok=True)
+        
+        # Las gráficas de barras solo necesitan los totales de cada grupo
+        summary = {age_group: {group: {key: stats[group][key] for key in
+                                       ('total_words', 'total_iconic_occurrences',
+                                        'total_non_iconic_occurrences')}
+                               for group in ('adults', 'children')}
+                   for age_group, stats in self.data.items()}
+        # Cada gráfica recibe solo los datos que dibuja, para que su hash no cambie por otros
+        adults_summary = {age_group: {'adults': stats['adults']} for age_group, stats in summary.items()}
+        children_summary = {age_group: {'children': stats['children']} for age_group, stats in summary.items()}
+        jobs = [
+            ('plot_iconic_vs_non_iconic_by_age', (summary,),
+             os.path.join(output_dir, 'iconic_vs_non_iconic_by_age.png')),
+            ('plot_iconic_vs_non_iconic_by_age_adults', (adults_summary,),
+             os.path.join(output_dir, 'iconic_vs_non_iconic_by_age_adults.png')),
+            ('plot_iconic_vs_non_iconic_by_age_children', (children_summary,),
+             os.path.join(output_dir, 'iconic_vs_non_iconic_by_age_children.png'))
+        ]
+        for age_group, curves in self.compute_cumulative_iconicity().items():
+            jobs.append(('plot_cumulative_curves', (age_group, curves),
+                         os.path.join(distribution_dir, distribution_file_name(age_group))))
+        
+        manifests = {directory: _read_manifest(directory) if use_cache else {}
+                     for directory in {output_dir, distribution_dir}}
+        pending = []
+        for name, args, save_path in jobs:
+            directory, file_name = os.path.split(save_path)
+            data_hash = hash_plot_data(name, args)
+            if manifests[directory].get(file_name) == data_hash and os.path.exists(save_path):
+                continue
+            manifests[directory][file_name] = data_hash
+            pending.append((name, args, save_path))
+        
+        if max_workers == 1 or len(pending) <= 1:
+            if pending:
+                with _agg_backend():
+                    for job in pending:
+                        _render_job(job)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_render_worker) as executor:
+                list(executor.map(_render_job, pending))
+        
+        # Los manifiestos se escriben al final, cuando todas las gráficas existen
+        for directory, manifest in manifests.items():
+            _write_manifest(directory, manifest)
+        return [save_path for _, _, save_path in jobs]
 
-            # Crear listas de (rating, count) para adultos y niños
-            adults_ratings_counts = [(word_data['rating'], word_data['count']) 
-                                   for word_data in adults_words_with_rating.values()]
-            children_ratings_counts = [(word_data['rating'], word_data['count']) 
-                                     for word_data in children_words_with_rating.values()]
-
-            # Obtener total de palabras para adultos y niños
-            total_adults = stats['adults']['total_iconic_occurrences']
-            total_children = stats['children']['total_iconic_occurrences']
-
-            # Obtener mínimo y máximo de iconicidad
-            min_rating = float('inf')
-            max_rating = float('-inf')
 
-            if has_adult_data:
-                min_rating = min(min_rating, min(r for r, _ in adults_ratings_counts))
-                max_rating = max(max_rating, max(r for r, _ in adults_ratings_counts))
+def apply_plot_theme():
+    """
+    Configura el estilo de las gráficas.
+    """
+    import seaborn as sns
+    
+    global _theme_applied
+    sns.set_theme(style="whitegrid")
+    sns.set_palette("husl")
+    _theme_applied = True
 
-            if has_children_data:
-                min_rating = min(min_rating, min(r for r, _ in children_ratings_counts))
-                max_rating = max(max_rating, max(r for r, _ in children_ratings_counts))
+def _pyplot():
+    """
+    Importa matplotlib.pyplot y aplica el estilo la primera vez que se dibuja una gráfica.
+    
+    Returns:
+        module: matplotlib.pyplot
+    """
+    import matplotlib.pyplot as plt
+    
+    if not _theme_applied:
+        apply_plot_theme()
+    return plt
 
-            if min_rating == float('inf') or max_rating == float('-inf'):
-                print(f"\nNo se pudieron calcular los rangos de iconicidad para el grupo de edad {age_group}")
-                continue
+def distribution_file_name(age_group: str) -> str:
+    """
+    Devuelve el nombre del archivo de la gráfica de distribución de un grupo de edad.
+    """
+    return f'distribucion_iconicidad_{age_group}.png'
 
-            # Crear bins para la iconicidad
-            x_axis = np.arange(min_rating, max_rating + 0.25, 0.25)
-            
-            # Ordenar las palabras por iconicidad
-            sorted_adults = sorted(adults_ratings_counts, key=lambda x: x[0])
-            sorted_children = sorted(children_ratings_counts, key=lambda x: x[0])
+def plot_cumulative_curves(age_group: str, curves: Dict[str, Any], save_path: str = None):
+    """
+    Dibuja las curvas de distribución acumulativa de iconicidad de un grupo de edad.
+    
+    Args:
+        age_group (str): Grupo de edad
+        curves (Dict[str, Any]): Curvas del grupo, como las devuelve
+            DataAnalysisPlotter.compute_cumulative_iconicity
+        save_path (str, optional): Ruta donde guardar la gráfica. Si es None, la gráfica se muestra en pantalla.
+    """
+    x_axis = curves['ratings']
+    
+    # Crear la gráfica
+    plt = _pyplot()
+    plt.figure(figsize=(10, 6))
+    
+    # Plotear datos de adultos si existen
+    if curves['adults'] is not None:
+        plt.plot(x_axis, curves['adults'], label='Adultos', marker='o', markersize=4)
+    
+    # Plotear datos de niños si existen
+    if curves['children'] is not None:
+        plt.plot(x_axis, curves['children'], label='Niños', marker='s', markersize=4)
+    
+    plt.xlabel('Iconicidad')
+    plt.ylabel('Porcentaje acumulado de palabras (%)')
+    plt.title(f'Distribución acumulativa de iconicidad - Grupo {age_group}')
+    plt.legend()
+    plt.grid(True)
+    
+    # Guardar o mostrar la gráfica
+    if save_path:
+        plt.savefig(save_path, bbox_inches='tight', dpi=300)
+    else:
+        plt.show()
+    plt.close()
 
-            # Crear listas para acumular ocurrencias
-            adults_cumulative = np.zeros(len(x_axis))
-            children_cumulative = np.zeros(len(x_axis))
+def _update_hash(digest, value):
+    """
+    Añade un valor (diccionario, secuencia, array o escalar) al hash de forma canónica.
+    """
+    if isinstance(value, dict):
+        digest.update(b'{')
+        for key in sorted(value, key=str):
+            _update_hash(digest, key)
+            _update_hash(digest, value[key])
+        digest.update(b'}')
+    elif isinstance(value, (list, tuple)):
+        digest.update(b'[')
+        for item in value:
+            _update_hash(digest, item)
+        digest.update(b']')
+    elif isinstance(value, np.ndarray):
+        digest.update(f'array{value.dtype.str}{value.shape}'.encode('utf-8'))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        digest.update(repr(value).encode('utf-8'))
+        digest.update(b';')
 
-            # Acumular ocurrencias para adultos
-            if has_adult_data:
-                current_count = 0
-                current_bin = 0
-                for rating, count in sorted_adults:
-                    if current_bin < len(x_axis) and rating > x_axis[current_bin]:
-                        adults_cumulative[current_bin] = current_count
-                        current_bin += 1
-                    current_count += count
+def hash_plot_data(name: str, args: tuple) -> str:
+    """
+    Calcula el hash de los datos de una gráfica.
+    
+    Args:
+        name (str): Nombre de la función que dibuja la gráfica
+        args (tuple): Datos de la gráfica
+    
+    Returns:
+        str: Hash SHA-256 en hexadecimal
+    """
+    digest = hashlib.sha256()
+    _update_hash(digest, (PLOT_CACHE_VERSION, name, args))
+    return digest.hexdigest()
 
-                # Actualizar el último bin y los restantes
-                for i in range(current_bin, len(x_axis)):
-                    adults_cumulative[i] = current_count
+def _read_manifest(directory: str) -> Dict[str, str]:
+    """
+    Lee el manifiesto {archivo: hash} de un directorio (vacío si no existe o no es válido).
+    """
+    try:
+        with open(os.path.join(directory, PLOT_MANIFEST_NAME), 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
 
-            # Acumular ocurrencias para niños
-            if has_children_data:
-                current_count = 0
-                current_bin = 0
-                for rating, count in sorted_children:
-                    if current_bin < len(x_axis) and rating > x_axis[current_bin]:
-                        children_cumulative[current_bin] = current_count
-                        current_bin += 1
-                    current_count += count
+def _write_manifest(directory: str, manifest: Dict[str, str]):
+    """
+    Guarda el manifiesto {archivo: hash} de un directorio.
+    """
+    with open(os.path.join(directory, PLOT_MANIFEST_NAME), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
 
-                # Actualizar el último bin y los restantes
-                for i in range(current_bin, len(x_axis)):
-                    children_cumulative[i] = current_count
+def _init_render_worker():
+    """
+    Fija el backend Agg en cada proceso del pool de render_figures.
+    """
+    import matplotlib
+    
+    matplotlib.use('Agg', force=True)
 
-            # Crear la gráfica
-            plt.figure(figsize=(10, 6))
-            
-            # Plotear datos de adultos si existen
-            if has_adult_data:
-                plt.plot(x_axis, adults_cumulative/total_adults * 100, label='Adultos', marker='o', markersize=4)
-            
-            # Plotear datos de niños si existen
-            if has_children_data:
-                plt.plot(x_axis, children_cumulative/total_children * 100, label='Niños', marker='s', markersize=4)
-            
-            plt.xlabel('Iconicidad')
-            plt.ylabel('Porcentaje acumulado de palabras (%)')
-            plt.title(f'Distribución acumulativa de iconicidad - Grupo {age_group}')
-            plt.legend()
-            plt.grid(True)
-            
-            # Guardar o mostrar la gráfica
-            if save_dir:
-                os.makedirs(save_dir, exist_ok=True)
-                plt.savefig(os.path.join(save_dir, f'distribucion_iconicidad_{age_group}.png'), 
-                           bbox_inches='tight', dpi=300)
-                plt.close()
-            else:
-                plt.show()
-                plt.close()
+@contextmanager
+def _agg_backend():
+    """
+    Fija el backend Agg en el proceso actual y restaura el anterior al salir.
+    """
+    import matplotlib
+    
+    previous_backend = matplotlib.get_backend()
+    matplotlib.use('Agg', force=True)
+    try:
+        yield
+    finally:
+        matplotlib.use(previous_backend, force=True)
 
+def _render_job(job):
+    """
+    Genera una gráfica de render_figures y devuelve su ruta. El backend Agg lo fija
+    quien la llama (ver _init_render_worker y _agg_backend).
+    
+    Args:
+        job (tuple): (nombre de la función de dibujo, argumentos, ruta del archivo)
+    """
+    name, args, save_path = job
+    if name == 'plot_cumulative_curves':
+        plot_cumulative_curves(*args, save_path=save_path)
+    else:
+        # Las gráficas de barras son métodos del plotter que solo leen los totales
+        getattr(DataAnalysisPlotter(*args), name)(save_path)
+    return save_path
 
+def cumulative_counts(ratings: np.ndarray, counts: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    """
+    Suma, para cada umbral, los conteos de las palabras con iconicidad menor o igual que él.
+    
+    Args:
+        ratings (np.ndarray): Iconicidad de cada palabra
+        counts (np.ndarray): Número de ocurrencias de cada palabra
+        thresholds (np.ndarray): Valores de iconicidad crecientes en los que evaluar
+    
+    Returns:
+        np.ndarray: Ocurrencias acumuladas en cada umbral
+    """
+    order = np.argsort(ratings, kind='stable')
+    cumulative = np.concatenate([[0.0], np.cumsum(counts[order], dtype=np.float64)])
+    return cumulative[np.searchsorted(ratings[order], thresholds, side='right')]
 
 def print_valid_words_statistics(valid_words_stats):
     """
@@ -5,6 +5,7 @@ class DataFormatter:
         self.reader = Reader()
         self.children_data = {}
         self.adults_data = {}
+        self.utterances_data = {}
         self.data_dict = {}
     
     def is_children(self, speaker_code):
@@ -43,7 +44,9 @@ class DataFormatter:
             file_path (str): Ruta del archivo .cha a leer
             
         Returns:
-            tuple: (children_data, adults_data) - Diccionarios con los datos separados por niños y adultos
+            tuple: (children_data, adults_data) - Diccionarios con los datos separados por niños y adultos.
+                La tabla completa de expresiones del archivo queda en utterances_data, que se
+                reinicia en cada llamada.
         """
         data = self.reader.read_cha(file_path)
         if data is not None:
@@ -51,13 +54,15 @@ class DataFormatter:
             # Inicializar contadores independientes
             child_counter = 1
             adult_counter = 1
+            self.utterances_data = {}
             # Separar las expresiones por hablante
-            for utterance in utterances:
+            for index, utterance in enumerate(utterances, start=1):
                 entry = {
                     'speaker': utterance['speaker'],
                     'text': utterance['text'],
                     'timestamp': utterance['timestamp']
                 }
+                self.utterances_data[index] = entry
                 if self.is_children(utterance['speaker']):
                     self.children_data[child_counter] = entry
                     child_counter += 1
@@ -85,6 +90,16 @@ class DataFormatter:
         """
         return self.adults_data
     
+    def get_utterances_data(self):
+        """
+        Devuelve el diccionario con todas las expresiones, de todos los hablantes,
+        en el orden del archivo (por ejemplo, para GroupedWordCounter).
+        
+        Returns:
+            dict: Diccionario con todas las expresiones
+        """
+        return self.utterances_data
+    
     def get_data(self):
         """
         Devuelve el diccionario con todos los datos (para archivos CSV).
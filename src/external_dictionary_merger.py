@@ -0,0 +1,221 @@
+import heapq
+import json
+import os
+import shutil
+import tempfile
+
+class ExternalDictionaryMerger:
+    """
+    Merger de diccionarios en memoria acotada: cada diccionario se escribe en disco en
+    tramos ordenados por palabra y el merge se hace en streaming, mezclando los tramos
+    con un heap. Los valores deben poder serializarse en JSON.
+    """
+    
+    def __init__(self, temp_dir=None, run_size=100000, max_open_runs=256):
+        """
+        Inicializa el merger.
+        
+        Args:
+            temp_dir (str, optional): Directorio donde crear los archivos temporales
+            run_size (int): Número máximo de registros de cada tramo en memoria
+            max_open_runs (int): Número máximo de tramos abiertos a la vez al mezclar; si hay
+                más, se mezclan antes por grupos en tramos mayores
+        """
+        if run_size <= 0:
+            raise ValueError("run_size debe ser positivo")
+        if max_open_runs < 2:
+            raise ValueError("max_open_runs debe ser al menos 2")
+        self.run_size = run_size
+        self.max_open_runs = max_open_runs
+        self._directory = tempfile.mkdtemp(prefix='word_merge_', dir=temp_dir)
+        self._runs = []
+        self._run_counter = 0
+        self.num_sources = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """
+        Elimina los archivos temporales.
+        """
+        shutil.rmtree(self._directory, ignore_errors=True)
+        self._runs = []
+    
+    def _new_run_path(self):
+        """
+        Devuelve la ruta de un tramo nuevo.
+        """
+        self._run_counter += 1
+        return os.path.join(self._directory, f'run_{self._run_counter:06d}.jsonl')
+    
+    def _write_run(self, source, sequence, items):
+        """
+        Ordena por palabra unos registros de una fuente y los guarda como un tramo.
+        """
+        path = self._new_run_path()
+        with open(path, 'w', encoding='utf-8') as file:
+            for word, data in sorted(items, key=lambda item: item[0]):
+                file.write(json.dumps([word, source, sequence, data]))
+                file.write('\n')
+        self._runs.append(path)
+    
+    def add_records(self, records):
+        """
+        Añade una fuente de registros (palabra, datos) leyéndola en streaming, sin tenerla
+        entera en memoria. Si una palabra se repite en la fuente, sus datos se combinan y
+        ganan los posteriores.
+        
+        Args:
+            records (iterable): Pares (palabra, diccionario de datos)
+        """
+        source = self.num_sources
+        self.num_sources += 1
+        buffer = {}
+        sequence = 0
+        for word, data in records:
+            previous = buffer.get(word)
+            buffer[word] = data if previous is None else {**previous, **data}
+            if len(buffer) >= self.run_size:
+                self._write_run(source, sequence, buffer.items())
+                sequence += 1
+                buffer = {}
+        if buffer:
+            self._write_run(source, sequence, buffer.items())
+    
+    def add_dictionary(self, dictionary):
+        """
+        Añade un diccionario escribiéndolo en disco en tramos ordenados.
+        
+        Args:
+            dictionary (dict): Diccionario que tiene strings como claves principales
+        """
+        if not isinstance(dictionary, dict):
+            raise ValueError("El parámetro debe ser un diccionario")
+        self.add_records(dictionary.items())
+    
+    @staticmethod
+    def _read_run(path):
+        """
+        Lee un tramo como tuplas (palabra, fuente, secuencia, datos) en orden.
+        """
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                word, source, sequence, data = json.loads(line)
+                yield word, source, sequence, data
+    
+    def _merged_stream(self):
+        """
+        Mezcla todos los tramos en un único flujo ordenado por palabra, fuente y secuencia,
+        reduciendo antes el número de tramos si supera max_open_runs.
+        """
+        runs = self._runs
+        while len(runs) > self.max_open_runs:
+            merged_runs = []
+            for start in range(0, len(runs), self.max_open_runs):
+                group = runs[start:start + self.max_open_runs]
+                path = self._new_run_path()
+                with open(path, 'w', encoding='utf-8') as file:
+                    for record in heapq.merge(*(self._read_run(run) for run in group)):
+                        file.write(json.dumps(list(record)))
+                        file.write('\n')
+                for run in group:
+                    os.remove(run)
+                merged_runs.append(path)
+            runs = merged_runs
+        self._runs = runs
+        return heapq.merge(*(self._read_run(run) for run in runs))
+    
+    def iter_words(self):
+        """
+        Recorre las palabras en orden alfabético con sus datos en cada fuente.
+        
+        Yields:
+            tuple: (palabra, {fuente: datos}) con las fuentes en orden de inserción
+        """
+        current_word = None
+        by_source = {}
+        for word, source, _, data in self._merged_stream():
+            if word != current_word:
+                if current_word is not None:
+                    yield current_word, by_source
+                current_word = word
+                by_source = {}
+            if source in by_source:
+                by_source[source].update(data)
+            else:
+                by_source[source] = data
+        if current_word is not None:
+            yield current_word, by_source
+    
+    def iter_merge(self):
+        """
+        Recorre en streaming las palabras presentes en todas las fuentes con sus datos
+        mergeados (ganan los de las fuentes posteriores) y las que no se pudieron mergear.
+        
+        Yields:
+            tuple: ('merged', palabra, datos) o ('unmerged', palabra, {fuente: datos})
+        """
+        for word, by_source in self.iter_words():
+            if len(by_source) == self.num_sources:
+                merged_data = {}
+                for source in sorted(by_source):
+                    merged_data.update(by_source[source])
+                yield 'merged', word, merged_data
+            else:
+                yield 'unmerged', word, by_source
+    
+    def write_merge(self, merged_path, unmerged_path=None):
+        """
+        Escribe el merge en archivos JSON Lines sin cargarlo en memoria.
+        
+        Args:
+            merged_path (str): Archivo de palabras mergeadas, una línea [palabra, datos]
+            unmerged_path (str, optional): Archivo de palabras no mergeadas, una línea
+                [palabra, fuente, datos] por fuente en la que aparecen
+        
+        Returns:
+            tuple: (número de palabras mergeadas, número de palabras no mergeadas)
+        """
+        merged_count = 0
+        unmerged_count = 0
+        unmerged_file = open(unmerged_path, 'w', encoding='utf-8') if unmerged_path else None
+        try:
+            with open(merged_path, 'w', encoding='utf-8') as merged_file:
+                for kind, word, data in self.iter_merge():
+                    if kind == 'merged':
+                        merged_file.write(json.dumps([word, data]))
+                        merged_file.write('\n')
+                        merged_count += 1
+                    else:
+                        unmerged_count += 1
+                        if unmerged_file is not None:
+                            for source, source_data in data.items():
+                                unmerged_file.write(json.dumps([word, source, source_data]))
+                                unmerged_file.write('\n')
+        finally:
+            if unmerged_file is not None:
+                unmerged_file.close()
+        return merged_count, unmerged_count
+    
+    def obtain_merge(self):
+        """
+        Obtiene el merge en memoria con el mismo formato que WordDictionaryMerger.obtain_merge
+        (las palabras quedan en orden alfabético). Solo es adecuado si el resultado cabe en
+        memoria; para corpus grandes, usar iter_merge o write_merge.
+        
+        Returns:
+            tuple: (merged_dict, unmerged_dictionaries)
+        """
+        merged_dict = {}
+        unmerged_dictionaries = [{} for _ in range(self.num_sources)]
+        for kind, word, data in self.iter_merge():
+            if kind == 'merged':
+                merged_dict[word] = data
+            else:
+                for source, source_data in data.items():
+                    unmerged_dictionaries[source][word] = source_data
+        return merged_dict, [unmerged_dict for unmerged_dict in unmerged_dictionaries if unmerged_dict]
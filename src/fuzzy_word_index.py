@@ -0,0 +1,222 @@
+from collections import defaultdict
+from functools import lru_cache
+
+def deletion_variants(word, max_distance, prefix_length=None):
+    """
+    Genera todas las cadenas que se obtienen borrando hasta max_distance caracteres
+    de una palabra (incluida la propia palabra).
+    
+    Args:
+        word (str): Palabra
+        max_distance (int): Número máximo de caracteres borrados
+        prefix_length (int, optional): Si se indica, solo se usa ese prefijo de la palabra
+    
+    Returns:
+        set: Conjunto de variantes
+    """
+    if prefix_length is not None:
+        word = word[:prefix_length]
+    variants = {word}
+    level = {word}
+    for _ in range(max_distance):
+        next_level = set()
+        for variant in level:
+            for position in range(len(variant)):
+                next_level.add(variant[:position] + variant[position + 1:])
+        next_level -= variants
+        variants |= next_level
+        level = next_level
+    return variants
+
+def common_prefix_length(source, target):
+    """
+    Calcula la longitud del prefijo común de dos palabras.
+    
+    Args:
+        source (str): Primera palabra
+        target (str): Segunda palabra
+    
+    Returns:
+        int: Número de caracteres iniciales que coinciden
+    """
+    length = 0
+    for source_char, target_char in zip(source, target):
+        if source_char != target_char:
+            break
+        length += 1
+    return length
+
+def edit_distance(source, target, max_distance):
+    """
+    Calcula la distancia de edición (inserciones, borrados, sustituciones y
+    transposiciones de caracteres adyacentes) entre dos palabras, abandonando en
+    cuanto se supera max_distance.
+    
+    Args:
+        source (str): Primera palabra
+        target (str): Segunda palabra
+        max_distance (int): Distancia máxima de interés
+    
+    Returns:
+        int: Distancia de edición, o max_distance + 1 si es mayor que max_distance
+    """
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        current = [i] + [0] * len(target)
+        row_minimum = i
+        for j in range(1, len(target) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and j > 1 and source[i - 1] == target[j - 2]
+                    and source[i - 2] == target[j - 1]):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            if value < row_minimum:
+                row_minimum = value
+        if row_minimum > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    distance = previous[len(target)]
+    return distance if distance <= max_distance else max_distance + 1
+
+class FuzzyWordIndex:
+    """
+    Índice de borrados (al estilo SymSpell) para encontrar la palabra más parecida
+    de un vocabulario dentro de una distancia de edición máxima.
+    """
+    
+    def __init__(self, words, max_distance=2, prefix_length=7, min_length=4,
+                 priorities=None, cache_size=65536, ignore_case=True):
+        """
+        Construye el índice.
+        
+        Args:
+            words (list): Vocabulario
+            max_distance (int): Distancia de edición máxima de las búsquedas
+            prefix_length (int): Longitud del prefijo que se indexa. Limita el número de
+                variantes por palabra; las candidatas se verifican con la palabra completa
+            min_length (int): Los tokens más cortos solo se buscan de forma exacta, porque
+                a poca distancia de una palabra corta hay demasiadas palabras distintas
+            priorities (list, optional): Prioridad de cada palabra (p. ej. número de
+                valoraciones) para desempatar entre candidatas a la misma distancia y con
+                el mismo prefijo común con el token
+            cache_size (int): Tamaño de la caché LRU de búsquedas
+            ignore_case (bool): Si es True, las palabras y los tokens se comparan en
+                minúsculas; los resultados conservan la forma original de la palabra
+        """
+        if max_distance < 0:
+            raise ValueError("max_distance no puede ser negativo")
+        if prefix_length <= max_distance:
+            raise ValueError("prefix_length debe ser mayor que max_distance")
+        if priorities is not None and len(priorities) != len(words):
+            raise ValueError("priorities debe tener un valor por palabra")
+        self.words = list(words)
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.min_length = min_length
+        self.cache_size = cache_size
+        self.ignore_case = ignore_case
+        self.priorities = list(priorities) if priorities is not None else [0] * len(self.words)
+        # Formas con las que se compara cada palabra
+        self._keys = [word.lower() for word in self.words] if ignore_case else self.words
+        # Si varias palabras tienen la misma forma, la coincidencia exacta es la de mayor
+        # prioridad (y, a igual prioridad, la primera)
+        self.word_index = {}
+        for index, key in enumerate(self._keys):
+            previous = self.word_index.get(key)
+            if previous is None or self.priorities[index] > self.priorities[previous]:
+                self.word_index[key] = index
+        # Variante de borrado del prefijo -> posiciones de las palabras que la generan
+        self._deletes = defaultdict(list)
+        for index, key in enumerate(self._keys):
+            for variant in deletion_variants(key, max_distance, prefix_length):
+                self._deletes[variant].append(index)
+        self._create_cache()
+    
+    def _create_cache(self):
+        """
+        Crea una caché LRU vacía de búsquedas.
+        """
+        self._nearest_cached = lru_cache(maxsize=self.cache_size)(self._nearest_uncached)
+    
+    def __getstate__(self):
+        # La caché envuelve un método del propio índice y no se puede serializar
+        state = self.__dict__.copy()
+        del state['_nearest_cached']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._create_cache()
+    
+    def _nearest_uncached(self, token):
+        """
+        Busca la posición y la distancia de la palabra más cercana a un token.
+        """
+        if self.ignore_case:
+            token = token.lower()
+        index = self.word_index.get(token)
+        if index is not None:
+            return index, 0
+        if len(token) < self.min_length:
+            return -1, -1
+        
+        max_distance = self.max_distance
+        keys = self._keys
+        priorities = self.priorities
+        best = None
+        seen = set()
+        for variant in deletion_variants(token, max_distance, self.prefix_length):
+            for candidate in self._deletes.get(variant, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = edit_distance(token, keys[candidate], max_distance)
+                if distance > max_distance:
+                    continue
+                # Menor distancia; a igual distancia, prefijo común más largo con el token
+                # (doggie -> doggy antes que baggie), mayor prioridad y orden del vocabulario
+                key = (distance, -common_prefix_length(token, keys[candidate]),
+                       -priorities[candidate], candidate)
+                if best is None or key < best:
+                    best = key
+        if best is None:
+            return -1, -1
+        return best[3], best[0]
+    
+    def nearest_index(self, token):
+        """
+        Devuelve la posición en el vocabulario de la palabra más cercana a un token.
+        
+        Args:
+            token (str): Token a buscar
+        
+        Returns:
+            tuple: (posición, distancia), o (-1, -1) si no hay ninguna palabra dentro
+                   de max_distance
+        """
+        return self._nearest_cached(token)
+    
+    def nearest(self, token):
+        """
+        Devuelve la palabra más cercana a un token.
+        
+        Args:
+            token (str): Token a buscar
+        
+        Returns:
+            tuple: (palabra, distancia), o None si no hay ninguna palabra dentro de max_distance
+        """
+        index, distance = self._nearest_cached(token)
+        if index < 0:
+            return None
+        return self.words[index], distance
+    
+    def clear_cache(self):
+        """
+        Vacía la caché de búsquedas.
+        """
+        self._nearest_cached.cache_clear()
@@ -1,4 +1,121 @@
+import csv
+import hashlib
+import io
+import logging
+import os
+import re
+import tempfile
+import time
+import zipfile
+from functools import lru_cache
+import numpy as np
+from src.fuzzy_word_index import FuzzyWordIndex
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+# Marcas CHAT que se eliminan al normalizar: prefijos (&-uh, &+fr, 0is), sufijos
+# (@o, @b...), alargamientos (no:), pausas (^) y signos de puntuación finales
+_CHAT_PREFIX = re.compile(r'^(?:&[-+~=]?|0)')
+_CHAT_SUFFIX = re.compile(r'@.*$')
+_CHAT_MARKS = re.compile(r'[():^ˈ]')
+_TRAILING_PUNCTUATION = re.compile(r'[.,!?;"]+$')
+_COMPOUND_SEPARATORS = re.compile(r'[+_]')
+
+def normalize_token(token):
+    """
+    Normaliza un token de una transcripción: minúsculas y sin marcas CHAT.
+    Los paréntesis de material omitido se eliminan conservando su contenido
+    (an(d) -> and) y los compuestos con '+' o '_' se mantienen.
+    
+    Args:
+        token (str): Token tal como aparece en la transcripción
+    
+    Returns:
+        str: Token normalizado (puede ser una cadena vacía)
+    """
+    token = _TRAILING_PUNCTUATION.sub('', token.strip().lower())
+    token = _CHAT_PREFIX.sub('', token)
+    token = _CHAT_SUFFIX.sub('', token)
+    return _CHAT_MARKS.sub('', token)
+
+def token_candidates(token, lemma_map=None):
+    """
+    Genera, en orden de preferencia, las formas con las que buscar un token en el modelo.
+    
+    Args:
+        token (str): Token tal como aparece en la transcripción
+        lemma_map (dict, optional): Diccionario {forma: lema} (p. ej. 'dogs' -> 'dog')
+    
+    Returns:
+        list: Formas candidatas sin repeticiones
+    """
+    normalized = normalize_token(token)
+    candidates = [token, normalized]
+    if _COMPOUND_SEPARATORS.search(normalized):
+        # choo+choo -> choo-choo, choochoo, choo choo
+        parts = [part for part in _COMPOUND_SEPARATORS.split(normalized) if part]
+        candidates.extend(separator.join(parts) for separator in ('-', '', ' '))
+    if lemma_map:
+        candidates.extend(lemma_map[candidate] for candidate in list(candidates)
+                          if candidate in lemma_map)
+    return list(dict.fromkeys(candidate for candidate in candidates if candidate))
+
+def file_checksum(file_path):
+    """
+    Calcula el SHA-256 de un archivo, leyéndolo por bloques.
+    
+    Args:
+        file_path (str): Ruta del archivo
+    
+    Returns:
+        str: Suma de comprobación en hexadecimal
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _loaded_attribute(name, doc):
+    """
+    Crea una propiedad de solo lectura para un atributo que se construye al cargar el
+    modelo: el primer acceso dispara la carga.
+    
+    Args:
+        name (str): Nombre del atributo; el valor se guarda en '_' + name
+        doc (str): Descripción del atributo
+    
+    Returns:
+        property: Propiedad del atributo
+    """
+    private_name = '_' + name
+    
+    def getter(self):
+        self._ensure_loaded()
+        return self.__dict__[private_name]
+    
+    return property(getter, doc=doc)
+
 class IconicityModel:
+    # Campos numéricos de cada palabra, guardados como columnas paralelas
+    FIELDS = ('n_ratings', 'n', 'prop_known', 'rating', 'rating_sd')
+    INT_FIELDS = ('n_ratings', 'n')
+    # Campos con índice ordenado para consultas por rango y top-k en O(log N + k)
+    INDEXED_FIELDS = ('rating', 'prop_known', 'rating_sd')
+    # Número máximo de tokens distintos cuya resolución normalizada se memoriza
+    NORMALIZATION_CACHE_SIZE = 65536
+    
+    # Palabras, índice y columnas; se construyen la primera vez que se consulta el modelo
+    words = _loaded_attribute('words', "Array con las palabras, en el orden de las columnas")
+    word_index = _loaded_attribute('word_index', "Diccionario {palabra: posición en las columnas}")
+    n_ratings = _loaded_attribute('n_ratings', "Columna con el número de valoraciones")
+    n = _loaded_attribute('n', "Columna con el número de participantes")
+    prop_known = _loaded_attribute('prop_known', "Columna con la proporción que conoce la palabra")
+    rating = _loaded_attribute('rating', "Columna con la valoración media")
+    rating_sd = _loaded_attribute('rating_sd', "Columna con la desviación estándar de la valoración")
+    
     def __init__(self, data_dict):
         """
         Inicializa el modelo con los datos del CSV.
@@ -11,39 +128,758 @@ class IconicityModel:
                 - prop_known: proporción de participantes que conocen la palabra
                 - rating: valoración media
                 - rating_sd: desviación estándar de la valoración
+                Las entradas se validan y sus valores se copian al construir el modelo, así
+                que modificar data_dict después no le afecta; los arrays y los índices se
+                construyen la primera vez que se consulta.
+        """
+        words, columns = self._process_data(data_dict)
+        self._start(lambda: self._set_columns(words, columns))
+    
+    def _start(self, loader):
         """
-        self.word_data = {}
-        print(f"\nDepuración - Total de entradas recibidas: {len(data_dict)}")
-        if len(data_dict) > 0:
-            first_entry = next(iter(data_dict.values()))
-            print("\nDepuración - Primera entrada recibida:")
-            for key, value in first_entry.items():
-                print(f"{key}: {value}")
-        self._process_data(data_dict)
+        Prepara un modelo cuyas columnas se construirán con loader en el primer acceso.
+        
+        Args:
+            loader (callable): Función sin argumentos que llama a _set_columns. Solo debe
+                usar datos ya validados y copiados por el constructor
+        """
+        self._loader = loader
+        self.load_time = None
+        self.configure_normalization()
+    
+    def _ensure_loaded(self):
+        """
+        Construye las columnas si aún no se ha hecho y registra el tiempo de carga.
+        """
+        loader = self._loader
+        if loader is None:
+            return
+        self._loader = None
+        start = time.perf_counter()
+        try:
+            loader()
+        except BaseException:
+            self._loader = loader
+            raise
+        self.load_time = time.perf_counter() - start
+        logger.info("Modelo de iconicidad cargado: %d palabras en %.1f ms",
+                    len(self.words), self.load_time * 1000)
+    
+    @property
+    def is_loaded(self):
+        """
+        Indica si las columnas del modelo ya se han construido.
+        """
+        return self._loader is None
     
     def _process_data(self, data_dict):
         """
-        Procesa los datos del diccionario y los organiza por palabra.
+        Valida los datos del diccionario y los organiza en columnas por palabra.
         
         Args:
             data_dict (dict): Diccionario con las entradas del CSV
+        
+        Returns:
+            tuple: (palabras, {campo: lista de valores}) para _set_columns
         """
+        logger.debug("Total de entradas recibidas: %d", len(data_dict))
+        if logger.isEnabledFor(logging.DEBUG) and len(data_dict) > 0:
+            logger.debug("Primera entrada recibida: %s", next(iter(data_dict.values())))
+        word_index = {}
+        incomplete = 0
+        columns = {field: [] for field in self.FIELDS}
         for entry_id, entry in data_dict.items():
             if all(key in entry for key in ['word', 'n_ratings', 'n', 'prop_known', 'rating', 'rating_sd']):
+                values = [self._numeric_value(entry[field]) for field in self.FIELDS]
+                if None in values:
+                    # Como en from_dataframe, las entradas con valores no numéricos se descartan
+                    incomplete += 1
+                    logger.debug("Entrada %s tiene valores no numéricos: %s", entry_id, entry)
+                    continue
                 word = entry['word']
-                self.word_data[word] = {
-                    'n_ratings': entry['n_ratings'],
-                    'n': entry['n'],
-                    'prop_known': entry['prop_known'],
-                    'rating': entry['rating'],
-                    'rating_sd': entry['rating_sd']
-                }
+                index = word_index.get(word)
+                if index is None:
+                    word_index[word] = len(word_index)
+                    for field, value in zip(self.FIELDS, values):
+                        columns[field].append(value)
+                else:
+                    # Una palabra repetida sobrescribe la entrada anterior
+                    for field, value in zip(self.FIELDS, values):
+                        columns[field][index] = value
             else:
-                print(f"\nDepuración - Entrada {entry_id} no tiene todos los campos requeridos:")
-                for key, value in entry.items():
-                    print(f"{key}: {value}")
+                incomplete += 1
+                logger.debug("Entrada %s no tiene todos los campos requeridos: %s", entry_id, entry)
+        
+        if incomplete:
+            logger.warning("Entradas descartadas por datos incompletos: %d", incomplete)
+        logger.debug("Total de palabras procesadas: %d", len(word_index))
+        return list(word_index), columns
+    
+    @staticmethod
+    def _numeric_value(value):
+        """
+        Convierte el valor de un campo a float. None se toma como valor ausente (NaN).
+        
+        Args:
+            value: Valor del campo en la entrada
+        
+        Returns:
+            float: Valor numérico, o None si el valor no es numérico (p. ej. 'N/A')
+        """
+        if value is None:
+            return np.nan
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    
+    def _set_columns(self, words, columns):
+        """
+        Guarda las palabras y sus columnas como arrays de NumPy.
+        
+        Args:
+            words (list): Palabras, en el orden de las columnas
+            columns (dict): Diccionario {campo: secuencia de valores} con todos los FIELDS
+        """
+        self._words = np.array(words, dtype=object)
+        self._word_index = {word: index for index, word in enumerate(words)}
+        for field in self.FIELDS:
+            column = np.asarray(columns[field], dtype=np.float64)
+            if field in self.INT_FIELDS:
+                column = self._count_column(field, column)
+            setattr(self, '_' + field, column)
+        self._build_sorted_indexes()
+        self._bin_edges = {}
+        self._fuzzy_indexes = {}
+        self._vocabulary_indices = None
+        self._record_list = None
+        self._word_data = None
+    
+    @staticmethod
+    def _count_column(field, column):
+        """
+        Convierte una columna de conteos a enteros si todos sus valores lo son. Si hay
+        valores ausentes o no enteros se mantiene como float, sin truncarlos.
+        
+        Args:
+            field (str): Nombre del campo
+            column (numpy.ndarray): Valores del campo como float64
+        
+        Returns:
+            numpy.ndarray: Columna int64, o la misma columna float64
+        """
+        finite = np.isfinite(column)
+        if finite.all() and np.array_equal(column, np.floor(column)):
+            return column.astype(np.int64)
+        logger.warning("El campo %s tiene %d valores ausentes y %d no enteros; se guarda como float",
+                       field, int(np.count_nonzero(~finite)),
+                       int(np.count_nonzero(finite & (column != np.floor(column)))))
+        return column
+    
+    def _get_record_list(self):
+        """
+        Devuelve la lista de diccionarios de datos de cada palabra, en el orden de las
+        columnas. Se construye la primera vez que se necesita y se reutiliza después.
+        """
+        if self._record_list is None:
+            values = [getattr(self, field).tolist() for field in self.FIELDS]
+            self._record_list = [dict(zip(self.FIELDS, row)) for row in zip(*values)]
+        return self._record_list
+    
+    def _records(self, indices):
+        """
+        Construye el diccionario {palabra: datos} de las posiciones indicadas.
+        
+        Args:
+            indices (numpy.ndarray): Posiciones de las palabras en las columnas
+        
+        Returns:
+            dict: Diccionario con las palabras y sus datos
+        """
+        record_list = self._get_record_list()
+        return dict(zip(self.words[indices].tolist(), map(record_list.__getitem__, indices.tolist())))
+    
+    def _build_sorted_indexes(self):
+        """
+        Ordena una vez cada campo indexado. Para cada campo se guarda la permutación que
+        lo ordena, los valores ordenados y cuántos no son NaN (NaN queda al final).
+        """
+        self._sort_orders = {}
+        self._sorted_values = {}
+        self._valid_counts = {}
+        for field in self.INDEXED_FIELDS:
+            column = getattr(self, field)
+            order = np.argsort(column, kind='stable')
+            self._sort_orders[field] = order
+            self._sorted_values[field] = column[order]
+            self._valid_counts[field] = int(np.count_nonzero(~np.isnan(column)))
+    
+    def _check_indexed_field(self, field):
+        """
+        Lanza ValueError si el campo no tiene índice ordenado.
+        """
+        if field not in self._sort_orders:
+            raise ValueError(f"El campo {field} no está indexado; use uno de {self.INDEXED_FIELDS}")
+    
+    def _range_indices(self, field, min_value=None, max_value=None):
+        """
+        Obtiene, con búsqueda binaria, las posiciones de las palabras cuyo valor del campo
+        está en [min_value, max_value], ordenadas de menor a mayor valor.
+        
+        Returns:
+            numpy.ndarray: Posiciones de las palabras en las columnas
+        """
+        self._check_indexed_field(field)
+        sorted_values = self._sorted_values[field]
+        start = 0 if min_value is None else np.searchsorted(sorted_values, min_value, side='left')
+        end = self._valid_counts[field]
+        if max_value is not None:
+            end = min(end, np.searchsorted(sorted_values, max_value, side='right'))
+        return self._sort_orders[field][start:max(start, end)]
+    
+    def get_words_in_range(self, field, min_value=None, max_value=None):
+        """
+        Obtiene las palabras cuyo valor de un campo indexado está en un rango.
+        
+        Args:
+            field (str): Campo indexado ('rating', 'prop_known' o 'rating_sd')
+            min_value (float): Valor mínimo (opcional)
+            max_value (float): Valor máximo (opcional)
+        
+        Returns:
+            dict: Diccionario con las palabras y sus datos, ordenado de menor a mayor valor
+        """
+        self._ensure_loaded()
+        return self._records(self._range_indices(field, min_value, max_value))
+    
+    def get_top_words(self, field, k=10, highest=True):
+        """
+        Obtiene las k palabras con mayor (o menor) valor de un campo indexado.
+        
+        Args:
+            field (str): Campo indexado ('rating', 'prop_known' o 'rating_sd')
+            k (int): Número de palabras a retornar
+            highest (bool): Si es True, las de mayor valor; si es False, las de menor
+        
+        Returns:
+            dict: Diccionario con las palabras y sus datos, en orden de la consulta
+        """
+        self._ensure_loaded()
+        self._check_indexed_field(field)
+        valid = self._valid_counts[field]
+        k = max(0, min(k, valid))
+        order = self._sort_orders[field]
+        indices = order[valid - k:valid][::-1] if highest else order[:k]
+        return self._records(indices)
+    
+    def query(self, **ranges):
+        """
+        Obtiene las palabras que cumplen a la vez varios rangos sobre campos indexados,
+        por ejemplo query(rating=(4.0, 5.5), prop_known=(0.9, None)).
+        Se parte del rango con menos palabras y se comprueba el resto sobre ese subconjunto.
+        
+        Args:
+            **ranges: Para cada campo indexado, una tupla (mínimo, máximo); None deja el extremo abierto
         
-        print(f"\nDepuración - Total de palabras procesadas: {len(self.word_data)}")
+        Returns:
+            dict: Diccionario con las palabras y sus datos que cumplen todos los rangos
+        """
+        self._ensure_loaded()
+        if not ranges:
+            return self._records(np.arange(len(self.words)))
+        candidates = {field: self._range_indices(field, *bounds) for field, bounds in ranges.items()}
+        smallest_field = min(candidates, key=lambda field: len(candidates[field]))
+        indices = candidates[smallest_field]
+        for field, (min_value, max_value) in ranges.items():
+            if field == smallest_field or len(indices) == 0:
+                continue
+            values = getattr(self, field)[indices]
+            mask = ~np.isnan(values)
+            if min_value is not None:
+                mask &= values >= min_value
+            if max_value is not None:
+                mask &= values <= max_value
+            indices = indices[mask]
+        return self._records(indices)
+    
+    def configure_normalization(self, lemma_map=None, cache_size=None, max_distance=0):
+        """
+        Configura la búsqueda normalizada de tokens y vacía su caché.
+        
+        Args:
+            lemma_map (dict, optional): Diccionario {forma: lema} para los tokens que no
+                aparecen en el modelo tras normalizarlos (p. ej. obtenido del nivel %mor)
+            cache_size (int, optional): Tamaño de la caché LRU token -> posición
+                (por defecto NORMALIZATION_CACHE_SIZE)
+            max_distance (int): Si es mayor que 0, los tokens sin ninguna forma candidata en
+                el modelo se resuelven con la palabra más cercana dentro de esa distancia
+                de edición (ver find_nearest_word)
+        """
+        self.lemma_map = lemma_map
+        self.fuzzy_max_distance = max_distance
+        if cache_size is None:
+            cache_size = self.NORMALIZATION_CACHE_SIZE
+        self._normalization_cache_size = cache_size
+        self._create_normalization_cache()
+    
+    def _create_normalization_cache(self):
+        """
+        Crea una caché LRU vacía para la búsqueda normalizada.
+        """
+        self._resolve_cached = lru_cache(maxsize=self._normalization_cache_size)(self._resolve_uncached)
+    
+    def __getstate__(self):
+        # La caché LRU envuelve un método del propio modelo y no se puede serializar:
+        # se descarta y se vuelve a crear vacía al deserializar
+        self._ensure_loaded()
+        state = self.__dict__.copy()
+        del state['_resolve_cached']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._create_normalization_cache()
+    
+    def _resolve_uncached(self, token):
+        """
+        Busca la primera forma candidata del token que está en el modelo.
+        """
+        word_index = self.word_index
+        for candidate in token_candidates(token, self.lemma_map):
+            index = word_index.get(candidate)
+            if index is not None:
+                return index
+        if self.fuzzy_max_distance > 0:
+            return self.get_fuzzy_index(self.fuzzy_max_distance).nearest_index(normalize_token(token))[0]
+        return -1
+    
+    def resolve_index(self, token):
+        """
+        Obtiene la posición en el modelo de un token de una transcripción, probando la
+        forma exacta, la normalizada (minúsculas, sin marcas CHAT), las variantes de
+        compuesto y el lema. Los resultados se memorizan en una caché LRU acotada.
+        
+        Args:
+            token (str): Token tal como aparece en la transcripción
+        
+        Returns:
+            int: Posición de la palabra en las columnas o -1 si no se encuentra
+        """
+        self._ensure_loaded()
+        index = self._word_index.get(token)
+        if index is not None:
+            return index
+        return self._resolve_cached(token)
+    
+    def get_normalized_word_data(self, token):
+        """
+        Obtiene los datos de una palabra a partir de un token sin normalizar.
+        
+        Args:
+            token (str): Token tal como aparece en la transcripción (p. ej. 'Doggie', 'choo+choo')
+        
+        Returns:
+            dict: Datos de la palabra o None si no se encuentra
+        """
+        self._ensure_loaded()
+        index = self.resolve_index(token)
+        if index < 0:
+            return None
+        return self._get_record_list()[index]
+    
+    def get_fuzzy_index(self, max_distance=2):
+        """
+        Devuelve el índice aproximado del vocabulario del modelo para una distancia de
+        edición máxima. Se construye la primera vez que se pide y se reutiliza después.
+        No distingue mayúsculas; a igual distancia se prefieren las palabras con el
+        prefijo común más largo con el token y después las de mayor prop_known.
+        
+        Args:
+            max_distance (int): Distancia de edición máxima
+        
+        Returns:
+            FuzzyWordIndex: Índice de borrados sobre self.words
+        """
+        self._ensure_loaded()
+        index = self._fuzzy_indexes.get(max_distance)
+        if index is None:
+            index = FuzzyWordIndex(self.words.tolist(), max_distance=max_distance,
+                                   priorities=self.prop_known.tolist())
+            self._fuzzy_indexes[max_distance] = index
+        return index
+    
+    def find_nearest_word(self, token, max_distance=2):
+        """
+        Busca la palabra del modelo más parecida a un token normalizado
+        (p. ej. 'horsie' -> 'horse').
+        
+        Args:
+            token (str): Token tal como aparece en la transcripción
+            max_distance (int): Distancia de edición máxima
+        
+        Returns:
+            tuple: (palabra, distancia) o None si no hay ninguna dentro de max_distance
+        """
+        return self.get_fuzzy_index(max_distance).nearest(normalize_token(token))
+    
+    def bind_vocabulary(self, vocabulary, normalize=False):
+        """
+        Precalcula, una sola vez, la posición en el modelo de cada palabra de un vocabulario
+        compartido (por ejemplo WordCounter.vocabulary), para que lookup_many pueda
+        recibir directamente arrays de identificadores de palabra.
+        
+        Args:
+            vocabulary (dict or list): Diccionario {palabra: id} o lista de palabras (id = posición)
+            normalize (bool): Si es True, las palabras se resuelven con resolve_index
+        """
+        self._ensure_loaded()
+        if normalize:
+            resolve = self.resolve_index
+        else:
+            word_index = self.word_index
+            resolve = lambda word: word_index.get(word, -1)
+        if isinstance(vocabulary, dict):
+            size = max(vocabulary.values(), default=-1) + 1
+            indices = np.full(size, -1, dtype=np.int64)
+            for word, token_id in vocabulary.items():
+                indices[token_id] = resolve(word)
+        else:
+            indices = np.fromiter((resolve(word) for word in vocabulary),
+                                  dtype=np.int64, count=len(vocabulary))
+        self._vocabulary_indices = indices
+    
+    def lookup_many(self, words, field='rating', normalize=False):
+        """
+        Busca muchas palabras a la vez.
+        
+        Args:
+            words (list or numpy.ndarray): Palabras, o array de enteros con identificadores
+                del vocabulario enlazado con bind_vocabulary
+            field (str): Campo a devolver (por defecto 'rating')
+            normalize (bool): Si es True, las palabras se resuelven con resolve_index
+        
+        Returns:
+            tuple: (valores, encontradas) - array de float alineado con la entrada, con NaN
+                   para las palabras que no están en el modelo, y máscara booleana de las que sí
+        """
+        self._ensure_loaded()
+        if isinstance(words, np.ndarray) and words.dtype.kind in 'iu':
+            if self._vocabulary_indices is None:
+                raise ValueError("Hay que llamar a bind_vocabulary antes de buscar identificadores")
+            indices = self._vocabulary_indices[words]
+        elif normalize:
+            indices = np.fromiter((self.resolve_index(word) for word in words),
+                                  dtype=np.int64, count=len(words))
+        else:
+            word_index = self.word_index
+            indices = np.fromiter((word_index.get(word, -1) for word in words),
+                                  dtype=np.int64, count=len(words))
+        found = indices >= 0
+        values = np.full(len(indices), np.nan)
+        values[found] = getattr(self, field)[indices[found]]
+        return values, found
+    
+    def _aligned_counts(self, counts):
+        """
+        Convierte unos conteos en un array de pesos alineado con las columnas del modelo.
+        
+        Args:
+            counts (dict or numpy.ndarray): Diccionario {palabra: conteo} o
+                {palabra: {'count': conteo}} (como WordCounter.get_word_counts), o array
+                de conteos alineado con las palabras del modelo
+        
+        Returns:
+            numpy.ndarray: Peso de cada palabra del modelo (0 si no aparece en los conteos)
+        """
+        if isinstance(counts, np.ndarray):
+            if len(counts) != len(self.words):
+                raise ValueError("El array de conteos debe estar alineado con las palabras del modelo")
+            return counts.astype(np.float64)
+        words = list(counts)
+        values = np.fromiter((value['count'] if isinstance(value, dict) else value
+                              for value in counts.values()), dtype=np.float64, count=len(words))
+        word_index = self.word_index
+        indices = np.fromiter((word_index.get(word, -1) for word in words),
+                              dtype=np.int64, count=len(words))
+        found = indices >= 0
+        weights = np.zeros(len(self.words))
+        np.add.at(weights, indices[found], values[found])
+        return weights
+    
+    def weighted_rating_stats(self, counts):
+        """
+        Calcula estadísticas de valoración ponderadas por frecuencia de uso.
+        
+        Args:
+            counts (dict or numpy.ndarray): Conteos, en cualquiera de los formatos de _aligned_counts
+        
+        Returns:
+            dict: Diccionario con:
+                - total_count: suma de conteos de palabras con valoración
+                - matched_words: número de palabras distintas con valoración y conteo > 0
+                - weighted_mean: media de rating ponderada por conteo
+                - weighted_sd: desviación estándar ponderada de rating
+                - standard_error: error estándar de la media ponderada debido a la incertidumbre
+                  de cada valoración (rating_sd / sqrt(n_ratings))
+                Las estadísticas son NaN si no hay ninguna palabra con valoración.
+        """
+        self._ensure_loaded()
+        weights = self._aligned_counts(counts)
+        valid = (weights > 0) & ~np.isnan(self.rating)
+        weights = weights[valid]
+        ratings = self.rating[valid]
+        total = weights.sum()
+        if total == 0:
+            return {'total_count': 0.0, 'matched_words': 0, 'weighted_mean': float('nan'),
+                    'weighted_sd': float('nan'), 'standard_error': float('nan')}
+        mean = np.dot(weights, ratings) / total
+        variance = np.dot(weights, (ratings - mean) ** 2) / total
+        with np.errstate(divide='ignore', invalid='ignore'):
+            word_se = self.rating_sd[valid] / np.sqrt(self.n_ratings[valid])
+        word_se = np.nan_to_num(word_se, nan=0.0, posinf=0.0)
+        standard_error = np.sqrt(np.dot(weights ** 2, word_se ** 2)) / total
+        return {
+            'total_count': float(total),
+            'matched_words': int(len(weights)),
+            'weighted_mean': float(mean),
+            'weighted_sd': float(np.sqrt(variance)),
+            'standard_error': float(standard_error)
+        }
+    
+    def get_rating_bin_edges(self, n_bins=10):
+        """
+        Devuelve los límites de n_bins intervalos de rating con el mismo número de palabras
+        del modelo (cuantiles). Se calculan una vez por número de intervalos a partir del
+        índice ordenado.
+        
+        Args:
+            n_bins (int): Número de intervalos
+        
+        Returns:
+            numpy.ndarray: n_bins + 1 límites crecientes
+        """
+        self._ensure_loaded()
+        if n_bins <= 0:
+            raise ValueError("n_bins debe ser positivo")
+        if n_bins not in self._bin_edges:
+            valid = self._sorted_values['rating'][:self._valid_counts['rating']]
+            if len(valid) == 0:
+                raise ValueError("El modelo no tiene valoraciones")
+            self._bin_edges[n_bins] = np.quantile(valid, np.linspace(0, 1, n_bins + 1))
+        return self._bin_edges[n_bins]
+    
+    def weighted_rating_histogram(self, counts, n_bins=10):
+        """
+        Calcula el histograma de rating ponderado por conteos sobre los intervalos de
+        get_rating_bin_edges.
+        
+        Args:
+            counts (dict or numpy.ndarray): Conteos, en cualquiera de los formatos de _aligned_counts
+            n_bins (int): Número de intervalos
+        
+        Returns:
+            tuple: (conteos por intervalo, límites de los intervalos)
+        """
+        self._ensure_loaded()
+        edges = self.get_rating_bin_edges(n_bins)
+        weights = self._aligned_counts(counts)
+        valid = ~np.isnan(self.rating)
+        histogram, _ = np.histogram(self.rating[valid], bins=edges, weights=weights[valid])
+        return histogram, edges
+    
+    @property
+    def word_data(self):
+        """
+        Diccionario {palabra: datos}, construido a partir de las columnas la primera vez que se usa.
+        """
+        self._ensure_loaded()
+        if self._word_data is None:
+            self._word_data = dict(zip(self.words.tolist(), self._get_record_list()))
+        return self._word_data
+    
+    @classmethod
+    def from_dataframe(cls, df):
+        """
+        Construye el modelo directamente a partir de las columnas de un DataFrame, sin
+        pasar por el diccionario de registros de DataFormatter.format_csv_data_from.
+        Las filas sin palabra o con valores numéricos ausentes o no válidos se descartan;
+        si una palabra está repetida, como en el constructor, queda en la posición de su
+        primera fila con los valores de la última. Los conteos solo se guardan como
+        enteros si todos lo son. Las columnas requeridas se copian al construir el
+        modelo y se procesan la primera vez que se consulta.
+        
+        Args:
+            df (pandas.DataFrame): Tabla con las columnas word, n_ratings, n, prop_known,
+                rating y rating_sd
+        
+        Returns:
+            IconicityModel: Modelo de iconicidad
+        
+        Raises:
+            ValueError: Si faltan columnas requeridas
+        """
+        missing = [column for column in ('word',) + cls.FIELDS if column not in df.columns]
+        if missing:
+            raise ValueError(f"Faltan columnas requeridas: {', '.join(missing)}")
+        
+        columns = df[['word', *cls.FIELDS]].copy()
+        model = cls.__new__(cls)
+        model._start(lambda: model._set_dataframe_columns(columns))
+        return model
+    
+    def _set_dataframe_columns(self, df):
+        """
+        Valida las filas de un DataFrame y guarda sus columnas (ver from_dataframe).
+        
+        Args:
+            df (pandas.DataFrame): Tabla con todas las columnas requeridas
+        """
+        import pandas as pd
+        
+        words = df['word']
+        valid = words.notna() & (words.astype(str).str.len() > 0)
+        numeric = {field: pd.to_numeric(df[field], errors='coerce') for field in self.FIELDS}
+        for field in self.FIELDS:
+            valid &= numeric[field].notna()
+        
+        dropped = int((~valid).sum())
+        if dropped:
+            logger.warning("Filas descartadas por datos incompletos: %d", dropped)
+        
+        # Ante palabras repetidas, los valores de la última fila en la posición de la primera
+        rows = np.flatnonzero(valid.to_numpy())
+        valid_words = words.iloc[rows].astype(str).reset_index(drop=True)
+        last = ~valid_words.duplicated(keep='last').to_numpy()
+        first_words = valid_words[~valid_words.duplicated(keep='first')]
+        rows = rows[last][pd.Index(valid_words[last]).get_indexer(first_words)]
+        
+        self._set_columns(first_words.tolist(),
+                          {field: numeric[field].to_numpy()[rows] for field in self.FIELDS})
+    
+    @classmethod
+    def from_csv(cls, file_path):
+        """
+        Construye el modelo leyendo directamente un CSV de valoraciones. El archivo se
+        lee y se comprueba su cabecera al construir el modelo; las filas se analizan la
+        primera vez que se consulta.
+        
+        Args:
+            file_path (str): Ruta del CSV
+        
+        Returns:
+            IconicityModel: Modelo de iconicidad
+        
+        Raises:
+            FileNotFoundError: Si el CSV no existe
+            ValueError: Si faltan columnas requeridas en la cabecera
+        """
+        with open(file_path, 'rb') as file:
+            content = file.read()
+        first_line = content.split(b'\n', 1)[0].decode('utf-8-sig').rstrip('\r')
+        header = next(csv.reader([first_line]), [])
+        missing = [column for column in ('word',) + cls.FIELDS if column not in header]
+        if missing:
+            raise ValueError(f"Faltan columnas requeridas en {file_path}: {', '.join(missing)}")
+        
+        model = cls.__new__(cls)
+        model._start(lambda: model._read_csv(content))
+        return model
+    
+    def _read_csv(self, content):
+        """
+        Analiza el contenido de un CSV de valoraciones y guarda sus columnas (ver from_csv).
+        
+        Args:
+            content (bytes): Contenido del CSV leído por from_csv
+        """
+        # pandas se importa aquí para que cargar un snapshot no dependa de él
+        import pandas as pd
+        
+        # Sin valores NA por defecto, para que palabras como 'null' o 'nan' no se pierdan;
+        # los valores numéricos no válidos se descartan en _set_dataframe_columns
+        df = pd.read_csv(io.BytesIO(content), keep_default_na=False, dtype={'word': str})
+        self._set_dataframe_columns(df)
+    
+    def save(self, path, source_path=None):
+        """
+        Guarda el modelo en un snapshot binario .npz (sin comprimir) con las columnas,
+        para reconstruirlo con load sin volver a procesar el CSV. Se escribe en un
+        archivo temporal del mismo directorio que luego sustituye al snapshot, así que
+        una escritura interrumpida no deja un snapshot dañado.
+        
+        Args:
+            path (str): Ruta del snapshot (se le añade la extensión .npz si no la tiene)
+            source_path (str, optional): CSV del que procede el modelo; su suma de
+                comprobación se guarda para detectar snapshots desactualizados
+        """
+        self._ensure_loaded()
+        checksum = file_checksum(source_path) if source_path else ''
+        if not path.endswith('.npz'):
+            path += '.npz'
+        fd, temp_path = tempfile.mkstemp(suffix='.npz', dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                np.savez(file,
+                         version=np.array(SNAPSHOT_VERSION),
+                         source_checksum=np.array(checksum),
+                         words=np.array([str(word) for word in self.words], dtype=str),
+                         **{field: getattr(self, field) for field in self.FIELDS})
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    
+    @classmethod
+    def load(cls, path, source_path=None):
+        """
+        Carga un modelo desde un snapshot creado con save. La versión y la suma de
+        comprobación se validan y las columnas se leen al llamar a load; el índice de
+        palabras y los índices ordenados se construyen la primera vez que se consulta.
+        
+        Args:
+            path (str): Ruta del snapshot
+            source_path (str, optional): CSV de origen; si se indica, el snapshot solo es
+                válido si se creó a partir de un CSV con el mismo contenido
+        
+        Returns:
+            IconicityModel: Modelo cargado
+        
+        Raises:
+            ValueError: Si el snapshot no es compatible o no corresponde al CSV de origen
+        """
+        with np.load(path, allow_pickle=False) as snapshot:
+            if int(snapshot['version']) != SNAPSHOT_VERSION:
+                raise ValueError(f"Versión de snapshot no soportada en {path}")
+            if source_path and str(snapshot['source_checksum']) != file_checksum(source_path):
+                raise ValueError(f"El snapshot {path} no corresponde a {source_path}")
+            # Se leen ya los mismos datos que se han validado
+            words = snapshot['words']
+            columns = {field: snapshot[field] for field in cls.FIELDS}
+        model = cls.__new__(cls)
+        model._start(lambda: model._set_columns(words.tolist(), columns))
+        return model
+    
+    @classmethod
+    def load_or_build(cls, csv_path, snapshot_path):
+        """
+        Carga el modelo desde el snapshot si corresponde al CSV; si no existe, está
+        desactualizado o dañado, lo construye desde el CSV y guarda un snapshot nuevo.
+        
+        Args:
+            csv_path (str): Ruta del CSV de valoraciones
+            snapshot_path (str): Ruta del snapshot .npz
+        
+        Returns:
+            IconicityModel: Modelo de iconicidad
+        """
+        if os.path.exists(snapshot_path):
+            try:
+                return cls.load(snapshot_path, source_path=csv_path)
+            except (ValueError, KeyError, OSError, EOFError, zipfile.BadZipFile):
+                pass
+        model = cls.from_csv(csv_path)
+        model.save(snapshot_path, source_path=csv_path)
+        return model
     
     def get_word_data(self, word):
         """
@@ -55,7 +891,11 @@ class IconicityModel:
         Returns:
             dict: Datos de la palabra o None si no existe
         """
-        return self.word_data.get(word)
+        self._ensure_loaded()
+        index = self.word_index.get(word)
+        if index is None:
+            return None
+        return self._get_record_list()[index]
     
     def get_all_words(self):
         """
@@ -64,7 +904,8 @@ class IconicityModel:
         Returns:
             list: Lista de todas las palabras
         """
-        return list(self.word_data.keys())
+        self._ensure_loaded()
+        return list(self.word_index)
     
     def get_words_by_rating(self, min_rating=None, max_rating=None):
         """
@@ -75,15 +916,10 @@ class IconicityModel:
             max_rating (float): Valoración máxima (opcional)
             
         Returns:
-            dict: Diccionario con las palabras y sus datos que cumplen el criterio
+            dict: Diccionario con las palabras y sus datos que cumplen el criterio,
+                 ordenado de menor a mayor valoración
         """
-        filtered_words = {}
-        for word, data in self.word_data.items():
-            rating = data['rating']
-            if (min_rating is None or rating >= min_rating) and \
-               (max_rating is None or rating <= max_rating):
-                filtered_words[word] = data
-        return filtered_words
+        return self.get_words_in_range('rating', min_rating, max_rating)
     
     def get_words_by_known_proportion(self, min_prop=None, max_prop=None):
         """
@@ -94,15 +930,10 @@ class IconicityModel:
             max_prop (float): Proporción máxima (opcional)
             
         Returns:
-            dict: Diccionario con las palabras y sus datos que cumplen el criterio
+            dict: Diccionario con las palabras y sus datos que cumplen el criterio,
+                 ordenado de menor a mayor proporción
         """
-        filtered_words = {}
-        for word, data in self.word_data.items():
-            prop = data['prop_known']
-            if (min_prop is None or prop >= min_prop) and \
-               (max_prop is None or prop <= max_prop):
-                filtered_words[word] = data
-        return filtered_words
+        return self.get_words_in_range('prop_known', min_prop, max_prop)
     
     def get_all_word_data(self):
         """
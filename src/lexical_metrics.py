@@ -0,0 +1,157 @@
+from collections import deque, defaultdict
+from src.word_counter import WordCounter
+
+# Rasgos del nivel %mor que corresponden a un morfema flexivo propio (-s, -ed, -ing, ...)
+INFLECTIONAL_FEATURES = frozenset(['Plur', 'Past', 'Ger', 'Cmp', 'Sup'])
+
+def count_morphemes(mor_items):
+    """
+    Cuenta los morfemas de una expresión a partir de su nivel %mor.
+    Cada lema (incluidos los clíticos) cuenta como un morfema, más uno por cada
+    rasgo flexivo (plural, pasado, gerundio, comparativo, superlativo) y por la
+    tercera persona del presente (salvo 'be') y el participio presente de los verbos.
+    
+    Args:
+        mor_items (list): Tuplas (pos, lema, rasgos) como las devuelve MorParser
+    
+    Returns:
+        int: Número de morfemas
+    """
+    morphemes = 0
+    for pos, lemma, features in mor_items:
+        morphemes += 1
+        for feature in features:
+            if feature in INFLECTIONAL_FEATURES:
+                morphemes += 1
+        if pos == 'verb' and 'Pres' in features and (
+                'Part' in features or ('S3' in features and lemma != 'be')):
+            morphemes += 1
+    return morphemes
+
+class _GroupMetrics:
+    """
+    Acumulador de métricas de un grupo (un archivo, un niño, un grupo de edad...).
+    Todas las actualizaciones son O(1) por palabra.
+    """
+    
+    def __init__(self, window_size):
+        self.window_size = window_size
+        self.utterances = 0
+        self.tokens = 0
+        self.morphemes = 0
+        self.morpheme_utterances = 0
+        self.type_counts = defaultdict(int)
+        # Ventana deslizante para el MATTR
+        self.window = deque()
+        self.window_counts = defaultdict(int)
+        self.window_types = 0
+        self.window_ttr_sum = 0.0
+        self.windows = 0
+    
+    def add(self, words, morphemes):
+        """
+        Añade una expresión (lista de palabras y número de morfemas, o None si no hay %mor).
+        """
+        self.utterances += 1
+        self.tokens += len(words)
+        if morphemes is not None:
+            self.morphemes += morphemes
+            self.morpheme_utterances += 1
+        
+        window = self.window
+        window_counts = self.window_counts
+        for word in words:
+            self.type_counts[word] += 1
+            window.append(word)
+            window_counts[word] += 1
+            if window_counts[word] == 1:
+                self.window_types += 1
+            if len(window) > self.window_size:
+                oldest = window.popleft()
+                window_counts[oldest] -= 1
+                if window_counts[oldest] == 0:
+                    del window_counts[oldest]
+                    self.window_types -= 1
+            if len(window) == self.window_size:
+                self.window_ttr_sum += self.window_types / self.window_size
+                self.windows += 1
+    
+    def summary(self):
+        """
+        Devuelve el diccionario de métricas del grupo.
+        """
+        types = len(self.type_counts)
+        ttr = types / self.tokens if self.tokens else 0.0
+        return {
+            'utterances': self.utterances,
+            'tokens': self.tokens,
+            'types': types,
+            'mlu_words': self.tokens / self.utterances if self.utterances else 0.0,
+            'mlu_morphemes': (self.morphemes / self.morpheme_utterances
+                              if self.morpheme_utterances else None),
+            'ttr': ttr,
+            # Con menos palabras que la ventana, el MATTR coincide con el TTR
+            'mattr': self.window_ttr_sum / self.windows if self.windows else ttr
+        }
+
+class LexicalMetrics:
+    """
+    Clase para calcular métricas de desarrollo léxico (MLU, TTR y MATTR) en una sola
+    pasada sobre las expresiones, para varios niveles de agrupación a la vez.
+    """
+    
+    def __init__(self, window_size=50):
+        """
+        Inicializa el calculador de métricas.
+        
+        Args:
+            window_size (int): Tamaño de la ventana deslizante del MATTR (moving-average TTR)
+        """
+        if window_size <= 0:
+            raise ValueError("window_size debe ser positivo")
+        self.window_size = window_size
+        self.groups = {}
+    
+    def add_utterance(self, words, groups, mor_items=None):
+        """
+        Añade una expresión ya tokenizada a todos los grupos a los que pertenece.
+        
+        Args:
+            words (list): Palabras de la expresión, en orden
+            groups (dict): Grupo de la expresión en cada nivel, por ejemplo
+                {'file': '000828.cha', 'child': 'Lew', 'age_group': '01Y02Q'}
+            mor_items (list, optional): Nivel %mor de la expresión, para el MLU en morfemas
+        """
+        morphemes = count_morphemes(mor_items) if mor_items is not None else None
+        for level, key in groups.items():
+            group = self.groups.get((level, key))
+            if group is None:
+                group = self.groups[(level, key)] = _GroupMetrics(self.window_size)
+            group.add(words, morphemes)
+    
+    def add_text(self, text, groups, mor_items=None):
+        """
+        Tokeniza un texto como WordCounter y lo añade con add_utterance.
+        """
+        self.add_utterance(WordCounter.tokenize(text), groups, mor_items)
+    
+    def get_metrics(self, level):
+        """
+        Obtiene las métricas de todos los grupos de un nivel.
+        
+        Args:
+            level (str): Nivel de agrupación (por ejemplo 'age_group')
+        
+        Returns:
+            dict: Diccionario {grupo: {'utterances', 'tokens', 'types', 'mlu_words',
+                 'mlu_morphemes', 'ttr', 'mattr'}}. mlu_morphemes es None si el grupo no tiene %mor.
+        """
+        return {key: group.summary()
+                for (group_level, key), group in self.groups.items()
+                if group_level == level}
+    
+    def clear(self):
+        """
+        Elimina todas las métricas acumuladas.
+        """
+        self.groups.clear()
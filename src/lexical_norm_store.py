@@ -0,0 +1,257 @@
+import math
+import numpy as np
+
+class LexicalNormStore:
+    """
+    Almacén de normas léxicas (iconicidad, edad de adquisición, concreción, frecuencia...)
+    alineadas por columnas sobre un índice de palabras compartido.
+    """
+    
+    def __init__(self):
+        """
+        Inicializa un almacén vacío.
+        """
+        self.words = []
+        self.word_index = {}
+        # Normas registradas: {nombre: {'path', 'word_column', 'columns', 'prefix'}}
+        self.norms = {}
+        # Columna -> norma de la que procede
+        self._column_norms = {}
+        # Columnas ya cargadas, posiblemente más cortas que el índice actual
+        self._columns = {}
+        # Posición en el índice compartido de cada fila de cada norma cargada
+        self._row_indices = {}
+    
+    def _register_columns(self, name, columns, prefix):
+        """
+        Asocia las columnas de una norma a su nombre, comprobando que no haya colisiones.
+        """
+        qualified = [f'{prefix}{column}' for column in columns]
+        for column in qualified:
+            if column in self._column_norms:
+                raise ValueError(f"La columna {column} ya existe; use un prefijo para la norma {name}")
+        for column in qualified:
+            self._column_norms[column] = name
+        return qualified
+    
+    def add_norm(self, name, path, word_column='word', columns=None, prefix=''):
+        """
+        Registra un CSV de normas. Solo se lee la cabecera: cada columna se carga
+        la primera vez que se consulta.
+        
+        Args:
+            name (str): Nombre de la norma (p. ej. 'aoa')
+            path (str): Ruta del CSV
+            word_column (str): Columna con la palabra
+            columns (list, optional): Columnas a incluir; por defecto todas menos la palabra
+            prefix (str): Prefijo para los nombres de columna en el almacén (p. ej. 'aoa_')
+        """
+        import pandas as pd
+        
+        if name in self.norms:
+            raise ValueError(f"La norma {name} ya está registrada")
+        header = pd.read_csv(path, nrows=0).columns.tolist()
+        if word_column not in header:
+            raise ValueError(f"El CSV {path} no tiene la columna {word_column}")
+        if columns is None:
+            columns = [column for column in header if column != word_column]
+        missing = [column for column in columns if column not in header]
+        if missing:
+            raise ValueError(f"Faltan columnas en {path}: {', '.join(missing)}")
+        qualified = self._register_columns(name, columns, prefix)
+        self.norms[name] = {
+            'path': path,
+            'word_column': word_column,
+            'columns': dict(zip(qualified, columns)),
+            'prefix': prefix
+        }
+    
+    def add_dataframe(self, name, df, word_column='word', columns=None, prefix=''):
+        """
+        Añade una norma desde un DataFrame ya cargado (se alinea en el momento).
+        
+        Args:
+            name (str): Nombre de la norma
+            df (pandas.DataFrame): Tabla de la norma
+            word_column (str): Columna con la palabra
+            columns (list, optional): Columnas a incluir; por defecto todas menos la palabra
+            prefix (str): Prefijo para los nombres de columna en el almacén
+        """
+        import pandas as pd
+        
+        if name in self.norms:
+            raise ValueError(f"La norma {name} ya está registrada")
+        if columns is None:
+            columns = [column for column in df.columns if column != word_column]
+        qualified = self._register_columns(name, columns, prefix)
+        self.norms[name] = {
+            'path': None,
+            'word_column': word_column,
+            'columns': dict(zip(qualified, columns)),
+            'prefix': prefix
+        }
+        rows = self._align_words(name, df[word_column].tolist())
+        for column, source_column in zip(qualified, columns):
+            values = pd.to_numeric(df[source_column], errors='coerce').to_numpy(dtype=np.float64)
+            self._store_column(column, rows, values)
+    
+    def add_iconicity_model(self, model, name='iconicity', prefix=''):
+        """
+        Añade las columnas de un IconicityModel sin volver a leer su CSV.
+        
+        Args:
+            model (IconicityModel): Modelo de iconicidad
+            name (str): Nombre de la norma
+            prefix (str): Prefijo para los nombres de columna en el almacén
+        """
+        if name in self.norms:
+            raise ValueError(f"La norma {name} ya está registrada")
+        qualified = self._register_columns(name, model.FIELDS, prefix)
+        self.norms[name] = {
+            'path': None,
+            'word_column': 'word',
+            'columns': dict(zip(qualified, model.FIELDS)),
+            'prefix': prefix
+        }
+        rows = self._align_words(name, model.words.tolist())
+        for column, field in zip(qualified, model.FIELDS):
+            self._store_column(column, rows, getattr(model, field).astype(np.float64))
+    
+    def _align_words(self, name, words):
+        """
+        Añade al índice compartido las palabras nuevas de una norma y devuelve la
+        posición en el índice de cada fila.
+        """
+        word_index = self.word_index
+        rows = np.empty(len(words), dtype=np.int64)
+        for row, word in enumerate(words):
+            index = word_index.get(word)
+            if index is None:
+                index = word_index[word] = len(self.words)
+                self.words.append(word)
+            rows[row] = index
+        self._row_indices[name] = rows
+        return rows
+    
+    def _store_column(self, column, rows, values):
+        """
+        Distribuye los valores de una columna en sus posiciones del índice compartido.
+        """
+        aligned = np.full(len(self.words), np.nan)
+        aligned[rows] = values
+        self._columns[column] = aligned
+    
+    def _load_column(self, column):
+        """
+        Lee del CSV una columna registrada (y, la primera vez, la columna de palabras).
+        """
+        import pandas as pd
+        
+        norm_name = self._column_norms[column]
+        norm = self.norms[norm_name]
+        source_column = norm['columns'][column]
+        usecols = [source_column]
+        rows = self._row_indices.get(norm_name)
+        if rows is None:
+            usecols.append(norm['word_column'])
+        df = pd.read_csv(norm['path'], usecols=usecols, keep_default_na=False,
+                         dtype={norm['word_column']: str})
+        if rows is None:
+            rows = self._align_words(norm_name, df[norm['word_column']].tolist())
+        values = pd.to_numeric(df[source_column], errors='coerce').to_numpy(dtype=np.float64)
+        self._store_column(column, rows, values)
+    
+    def get_column_names(self):
+        """
+        Devuelve los nombres de todas las columnas registradas, cargadas o no.
+        """
+        return list(self._column_norms)
+    
+    def get_column(self, column):
+        """
+        Devuelve una columna alineada con el índice compartido (NaN para las palabras
+        que no están en su norma), cargándola si aún no se ha leído.
+        
+        Args:
+            column (str): Nombre de la columna
+        
+        Returns:
+            numpy.ndarray: Valores de la columna, uno por palabra de self.words
+        """
+        if column not in self._column_norms:
+            raise ValueError(f"La columna {column} no está registrada")
+        if column not in self._columns:
+            self._load_column(column)
+        values = self._columns[column]
+        if len(values) < len(self.words):
+            # El índice ha crecido al cargar otras normas: las palabras nuevas no tienen valor
+            values = np.concatenate([values, np.full(len(self.words) - len(values), np.nan)])
+            self._columns[column] = values
+        return values
+    
+    def lookup_many(self, words, column):
+        """
+        Busca muchas palabras a la vez en una columna.
+        
+        Args:
+            words (list): Palabras a buscar
+            column (str): Nombre de la columna
+        
+        Returns:
+            tuple: (valores, encontradas) - array de float con NaN para las palabras sin
+                   valor, y máscara booleana de las que tienen valor
+        """
+        values = self.get_column(column)
+        word_index = self.word_index
+        indices = np.fromiter((word_index.get(word, -1) for word in words),
+                              dtype=np.int64, count=len(words))
+        result = np.full(len(indices), np.nan)
+        known = indices >= 0
+        result[known] = values[indices[known]]
+        return result, ~np.isnan(result)
+    
+    def join(self, columns, how='inner'):
+        """
+        Une varias columnas por alineación de índice.
+        
+        Args:
+            columns (list): Nombres de las columnas
+            how (str): 'inner' para las palabras con valor en todas las columnas,
+                'outer' para las que tienen valor en alguna
+        
+        Returns:
+            tuple: (palabras, columnas) - lista de palabras y diccionario {columna: array}
+                   con los valores alineados con esas palabras
+        """
+        if how not in ('inner', 'outer'):
+            raise ValueError("how debe ser 'inner' u 'outer'")
+        # Cargar antes todas las columnas: cargar una norma puede ampliar el índice
+        for column in columns:
+            self.get_column(column)
+        arrays = [self.get_column(column) for column in columns]
+        if not arrays:
+            return [], {}
+        present = [~np.isnan(values) for values in arrays]
+        mask = np.logical_and.reduce(present) if how == 'inner' else np.logical_or.reduce(present)
+        indices = np.flatnonzero(mask)
+        words = [self.words[index] for index in indices.tolist()]
+        return words, {column: values[indices] for column, values in zip(columns, arrays)}
+    
+    def to_dict(self, columns, how='inner'):
+        """
+        Devuelve el resultado de join en el formato {palabra: {columna: valor}} que usan
+        WordDictionaryMerger y el resto del proyecto. Los valores ausentes se omiten.
+        
+        Args:
+            columns (list): Nombres de las columnas
+            how (str): 'inner' u 'outer', como en join
+        
+        Returns:
+            dict: Diccionario con las palabras y sus valores
+        """
+        words, joined = self.join(columns, how)
+        lists = [joined[column].tolist() for column in columns]
+        result = {}
+        for word, row in zip(words, zip(*lists)):
+            result[word] = {column: value for column, value in zip(columns, row) if not math.isnan(value)}
+        return result
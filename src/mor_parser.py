@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import re
+
+class MorParser:
+    """
+    Clase para leer el nivel morfológico (%mor) de los archivos .cha.
+    """
+    
+    # Un rasgo empieza por mayúscula (eat-Fin-Imp-S); el resto del lema puede llevar guiones
+    _LEMMA_PATTERN = re.compile(r'[^-]+(?:-(?![A-Z])[^-]*)*')
+    
+    def __init__(self, cache_dir=None):
+        """
+        Inicializa el parser.
+        
+        Args:
+            cache_dir (str, optional): Directorio donde guardar en disco los análisis de cada
+                archivo para reutilizarlos entre ejecuciones. Si es None, solo se cachea en memoria.
+        """
+        self.cache_dir = cache_dir
+        self._cache = {}
+    
+    def parse_mor_line(self, mor_text):
+        """
+        Analiza el contenido de una línea %mor.
+        
+        Args:
+            mor_text (str): Texto de la línea sin el prefijo '%mor:',
+                por ejemplo 'pron|that-Dem-S1~aux|be-Fin-Ind-Pres-S3 noun|dinner .'
+        
+        Returns:
+            list: Lista de tuplas (pos, lema, rasgos) incluyendo los clíticos, por ejemplo
+                 ('verb', 'eat', ('Fin', 'Imp', 'S'))
+        """
+        items = []
+        for token in mor_text.split():
+            for part in token.split('~'):
+                pos, separator, rest = part.partition('|')
+                if not separator or not rest:
+                    continue
+                match = self._LEMMA_PATTERN.match(rest)
+                if match is None:
+                    # Lema que empieza por guion (p. ej. 'suffix|-ing'): se toma entero, sin rasgos
+                    lemma, features = rest, ()
+                else:
+                    lemma = match.group(0)
+                    features = tuple(rest[len(lemma) + 1:].split('-')) if len(rest) > len(lemma) else ()
+                items.append((pos, lemma.lower(), features))
+        return items
+    
+    def _signature(self, file_path):
+        """
+        Obtiene la firma (tamaño y fecha de modificación) que invalida la caché de un archivo.
+        """
+        stat = os.stat(file_path)
+        return [stat.st_size, stat.st_mtime_ns]
+    
+    def _disk_cache_path(self, file_path):
+        """
+        Devuelve la ruta del archivo de caché en disco para un archivo .cha.
+        """
+        key = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f'{key}.json')
+    
+    def parse_file(self, file_path):
+        """
+        Analiza el nivel %mor de un archivo .cha. El resultado se cachea y solo se
+        vuelve a analizar si el archivo cambia.
+        
+        Args:
+            file_path (str): Ruta del archivo .cha
+        
+        Returns:
+            list: Lista de diccionarios {'speaker': str, 'mor': list} con una entrada por
+                 expresión que tiene nivel %mor, o None si no se pudo leer el archivo
+        """
+        try:
+            signature = self._signature(file_path)
+        except FileNotFoundError:
+            print(f"Error: No se encontró el archivo {file_path}")
+            return None
+        
+        cached = self._cache.get(file_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        utterances = None
+        if self.cache_dir:
+            utterances = self._read_disk_cache(file_path, signature)
+        if utterances is None:
+            utterances = self._parse_content(file_path)
+            if self.cache_dir:
+                self._write_disk_cache(file_path, signature, utterances)
+        
+        self._cache[file_path] = (signature, utterances)
+        return utterances
+    
+    def _parse_content(self, file_path):
+        """
+        Lee el archivo y analiza cada línea %mor asociándola al hablante de la expresión anterior.
+        """
+        utterances = []
+        speaker = None
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.startswith('*'):
+                    speaker = line[1:].split(':', 1)[0].strip()
+                elif line.startswith('%mor:') and speaker is not None:
+                    utterances.append({
+                        'speaker': speaker,
+                        'mor': self.parse_mor_line(line[len('%mor:'):])
+                    })
+        return utterances
+    
+    def _read_disk_cache(self, file_path, signature):
+        """
+        Devuelve el análisis guardado en disco si sigue siendo válido, o None.
+        """
+        try:
+            with open(self._disk_cache_path(file_path), 'r', encoding='utf-8') as file:
+                cached = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+        if cached.get('signature') != signature:
+            return None
+        return [{'speaker': entry['speaker'],
+                 'mor': [(pos, lemma, tuple(features)) for pos, lemma, features in entry['mor']]}
+                for entry in cached['utterances']]
+    
+    def _write_disk_cache(self, file_path, signature, utterances):
+        """
+        Guarda en disco el análisis de un archivo.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._disk_cache_path(file_path), 'w', encoding='utf-8') as file:
+            json.dump({'signature': signature, 'utterances': utterances}, file)
+    
+    def clear_cache(self):
+        """
+        Vacía la caché en memoria.
+        """
+        self._cache.clear()
@@ -1,16 +1,250 @@
 import re
 from collections import defaultdict
 
+class SpaceSavingCounter:
+    """
+    Contador con memoria acotada: Space-Saving para las claves más frecuentes y
+    Count-Min sketch para estimar el resto.
+    """
+    
+    def __init__(self, capacity, sketch_width, sketch_depth):
+        """
+        Inicializa el contador.
+        
+        Args:
+            capacity (int): Número máximo de claves con contador propio.
+            sketch_width (int): Número de columnas del Count-Min sketch.
+            sketch_depth (int): Número de filas (funciones hash) del Count-Min sketch.
+        """
+        if min(capacity, sketch_width, sketch_depth) <= 0:
+            raise ValueError("capacity, sketch_width y sketch_depth deben ser positivos")
+        self.capacity = capacity
+        self.sketch_width = sketch_width
+        self.sketch_depth = sketch_depth
+        # Conteo y error máximo por clave monitorizada, más cubetas {conteo: {clave: None}}
+        # para localizar la clave de menor conteo en O(1)
+        self.counts = {}
+        self.errors = {}
+        self._buckets = {}
+        self._min_count = 0
+        self._sketch = [[0] * sketch_width for _ in range(sketch_depth)]
+    
+    def _sketch_cells(self, key):
+        """
+        Devuelve la columna del Count-Min sketch que corresponde a la clave en cada fila.
+        """
+        return [hash((row, key)) % self.sketch_width for row in range(self.sketch_depth)]
+    
+    def add(self, key):
+        """
+        Cuenta una ocurrencia de una clave.
+        
+        Args:
+            key (str): Clave a contar
+        """
+        for row, column in enumerate(self._sketch_cells(key)):
+            self._sketch[row][column] += 1
+        
+        count = self.counts.get(key)
+        if count is None and len(self.counts) < self.capacity:
+            self.counts[key] = 1
+            self.errors[key] = 0
+            self._buckets.setdefault(1, {})[key] = None
+            self._min_count = 1
+            return
+        
+        if count is None:
+            # Sustituir la clave de menor conteo; la nueva hereda ese conteo como error
+            count = self._min_count
+            evicted = next(iter(self._buckets[count]))
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.errors[key] = count
+            bucket = self._buckets[count]
+            del bucket[evicted]
+        else:
+            bucket = self._buckets[count]
+            del bucket[key]
+        
+        self.counts[key] = count + 1
+        self._buckets.setdefault(count + 1, {})[key] = None
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+    
+    def estimate(self, key):
+        """
+        Estima el conteo de una clave: el del contador Space-Saving si está monitorizada
+        y el del Count-Min sketch si no, que puede sobreestimar pero nunca quedarse corto.
+        
+        Args:
+            key (str): Clave a consultar
+        
+        Returns:
+            int: Conteo estimado
+        """
+        if key in self.counts:
+            return self.counts[key]
+        return min(self._sketch[row][column]
+                   for row, column in enumerate(self._sketch_cells(key)))
+    
+    def get_counts(self):
+        """
+        Obtiene los conteos de las claves monitorizadas con su cota de error: el conteo
+        real está entre count - error y count.
+        
+        Returns:
+            dict: Diccionario {clave: {'count': int, 'error': int}}
+        """
+        return {key: {'count': count, 'error': self.errors[key]}
+                for key, count in self.counts.items()}
+
+
 class WordCounter:
     """
     Clase para contar palabras en un texto.
     """
     
-    def __init__(self):
+    def __init__(self, approximate=False, capacity=10000, sketch_width=2048, sketch_depth=4,
+                 ngram_sizes=(), ngrams_within_utterance=True):
         """
         Inicializa el contador de palabras.
+        
+        Args:
+            approximate (bool): Si es True, cuenta con memoria acotada: Space-Saving para
+                las palabras más frecuentes y Count-Min sketch para estimar el resto.
+            capacity (int): Número máximo de palabras con contador propio en modo aproximado.
+            sketch_width (int): Número de columnas del Count-Min sketch.
+            sketch_depth (int): Número de filas (funciones hash) del Count-Min sketch.
+            ngram_sizes (iterable): Tamaños de n-grama (>= 2) a contar en la misma pasada,
+                por ejemplo (2, 3) para bigramas y trigramas. En modo aproximado cada tamaño
+                tiene su propio contador acotado con la misma capacidad y sketch que las
+                palabras, y no se construye el vocabulario de identificadores.
+            ngrams_within_utterance (bool): Si es True, los n-gramas no cruzan el límite
+                entre textos (expresiones) distintos.
         """
-        self.word_counts = defaultdict(int)
+        if any(n < 2 for n in ngram_sizes):
+            raise ValueError("Los tamaños de n-grama deben ser mayores o iguales que 2")
+        self.ngram_sizes = tuple(sorted(set(ngram_sizes)))
+        self.ngrams_within_utterance = ngrams_within_utterance
+        self.approximate = approximate
+        self.capacity = capacity
+        self.sketch_width = sketch_width
+        self.sketch_depth = sketch_depth
+        self._reset()
+    
+    def _reset(self):
+        """
+        Crea las estructuras de conteo según el modo seleccionado.
+        """
+        # Los n-gramas se guardan como tuplas de identificadores de palabra
+        self.vocabulary = {}
+        self._id_to_word = []
+        self._history = []
+        if not self.approximate:
+            self.word_counts = defaultdict(int)
+            self.ngram_counts = {n: defaultdict(int) for n in self.ngram_sizes}
+            return
+        # En modo aproximado las palabras y los n-gramas (como cadenas, sin vocabulario)
+        # van a contadores acotados
+        self._approximate_counter = self._new_approximate_counter()
+        self.word_counts = self._approximate_counter.counts
+        self._errors = self._approximate_counter.errors
+        self.ngram_counts = {n: self._new_approximate_counter() for n in self.ngram_sizes}
+    
+    def _new_approximate_counter(self):
+        """
+        Crea un contador acotado con la capacidad y el sketch configurados.
+        """
+        return SpaceSavingCounter(self.capacity, self.sketch_width, self.sketch_depth)
+    
+    @staticmethod
+    def tokenize(text):
+        """
+        Divide un texto en palabras en minúsculas.
+        
+        Args:
+            text (str): Texto a dividir
+        
+        Returns:
+            list: Lista de palabras
+        """
+        return re.findall(r'\b\w+\b', text.lower())
+    
+    def count_tokens(self, words):
+        """
+        Cuenta una expresión ya tokenizada (por ejemplo, con tokenize).
+        
+        Args:
+            words (list): Palabras de la expresión, en orden
+        """
+        self._add_words(words)
+    
+    def _add_words(self, words):
+        """
+        Suma una ocurrencia por cada palabra de la lista.
+        
+        Args:
+            words (list): Palabras a contar
+        """
+        if self.ngram_sizes:
+            self._add_ngrams(words)
+        if not self.approximate:
+            for word in words:
+                self.word_counts[word] += 1
+            return
+        add = self._approximate_counter.add
+        for word in words:
+            add(word)
+    
+    def _add_ngrams(self, words):
+        """
+        Cuenta los n-gramas de una expresión ya tokenizada.
+        
+        Args:
+            words (list): Palabras de la expresión, en orden
+        """
+        if self.approximate:
+            self._add_approximate_ngrams(words)
+            return
+        vocabulary = self.vocabulary
+        ids = []
+        for word in words:
+            word_id = vocabulary.get(word)
+            if word_id is None:
+                word_id = vocabulary[word] = len(self._id_to_word)
+                self._id_to_word.append(word)
+            ids.append(word_id)
+        
+        # Sin límite de expresión se antepone la cola de la expresión anterior
+        history = self._history
+        sequence = history + ids
+        start = len(history)
+        for n in self.ngram_sizes:
+            counts = self.ngram_counts[n]
+            # Solo los n-gramas que terminan en una palabra nueva
+            for end in range(max(start, n - 1), len(sequence)):
+                counts[tuple(sequence[end - n + 1:end + 1])] += 1
+        if not self.ngrams_within_utterance:
+            self._history = sequence[-(self.ngram_sizes[-1] - 1):]
+    
+    def _add_approximate_ngrams(self, words):
+        """
+        Cuenta los n-gramas de una expresión en modo aproximado, como cadenas.
+        
+        Args:
+            words (list): Palabras de la expresión, en orden
+        """
+        history = self._history
+        sequence = history + list(words)
+        start = len(history)
+        for n in self.ngram_sizes:
+            add = self.ngram_counts[n].add
+            for end in range(max(start, n - 1), len(sequence)):
+                add(' '.join(sequence[end - n + 1:end + 1]))
+        if not self.ngrams_within_utterance:
+            self._history = sequence[-(self.ngram_sizes[-1] - 1):]
     
     def count_words(self, data):
         """
@@ -21,34 +255,121 @@ class WordCounter:
         """
         # Si data es un string, procesarlo directamente
         if isinstance(data, str):
-            words = re.findall(r'\b\w+\b', data.lower())
-            for word in words:
-                self.word_counts[word] += 1
+            self._add_words(self.tokenize(data))
         # Si data es un diccionario, procesar cada entrada
         elif isinstance(data, dict):
             if 'text' in data:
-                words = re.findall(r'\b\w+\b', data['text'].lower())
-                for word in words:
-                    self.word_counts[word] += 1
+                self._add_words(self.tokenize(data['text']))
             else:
                 for entry in data.values():
                     if isinstance(entry, dict) and 'text' in entry:
-                        words = re.findall(r'\b\w+\b', entry['text'].lower())
-                        for word in words:
-                            self.word_counts[word] += 1
+                        self._add_words(self.tokenize(entry['text']))
+    
+    def count_lemmas(self, data, include_pos=False):
+        """
+        Cuenta lemas a partir del nivel %mor analizado por MorParser, en lugar de formas superficiales.
+        
+        Args:
+            data (list or dict): Lista de tuplas (pos, lema, rasgos) de una expresión, o
+                lista/diccionario de expresiones con campo 'mor' (como devuelve MorParser.parse_file).
+            include_pos (bool): Si es True, la clave es 'pos|lema' (p. ej. 'noun|dinner');
+                si es False, solo el lema.
+        """
+        if isinstance(data, dict):
+            data = data.values()
+        data = list(data)
+        if data and isinstance(data[0], dict):
+            for entry in data:
+                self.count_lemmas(entry.get('mor', []), include_pos)
+            return
+        if include_pos:
+            self._add_words([f'{item[0]}|{item[1]}' for item in data])
+        else:
+            self._add_words([item[1] for item in data])
     
     def get_word_counts(self):
         """
         Obtiene el diccionario de conteo de palabras.
         
+        En modo aproximado solo incluye las palabras monitorizadas y cada entrada
+        tiene además 'error': el conteo real está entre count - error y count.
+        
         Returns:
             dict: Diccionario con palabras como claves y diccionarios con conteos como valores.
         """
+        if self.approximate:
+            return self._approximate_counter.get_counts()
         result = {}
         for word, count in self.word_counts.items():
             result[word] = {'count': count}
         return result
     
+    def get_count_estimate(self, word):
+        """
+        Obtiene el conteo de una palabra. En modo aproximado usa el contador
+        Space-Saving si la palabra está monitorizada y el Count-Min sketch si no,
+        por lo que el valor puede sobreestimar el conteo real pero nunca quedarse corto.
+        
+        Args:
+            word (str): Palabra a consultar
+        
+        Returns:
+            int: Conteo de la palabra
+        """
+        word = word.lower()
+        if not self.approximate:
+            return self.word_counts.get(word, 0)
+        return self._approximate_counter.estimate(word)
+    
+    def get_heavy_hitters(self, n=10):
+        """
+        Obtiene las n palabras más frecuentes con su cota de error.
+        
+        Args:
+            n (int): Número de palabras a retornar.
+        
+        Returns:
+            list: Lista de tuplas (palabra, conteo, error) ordenadas por frecuencia.
+        """
+        errors = self._errors if self.approximate else {}
+        return [(word, count, errors.get(word, 0)) for word, count in self.get_most_common(n)]
+    
+    def get_ngram_counts(self, n):
+        """
+        Obtiene el conteo de n-gramas de un tamaño dado.
+        
+        Args:
+            n (int): Tamaño del n-grama (debe estar en ngram_sizes)
+        
+        Returns:
+            dict: Diccionario con los n-gramas (palabras separadas por espacios) como claves
+                 y diccionarios con conteos como valores (con 'error' en modo aproximado,
+                 como get_word_counts).
+        """
+        if n not in self.ngram_counts:
+            raise ValueError(f"No se están contando n-gramas de tamaño {n}")
+        if self.approximate:
+            return self.ngram_counts[n].get_counts()
+        id_to_word = self._id_to_word
+        result = {}
+        for key, count in self.ngram_counts[n].items():
+            result[' '.join(id_to_word[word_id] for word_id in key)] = {'count': count}
+        return result
+    
+    def get_most_common_ngrams(self, n, k=10):
+        """
+        Obtiene los k n-gramas de tamaño n más comunes.
+        
+        Args:
+            n (int): Tamaño del n-grama (debe estar en ngram_sizes)
+            k (int): Número de n-gramas a retornar
+        
+        Returns:
+            list: Lista de tuplas (n-grama, conteo) ordenadas por frecuencia.
+        """
+        return sorted(((ngram, data['count']) for ngram, data in self.get_ngram_counts(n).items()),
+                      key=lambda x: (-x[1], x[0]))[:k]
+    
     def get_most_common(self, n=10):
         """
         Obtiene las n palabras más comunes.
@@ -67,4 +388,113 @@ class WordCounter:
         """
         Limpia el contador de palabras.
         """
-        self.word_counts.clear() 
\ No newline at end of file
+        self._reset()
+
+
+class GroupedWordCounter:
+    """
+    Clase para contar palabras por hablante y por rol en una sola pasada.
+    """
+    
+    def __init__(self, role_by_speaker=None, **counter_options):
+        """
+        Inicializa el contador agrupado.
+        
+        Args:
+            role_by_speaker (dict or callable, optional): Rol de cada código de hablante.
+                Si es None, 'CHI' es 'children' y el resto 'adults'.
+            **counter_options: Opciones para cada WordCounter creado (approximate, ngram_sizes, ...)
+        """
+        self.role_by_speaker = role_by_speaker
+        self.counter_options = counter_options
+        self.speaker_counters = {}
+        self.role_counters = {}
+    
+    def get_role(self, speaker_code):
+        """
+        Determina el rol de un hablante.
+        
+        Args:
+            speaker_code (str): Código del hablante
+        
+        Returns:
+            str: Rol del hablante
+        """
+        if self.role_by_speaker is None:
+            return 'children' if speaker_code == 'CHI' else 'adults'
+        if callable(self.role_by_speaker):
+            return self.role_by_speaker(speaker_code)
+        return self.role_by_speaker.get(speaker_code, speaker_code)
+    
+    def _get_counter(self, counters, key):
+        """
+        Devuelve el contador asociado a la clave, creándolo si no existe.
+        """
+        counter = counters.get(key)
+        if counter is None:
+            counter = counters[key] = WordCounter(**self.counter_options)
+        return counter
+    
+    def count_utterances(self, utterances):
+        """
+        Cuenta las palabras de una tabla de expresiones. Cada expresión se tokeniza
+        una sola vez y se suma al contador de su hablante y al de su rol.
+        
+        Args:
+            utterances (dict or list): Expresiones con campos 'speaker' y 'text'
+                y, opcionalmente, 'role' para forzar el rol de la expresión.
+        """
+        if isinstance(utterances, dict):
+            utterances = utterances.values()
+        roles = {}
+        for utterance in utterances:
+            if not isinstance(utterance, dict) or 'text' not in utterance:
+                continue
+            speaker = utterance.get('speaker')
+            role = utterance.get('role')
+            if role is None:
+                if speaker not in roles:
+                    roles[speaker] = self.get_role(speaker)
+                role = roles[speaker]
+            words = WordCounter.tokenize(utterance['text'])
+            self._get_counter(self.speaker_counters, speaker).count_tokens(words)
+            self._get_counter(self.role_counters, role).count_tokens(words)
+    
+    def get_speaker_counts(self):
+        """
+        Obtiene el conteo de palabras de cada hablante.
+        
+        Returns:
+            dict: Diccionario {hablante: {palabra: {'count': int}}}
+        """
+        return {speaker: counter.get_word_counts()
+                for speaker, counter in self.speaker_counters.items()}
+    
+    def get_role_counts(self):
+        """
+        Obtiene el conteo de palabras de cada rol.
+        
+        Returns:
+            dict: Diccionario {rol: {palabra: {'count': int}}}
+        """
+        return {role: counter.get_word_counts()
+                for role, counter in self.role_counters.items()}
+    
+    def get_speaker_counter(self, speaker_code):
+        """
+        Devuelve el WordCounter de un hablante o None si no tiene expresiones.
+        """
+        return self.speaker_counters.get(speaker_code)
+    
+    def get_role_counter(self, role):
+        """
+        Devuelve el WordCounter de un rol o None si no tiene expresiones.
+        """
+        return self.role_counters.get(role)
+    
+    def clear(self):
+        """
+        Limpia todos los contadores.
+        """
+        self.speaker_counters.clear()
+        self.role_counters.clear()
@@ -1,20 +1,177 @@
+import numpy as np
+
 class WordDictionaryMerger:
+    # Operaciones de comparación admitidas en los filtros de query
+    COMPARISON_OPERATORS = {
+        'gt': np.greater,
+        'lt': np.less,
+        'ge': np.greater_equal,
+        'le': np.less_equal,
+        'eq': np.equal
+    }
+    
     def __init__(self):
         """
         Inicializa el merger con un array vacío de diccionarios.
         """
         self.dictionaries = []
+        self._reset_state()
+    
+    def _reset_state(self):
+        """
+        Vacía el estado incremental del merge.
+        """
+        # Registros de cada palabra, uno por diccionario que la contiene, en orden de inserción.
+        # Solo los usa sort_by_parameter, así que se crean la primera vez que se ordena
+        self._word_records = None
+        # Palabras comunes a todos los diccionarios con sus datos mergeados. Con un solo
+        # diccionario es None: se crea al añadir el segundo
+        self._merged = None
+        # Palabras no mergeadas de cada diccionario
+        self._unmerged = []
+        # Si es True, el merge se creó recorriendo el segundo diccionario (el menor): las
+        # palabras mergeadas siguen su orden y los no mergeados del primero solo contienen
+        # las palabras que han dejado de ser comunes. Se completan en _complete_first_dictionary
+        self._first_pending = False
+        # Diccionarios incorporados al estado, para detectar cambios en la lista
+        self._state_dictionaries = []
+        self._state_count = 0
+        # Columnas numéricas de query y palabras alineadas con ellas; se descartan al añadir
+        self._columns = {}
+        self._column_words = None
     
     def add_dictionary(self, dictionary):
         """
-        Añade un nuevo diccionario al array.
+        Añade un nuevo diccionario al array y actualiza el merge de forma incremental,
+        con un coste proporcional al tamaño del diccionario añadido. El contenido de los
+        diccionarios no debe modificarse después de añadirlos: esos cambios no se detectan.
         
         Args:
             dictionary (dict): Diccionario que tiene strings como claves principales
         """
         if not isinstance(dictionary, dict):
             raise ValueError("El parámetro debe ser un diccionario")
+        self._sync_state()
         self.dictionaries.append(dictionary)
+        self._add_to_state(dictionary)
+    
+    def _add_to_state(self, dictionary):
+        """
+        Incorpora un diccionario al estado del merge.
+        
+        Args:
+            dictionary (dict): Diccionario añadido
+        """
+        if self._word_records is not None:
+            self._add_word_records(dictionary)
+        self._columns = {}
+        self._column_words = None
+        
+        unmerged_dict = {}
+        if self._state_count == 1 and self._merged is None:
+            # Segundo diccionario: la intersección se hace recorriendo el menor de los dos
+            first_dictionary = self._state_dictionaries[0]
+            merged = self._merged = {}
+            if len(dictionary) < len(first_dictionary):
+                for word, other_data in dictionary.items():
+                    data = first_dictionary.get(word)
+                    if data is None:
+                        unmerged_dict[word] = other_data
+                    else:
+                        merged_data = merged[word] = dict(data)
+                        merged_data.update(other_data)
+                # El resto del primer diccionario se recorre solo si se pide el resultado
+                self._first_pending = True
+            else:
+                first_unmerged = self._unmerged[0]
+                for word, data in first_dictionary.items():
+                    other_data = dictionary.get(word)
+                    if other_data is None:
+                        first_unmerged[word] = data
+                    else:
+                        merged_data = merged[word] = dict(data)
+                        merged_data.update(other_data)
+                for word, data in dictionary.items():
+                    if word not in merged:
+                        unmerged_dict[word] = data
+        elif self._state_count > 0:
+            merged = self._merged
+            for word, data in dictionary.items():
+                merged_data = merged.get(word)
+                if merged_data is None:
+                    unmerged_dict[word] = data
+                else:
+                    merged_data.update(data)
+            # Las palabras comunes que faltan en el diccionario nuevo pasan a los no mergeados
+            # de los anteriores. Cada palabra sale una sola vez, así que el coste se amortiza
+            if len(merged) > len(dictionary) - len(unmerged_dict):
+                dropped = [word for word in merged if word not in dictionary]
+                previous_dictionaries = self.dictionaries[:self._state_count]
+                for word in dropped:
+                    del merged[word]
+                    for previous_unmerged, previous_dictionary in zip(self._unmerged, previous_dictionaries):
+                        previous_unmerged[word] = previous_dictionary[word]
+        self._unmerged.append(unmerged_dict)
+        self._state_dictionaries.append(dictionary)
+        self._state_count += 1
+    
+    def _complete_first_dictionary(self):
+        """
+        Si el merge se creó recorriendo el segundo diccionario, ordena las palabras
+        mergeadas como en el primero y completa sus no mergeados: las palabras que nunca
+        fueron comunes, en su orden, seguidas de las que han dejado de serlo.
+        """
+        if not self._first_pending:
+            return
+        merged = self._merged
+        dropped = self._unmerged[0]
+        ordered_merged = {}
+        first_unmerged = {}
+        for word, data in self._state_dictionaries[0].items():
+            merged_data = merged.get(word)
+            if merged_data is not None:
+                ordered_merged[word] = merged_data
+            elif word not in dropped:
+                first_unmerged[word] = data
+        first_unmerged.update(dropped)
+        self._merged = ordered_merged
+        self._unmerged[0] = first_unmerged
+        self._first_pending = False
+    
+    def _add_word_records(self, dictionary):
+        """
+        Añade los registros de un diccionario al índice palabra -> registros.
+        """
+        word_records = self._word_records
+        for word, data in dictionary.items():
+            records = word_records.get(word)
+            if records is None:
+                word_records[word] = [data]
+            else:
+                records.append(data)
+    
+    def _ensure_word_records(self):
+        """
+        Crea el índice palabra -> registros si aún no existe.
+        """
+        if self._word_records is None:
+            self._word_records = {}
+            for dictionary in self.dictionaries:
+                self._add_word_records(dictionary)
+    
+    def _sync_state(self):
+        """
+        Reconstruye el estado si la lista de diccionarios se ha modificado sin add_dictionary
+        (diccionarios añadidos, quitados o sustituidos). Se compara la identidad de cada
+        diccionario, así que los cambios dentro de un diccionario no se detectan.
+        """
+        state_dictionaries = self._state_dictionaries
+        if (len(state_dictionaries) != len(self.dictionaries)
+                or any(state_dictionary is not dictionary for state_dictionary, dictionary
+                       in zip(state_dictionaries, self.dictionaries))):
+            self._reset_state()
+            for dictionary in self.dictionaries:
+                self._add_to_state(dictionary)
     
     def sort_by_parameter(self, parameter, comparison_op, threshold=None):
         """
@@ -26,39 +183,132 @@ class WordDictionaryMerger:
             threshold (float, optional): Valor umbral para la comparación
             
         Returns:
-            dict: Diccionario con las palabras que cumplen la condición, ordenadas por el parámetro
+            dict: Diccionario con las palabras que cumplen la condición, ordenadas por el parámetro.
+                 Los datos de cada palabra son un diccionario nuevo con sus registros de todos
+                 los diccionarios mergeados; los diccionarios añadidos no se modifican
         """
         if not self.dictionaries:
             return {}
-            
-        # Obtener todas las palabras y sus datos
-        all_words_data = {}
-        for dictionary in self.dictionaries:
-            for word, data in dictionary.items():
-                if word not in all_words_data:
-                    all_words_data[word] = data
-                else:
-                    all_words_data[word].update(data)
-        
-        # Filtrar y ordenar según la condición
-        filtered_words = {}
-        for word, data in all_words_data.items():
-            if parameter in data:
-                value = data[parameter]
-                if isinstance(value, (int, float)):
-                    if comparison_op == 'gt' and (threshold is None or value > threshold):
-                        filtered_words[word] = data
-                    elif comparison_op == 'lt' and (threshold is None or value < threshold):
-                        filtered_words[word] = data
-        
-        # Ordenar el diccionario por el parámetro
-        sorted_words = dict(sorted(
-            filtered_words.items(),
-            key=lambda x: x[1][parameter],
-            reverse=(comparison_op == 'gt')
-        ))
-        
-        return sorted_words
+        self._sync_state()
+        self._ensure_word_records()
+        
+        # Filtrar según la condición; si varios diccionarios tienen el parámetro, gana el último
+        filtered_words = []
+        for word, records in self._word_records.items():
+            for data in reversed(records):
+                if parameter in data:
+                    value = data[parameter]
+                    if isinstance(value, (int, float)):
+                        if comparison_op == 'gt' and (threshold is None or value > threshold):
+                            filtered_words.append((value, word, records))
+                        elif comparison_op == 'lt' and (threshold is None or value < threshold):
+                            filtered_words.append((value, word, records))
+                    break
+        
+        # Ordenar por el parámetro
+        filtered_words.sort(key=lambda x: x[0], reverse=(comparison_op == 'gt'))
+        
+        return {word: self._merged_record(records) for _, word, records in filtered_words}
+    
+    def _column(self, parameter):
+        """
+        Devuelve el valor numérico de un parámetro para cada palabra de _word_records
+        (NaN si ninguna de sus entradas lo tiene o no es numérico; gana el último diccionario).
+        
+        Args:
+            parameter (str): Nombre del parámetro
+        
+        Returns:
+            numpy.ndarray: Columna de valores
+        """
+        column = self._columns.get(parameter)
+        if column is None:
+            values = []
+            for records in self._word_records.values():
+                value = np.nan
+                for data in reversed(records):
+                    if parameter in data:
+                        if isinstance(data[parameter], (int, float)):
+                            value = data[parameter]
+                        break
+                values.append(value)
+            column = self._columns[parameter] = np.array(values, dtype=np.float64)
+        return column
+    
+    def query(self, sort_by, filters=None, limit=None):
+        """
+        Selecciona y ordena palabras por varios parámetros a la vez.
+        
+        Args:
+            sort_by (list): Claves de ordenación en orden de prioridad, como tuplas
+                (parámetro, 'desc' o 'asc'), por ejemplo [('rating', 'desc'), ('n_ratings', 'desc')]
+            filters (dict, optional): Umbrales {parámetro: (operación, umbral)} con operación
+                'gt', 'lt', 'ge', 'le' o 'eq', por ejemplo {'prop_known': ('ge', 0.9)}
+            limit (int, optional): Número máximo de palabras a devolver
+        
+        Returns:
+            dict: Diccionario ordenado con las palabras que tienen valores numéricos en todas
+                 las claves de ordenación y cumplen todos los filtros. Los datos de cada
+                 palabra son un diccionario nuevo, como en sort_by_parameter
+        """
+        if not sort_by:
+            raise ValueError("Debe indicarse al menos una clave de ordenación")
+        for parameter, order in sort_by:
+            if order not in ('desc', 'asc'):
+                raise ValueError(f"Orden no válido para {parameter}: {order}")
+        filters = filters or {}
+        for parameter, (comparison_op, _) in filters.items():
+            if comparison_op not in self.COMPARISON_OPERATORS:
+                raise ValueError(f"Operación de comparación no válida para {parameter}: {comparison_op}")
+        if not self.dictionaries or (limit is not None and limit <= 0):
+            return {}
+        self._sync_state()
+        self._ensure_word_records()
+        
+        mask = np.ones(len(self._word_records), dtype=bool)
+        for parameter, _ in sort_by:
+            mask &= ~np.isnan(self._column(parameter))
+        for parameter, (comparison_op, threshold) in filters.items():
+            # Las comparaciones con NaN son falsas, así que se descartan los valores ausentes
+            mask &= self.COMPARISON_OPERATORS[comparison_op](self._column(parameter), threshold)
+        candidates = np.flatnonzero(mask)
+        
+        # Claves en orden ascendente: las descendentes se niegan
+        keys = [self._column(parameter)[candidates] * (-1.0 if order == 'desc' else 1.0)
+                for parameter, order in sort_by]
+        if limit is not None and limit < len(candidates):
+            # Solo hace falta ordenar las palabras cuya clave principal no supera la
+            # limit-ésima (incluidos los empates, que deciden las demás claves)
+            kth_value = keys[0][np.argpartition(keys[0], limit - 1)[limit - 1]]
+            keep = keys[0] <= kth_value
+            candidates = candidates[keep]
+            keys = [key[keep] for key in keys]
+        # lexsort es estable y ordena por la última clave primero
+        order = np.lexsort(keys[::-1])[:limit]
+        
+        if self._column_words is None:
+            self._column_words = list(self._word_records)
+        words = self._column_words
+        word_records = self._word_records
+        return {words[index]: self._merged_record(word_records[words[index]])
+                for index in candidates[order].tolist()}
+    
+    @staticmethod
+    def _merged_record(records):
+        """
+        Mergea los registros de una palabra en un diccionario nuevo, sin modificar los
+        diccionarios de entrada. Las claves de los registros posteriores tienen prioridad.
+        
+        Args:
+            records (list): Registros de la palabra en orden de inserción
+        
+        Returns:
+            dict: Datos mergeados de la palabra
+        """
+        merged_data = {}
+        for data in records:
+            merged_data.update(data)
+        return merged_data
     
     def obtain_merge(self):
         """
@@ -66,38 +316,21 @@ class WordDictionaryMerger:
         1. Un diccionario con las palabras que aparecen en todos los diccionarios, mergeando sus datos
         2. Un array con los diccionarios de palabras que no se pudieron mergear
         
+        Ambos se mantienen de forma incremental en add_dictionary, así que obtenerlos solo
+        cuesta copiarlos (y, si el segundo diccionario era menor que el primero, recorrer
+        una vez el primero): los resultados ya devueltos no cambian al añadir diccionarios.
+        Las palabras mergeadas siguen el orden del primer diccionario y las que dejan de
+        ser comunes se añaden al final de los no mergeados.
+        
         Returns:
             tuple: (merged_dict, unmerged_dictionaries)
         """
         if not self.dictionaries:
             return {}, []
+        self._sync_state()
+        self._complete_first_dictionary()
+        merged = self._merged if self._merged is not None else self.dictionaries[0]
+        merged_dict = {word: dict(data) for word, data in merged.items()}
         
-        # Obtener todas las palabras únicas
-        all_words = set()
-        for dictionary in self.dictionaries:
-            all_words.update(dictionary.keys())
-        
-        # Encontrar palabras comunes a todos los diccionarios
-        common_words = set(all_words)
-        for dictionary in self.dictionaries:
-            common_words.intersection_update(dictionary.keys())
-        
-        # Crear el diccionario mergeado
-        merged_dict = {}
-        for word in common_words:
-            merged_data = {}
-            for dictionary in self.dictionaries:
-                merged_data.update(dictionary[word])
-            merged_dict[word] = merged_data
-        
-        # Crear los diccionarios no mergeados
-        unmerged_dictionaries = []
-        for dictionary in self.dictionaries:
-            unmerged_dict = {}
-            for word, data in dictionary.items():
-                if word not in common_words:
-                    unmerged_dict[word] = data
-            if unmerged_dict:  # Solo añadir si hay palabras no mergeadas
-                unmerged_dictionaries.append(unmerged_dict)
-        
-        return merged_dict, unmerged_dictionaries 
\ No newline at end of file
+        # Solo añadir los diccionarios con palabras no mergeadas
+        return merged_dict, [dict(unmerged_dict) for unmerged_dict in self._unmerged if unmerged_dict]
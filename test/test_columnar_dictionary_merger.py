@@ -0,0 +1,121 @@
+import random
+import pytest
+import pandas as pd
+from src.columnar_dictionary_merger import ColumnarDictionaryMerger
+from src.word_dictionary_merger import WordDictionaryMerger
+
+def random_dictionaries(seed, num_dictionaries=4, vocabulary_size=40):
+    """
+    Genera diccionarios con vocabularios solapados, parámetros compartidos entre
+    diccionarios, registros heterogéneos, algún valor no numérico, un parámetro con
+    valores enteros y float mezclados y otro presente en todos los registros, solo
+    entero o mezclado con float según el diccionario.
+    """
+    rng = random.Random(seed)
+    vocabulary = [f'palabra{i}' for i in range(vocabulary_size)]
+    parameters = ['rating', 'count', 'prop_known', 'aoa']
+    dictionaries = []
+    for _ in range(num_dictionaries):
+        dictionary = {}
+        mixed_frequency = rng.random() < 0.5
+        for word in rng.sample(vocabulary, rng.randint(vocabulary_size // 2, vocabulary_size)):
+            record = {'frequency': rng.randint(0, 9)}
+            if mixed_frequency and rng.random() < 0.5:
+                record['frequency'] += 0.5
+            for parameter in rng.sample(parameters, rng.randint(1, len(parameters))):
+                if parameter == 'count':
+                    record[parameter] = rng.randint(0, 5)
+                elif parameter == 'aoa' and rng.random() < 0.3:
+                    record[parameter] = rng.randint(1, 7)
+                elif rng.random() < 0.05:
+                    record[parameter] = 'alto'
+                else:
+                    record[parameter] = round(rng.uniform(0, 7), 1)
+            dictionary[word] = record
+        dictionaries.append(dictionary)
+    return dictionaries
+
+def build_mergers(dictionaries):
+    reference = WordDictionaryMerger()
+    columnar = ColumnarDictionaryMerger()
+    for dictionary in dictionaries:
+        reference.add_dictionary(dictionary)
+        columnar.add_dictionary(dictionary)
+    return reference, columnar
+
+def as_plain(result):
+    # Con el tipo de cada valor: 3 == 3.0, pero un entero no debe volver como float
+    return [(word, {key: (value, type(value)) for key, value in data.items()})
+            for word, data in result.items()]
+
+@pytest.mark.parametrize('seed', range(10))
+def test_obtain_merge_equivalence(seed):
+    reference, columnar = build_mergers(random_dictionaries(seed))
+    expected_merged, expected_unmerged = reference.obtain_merge()
+    merged, unmerged = columnar.obtain_merge()
+    assert as_plain(merged) == as_plain(expected_merged)
+    # En los no mergeados no se compara el orden de las palabras
+    assert [dict(as_plain(unmerged_dict)) for unmerged_dict in unmerged] == [
+        dict(as_plain(unmerged_dict)) for unmerged_dict in expected_unmerged]
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('parameter, comparison_op, threshold', [
+    ('rating', 'gt', None), ('rating', 'gt', 3.5), ('count', 'lt', 3), ('aoa', 'lt', None)])
+def test_sort_by_parameter_equivalence(seed, parameter, comparison_op, threshold):
+    reference, columnar = build_mergers(random_dictionaries(seed))
+    expected = reference.sort_by_parameter(parameter, comparison_op, threshold)
+    assert as_plain(columnar.sort_by_parameter(parameter, comparison_op, threshold)) == as_plain(expected)
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('sort_by, filters, limit', [
+    ([('rating', 'desc'), ('count', 'asc')], None, 5),
+    ([('count', 'desc'), ('prop_known', 'desc')], {'rating': ('ge', 2.0)}, None),
+    ([('aoa', 'asc')], {'count': ('eq', 3), 'prop_known': ('lt', 6.0)}, 3)])
+def test_query_equivalence(seed, sort_by, filters, limit):
+    reference, columnar = build_mergers(random_dictionaries(seed))
+    expected = reference.query(sort_by, filters, limit)
+    assert as_plain(columnar.query(sort_by, filters, limit)) == as_plain(expected)
+
+def test_missing_values_are_dropped():
+    # None y NaN se tratan como ausentes, mientras que WordDictionaryMerger los conserva
+    dictionaries = [{'casa': {'rating': 4.5, 'count': 2}, 'perro': {'rating': None, 'count': 1}},
+                    {'casa': {'count': None}, 'perro': {'aoa': float('nan')}}]
+    reference, columnar = build_mergers(dictionaries)
+    assert reference.obtain_merge()[0] == {'casa': {'rating': 4.5, 'count': None},
+                                           'perro': {'rating': None, 'count': 1, 'aoa': dictionaries[1]['perro']['aoa']}}
+    merged, _ = columnar.obtain_merge()
+    assert as_plain(merged) == as_plain({'casa': {'rating': 4.5, 'count': 2}, 'perro': {'count': 1}})
+
+def test_mixed_int_and_float_values_keep_their_type():
+    merger = ColumnarDictionaryMerger()
+    merger.add_dictionary({'d': {'count': 1}, 'i': {'count': 2.5}})
+    merged, _ = merger.obtain_merge()
+    assert as_plain(merged) == as_plain({'d': {'count': 1}, 'i': {'count': 2.5}})
+
+def test_empty_merger():
+    merger = ColumnarDictionaryMerger()
+    assert merger.obtain_merge() == ({}, [])
+    assert merger.query([('rating', 'desc')]) == {}
+    with pytest.raises(ValueError):
+        merger.add_dictionary('no es un diccionario')
+
+def test_join_and_dataframes():
+    merger = ColumnarDictionaryMerger()
+    merger.add_dataframe(pd.DataFrame({'word': ['casa', 'perro', 'gato'], 'rating': [4.5, 3.8, 4.2]}),
+                         word_column='word')
+    merger.add_dictionary({'perro': {'count': 3}, 'casa': {'count': 1, 'rating': 5.0}})
+    
+    inner = merger.join('inner')
+    assert inner.index.tolist() == ['casa', 'perro']
+    assert inner.loc['casa', 'rating'] == 5.0
+    outer = merger.join('outer')
+    assert outer.index.tolist() == ['casa', 'perro', 'gato']
+    assert pd.isna(outer.loc['gato', 'count'])
+    
+    merged, unmerged = merger.obtain_merge(as_dict=False)
+    assert isinstance(merged, pd.DataFrame)
+    assert unmerged[0].index.tolist() == ['gato']
+    with pytest.raises(ValueError):
+        merger.join('left')
+    with pytest.raises(ValueError):
+        merger.add_dataframe(pd.DataFrame({'rating': [1, 2]}, index=['a', 'a']))
@@ -0,0 +1,127 @@
+import matplotlib
+matplotlib.use('Agg')
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from src.data_analysis_plotter import DataAnalysisPlotter, cumulative_counts, hash_plot_data
+
+def group_stats(iconic_words, non_iconic_words=None):
+    non_iconic_words = non_iconic_words or {}
+    iconic_total = sum(data['count'] for data in iconic_words.values())
+    non_iconic_total = sum(non_iconic_words.values())
+    return {
+        'total_words': iconic_total + non_iconic_total,
+        'iconic_words': iconic_words,
+        'non_iconic_words': non_iconic_words,
+        'total_iconic_occurrences': iconic_total,
+        'total_non_iconic_occurrences': non_iconic_total,
+        'unique_iconic_words': set(iconic_words),
+        'unique_non_iconic_words': set(non_iconic_words)
+    }
+
+@pytest.fixture
+def sample_data():
+    return {
+        '01Y02Q': {
+            # Valoraciones que se saltan varios intervalos de 0.25
+            'adults': group_stats({'casa': {'count': 2, 'rating': 1.0},
+                                   'perro': {'count': 1, 'rating': 2.0},
+                                   'gato': {'count': 1, 'rating': 3.0}}, {'the': 5}),
+            'children': group_stats({'perro': {'count': 3, 'rating': 2.0}})
+        },
+        '01Y03Q': {
+            'adults': group_stats({}, {'the': 2}),
+            'children': group_stats({})
+        }
+    }
+
+@pytest.fixture
+def plotter(sample_data):
+    return DataAnalysisPlotter(sample_data)
+
+def test_cumulative_counts():
+    ratings = np.array([3.0, 1.0, 2.0, 1.0])
+    counts = np.array([1.0, 2.0, 4.0, 3.0])
+    thresholds = np.array([0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5])
+    assert cumulative_counts(ratings, counts, thresholds).tolist() == [0, 5, 5, 9, 9, 10, 10]
+
+def test_compute_cumulative_iconicity(plotter):
+    curves = plotter.compute_cumulative_iconicity()
+    # Los grupos sin palabras icónicas se omiten
+    assert list(curves) == ['01Y02Q']
+    group = curves['01Y02Q']
+    assert group['ratings'].tolist() == pytest.approx([1.0 + 0.25 * i for i in range(9)])
+    assert group['adults'].tolist() == pytest.approx([50, 50, 50, 50, 75, 75, 75, 75, 100])
+    assert group['children'].tolist() == pytest.approx([0, 0, 0, 0, 100, 100, 100, 100, 100])
+
+def test_compute_cumulative_iconicity_without_children_data(sample_data):
+    sample_data['01Y02Q']['children'] = group_stats({})
+    curves = DataAnalysisPlotter(sample_data).compute_cumulative_iconicity(bin_width=1.0)
+    assert curves['01Y02Q']['ratings'].tolist() == [1.0, 2.0, 3.0]
+    assert curves['01Y02Q']['children'] is None
+
+def test_plot_iconicity_distribution_saves_files(plotter, tmp_path):
+    plotter.plot_iconicity_distribution_by_age_group(save_dir=str(tmp_path))
+    assert [path.name for path in tmp_path.iterdir()] == ['distribucion_iconicidad_01Y02Q.png']
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_render_figures(plotter, tmp_path, max_workers):
+    distribution_dir = tmp_path / 'distribucion'
+    paths = plotter.render_figures(str(tmp_path / 'barras'), str(distribution_dir), max_workers=max_workers)
+    assert [os.path.basename(path) for path in paths] == [
+        'iconic_vs_non_iconic_by_age.png',
+        'iconic_vs_non_iconic_by_age_adults.png',
+        'iconic_vs_non_iconic_by_age_children.png',
+        'distribucion_iconicidad_01Y02Q.png'
+    ]
+    assert paths[-1] == str(distribution_dir / 'distribucion_iconicidad_01Y02Q.png')
+    assert all(os.path.getsize(path) > 0 for path in paths)
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_render_figures_keeps_backend(plotter, tmp_path, max_workers):
+    matplotlib.use('svg')
+    try:
+        plotter.render_figures(str(tmp_path), max_workers=max_workers)
+        assert matplotlib.get_backend() == 'svg'
+    finally:
+        matplotlib.use('Agg')
+
+def test_render_figures_skips_unchanged_figures(sample_data, tmp_path):
+    output_dir = str(tmp_path)
+    paths = DataAnalysisPlotter(sample_data).render_figures(output_dir, max_workers=1)
+    assert os.path.exists(os.path.join(output_dir, '.plot_manifest.json'))
+    mtimes = {path: os.stat(path).st_mtime_ns for path in paths}
+    
+    # Mismos datos: no se vuelve a generar ninguna gráfica
+    DataAnalysisPlotter(sample_data).render_figures(output_dir, max_workers=1)
+    assert {path: os.stat(path).st_mtime_ns for path in paths} == mtimes
+    
+    # Un cambio en los niños solo afecta a su distribución y a las barras con datos de niños
+    sample_data['01Y02Q']['children']['iconic_words']['perro']['rating'] = 2.5
+    sample_data['01Y02Q']['children']['total_words'] = 4
+    DataAnalysisPlotter(sample_data).render_figures(output_dir, max_workers=1)
+    changed = {os.path.basename(path) for path in paths if os.stat(path).st_mtime_ns != mtimes[path]}
+    assert changed == {'iconic_vs_non_iconic_by_age.png', 'iconic_vs_non_iconic_by_age_children.png',
+                       'distribucion_iconicidad_01Y02Q.png'}
+    
+    # Un archivo borrado se vuelve a generar aunque sus datos no hayan cambiado
+    os.remove(paths[1])
+    DataAnalysisPlotter(sample_data).render_figures(output_dir, max_workers=1)
+    assert os.path.exists(paths[1])
+
+def test_hash_plot_data():
+    curves = {'ratings': np.arange(3.0), 'adults': None}
+    assert hash_plot_data('plot', (curves,)) == hash_plot_data('plot', ({'adults': None, 'ratings': np.arange(3.0)},))
+    assert hash_plot_data('plot', (curves,)) != hash_plot_data('plot', ({'ratings': np.arange(4.0), 'adults': None},))
+    assert hash_plot_data('plot', (curves,)) != hash_plot_data('other', (curves,))
+
+def test_import_does_not_load_plotting_libraries():
+    # En un intérprete nuevo, porque este módulo de tests ya importa matplotlib
+    code = ("import sys; from src.data_analysis_plotter import DataAnalysisPlotter; "
+            "print(sorted(m for m in ('matplotlib', 'seaborn', 'pandas') if m in sys.modules))")
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', code], cwd=root_dir,
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip() == '[]'
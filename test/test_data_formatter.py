@@ -64,4 +64,15 @@ def test_get_data_methods(formatter, test_files):
     assert children_data is not None
     assert adults_data is not None
     assert len(children_data) == 2
-    assert len(adults_data) == 1
\ No newline at end of file
+    assert len(adults_data) == 1
+
+def test_get_utterances_data(formatter, test_files):
+    formatter.format_cha_data_from(test_files['cha'])
+    
+    utterances = formatter.get_utterances_data()
+    assert len(utterances) == 3
+    assert [entry['speaker'] for entry in utterances.values()] == ['CHI', 'MOT', 'CHI']
+    
+    # Cada archivo reinicia la tabla, como las numeraciones de niños y adultos
+    formatter.format_cha_data_from(test_files['cha'])
+    assert list(formatter.get_utterances_data()) == [1, 2, 3]
@@ -0,0 +1,76 @@
+import json
+import os
+import pytest
+from src.external_dictionary_merger import ExternalDictionaryMerger
+from src.word_dictionary_merger import WordDictionaryMerger
+
+@pytest.fixture
+def sample_dictionaries():
+    return [
+        {
+            'casa': {'n_ratings': 10, 'rating': 4.5},
+            'perro': {'n_ratings': 12, 'rating': 3.8},
+            'gato': {'n_ratings': 8, 'rating': 4.2},
+            'agua': {'n_ratings': 9, 'rating': 3.1}
+        },
+        {
+            'casa': {'prop_known': 0.8, 'rating': 5.0},
+            'perro': {'prop_known': 0.9},
+            'mesa': {'prop_known': 0.7},
+            'agua': {'prop_known': 1.0}
+        },
+        {
+            'agua': {'count': 7},
+            'casa': {'count': 100},
+            'perro': {'count': 80},
+            'silla': {'count': 60}
+        }
+    ]
+
+@pytest.fixture
+def merger(tmp_path):
+    # Tramos de dos registros y solo dos abiertos a la vez, para forzar varias pasadas
+    with ExternalDictionaryMerger(temp_dir=str(tmp_path), run_size=2, max_open_runs=2) as merger:
+        yield merger
+
+def test_matches_in_memory_merge(merger, sample_dictionaries):
+    reference = WordDictionaryMerger()
+    for dictionary in sample_dictionaries:
+        merger.add_dictionary(dictionary)
+        reference.add_dictionary(dictionary)
+    
+    merged, unmerged = merger.obtain_merge()
+    expected_merged, expected_unmerged = reference.obtain_merge()
+    assert merged == expected_merged
+    assert list(merged) == ['agua', 'casa', 'perro']
+    assert merged['casa']['rating'] == 5.0
+    assert unmerged == expected_unmerged
+    # El merge se puede repetir sobre los tramos ya consolidados
+    assert merger.obtain_merge() == (merged, unmerged)
+
+def test_streaming_records_and_write_merge(merger, tmp_path):
+    merger.add_records((f'palabra{i % 5}', {'a': i}) for i in range(10))
+    merger.add_records([('palabra1', {'b': 1}), ('palabra3', {'b': 3})])
+    
+    merged_path = tmp_path / 'merged.jsonl'
+    unmerged_path = tmp_path / 'unmerged.jsonl'
+    assert merger.write_merge(str(merged_path), str(unmerged_path)) == (2, 3)
+    lines = [json.loads(line) for line in merged_path.read_text().splitlines()]
+    # Las palabras repetidas en una fuente se combinan y ganan los registros posteriores
+    assert lines == [['palabra1', {'a': 6, 'b': 1}], ['palabra3', {'a': 8, 'b': 3}]]
+    assert len(unmerged_path.read_text().splitlines()) == 3
+
+def test_close_removes_temporary_files(tmp_path):
+    merger = ExternalDictionaryMerger(temp_dir=str(tmp_path))
+    merger.add_dictionary({'casa': {'rating': 4.5}})
+    assert len(os.listdir(tmp_path)) == 1
+    merger.close()
+    assert os.listdir(tmp_path) == []
+
+def test_invalid_arguments(merger, tmp_path):
+    with pytest.raises(ValueError):
+        merger.add_dictionary('no es un diccionario')
+    with pytest.raises(ValueError):
+        ExternalDictionaryMerger(temp_dir=str(tmp_path), run_size=0)
+    with pytest.raises(ValueError):
+        ExternalDictionaryMerger(temp_dir=str(tmp_path), max_open_runs=1)
@@ -0,0 +1,68 @@
+import pickle
+import pytest
+from src.fuzzy_word_index import FuzzyWordIndex, deletion_variants, edit_distance
+
+@pytest.fixture
+def index():
+    return FuzzyWordIndex(['horse', 'dog', 'doggy', 'banana', 'kitten', 'bird'],
+                          priorities=[1, 1, 1, 1, 1, 1])
+
+def test_edit_distance():
+    assert edit_distance('horse', 'horse', 2) == 0
+    assert edit_distance('horsie', 'horse', 2) == 1
+    assert edit_distance('ab', 'ba', 2) == 1
+    assert edit_distance('kitten', 'sitting', 3) == 3
+    # Por encima del máximo devuelve max_distance + 1
+    assert edit_distance('kitten', 'sitting', 2) == 3
+    assert edit_distance('a', 'abcdef', 2) == 3
+
+def test_deletion_variants():
+    assert deletion_variants('abc', 1) == {'abc', 'bc', 'ac', 'ab'}
+    assert 'a' in deletion_variants('abc', 2)
+    assert deletion_variants('abcdef', 0, prefix_length=3) == {'abc'}
+
+def test_nearest(index):
+    assert index.nearest('horse') == ('horse', 0)
+    assert index.nearest('horsie') == ('horse', 1)
+    assert index.nearest('doggie') == ('doggy', 2)
+    assert index.nearest('nana') == ('banana', 2)
+    assert index.nearest('elephant') is None
+    # Los tokens cortos solo se buscan de forma exacta
+    assert index.nearest('dg') is None
+    assert index.nearest_index('dog') == (1, 0)
+
+def test_priorities_break_ties():
+    index = FuzzyWordIndex(['cart', 'card'], max_distance=1, priorities=[0.2, 0.9])
+    assert index.nearest('carx') == ('card', 1)
+
+def test_common_prefix_breaks_ties():
+    # Misma distancia: gana la palabra con el prefijo común más largo, antes que la prioridad
+    index = FuzzyWordIndex(['baggie', 'doggy'], priorities=[0.9, 0.1])
+    assert index.nearest('doggie') == ('doggy', 2)
+
+def test_ignore_case():
+    index = FuzzyWordIndex(['Baggie', 'May', 'may'], priorities=[1, 0.5, 0.9])
+    assert index.nearest('baggies') == ('Baggie', 1)
+    assert index.nearest('MAY') == ('may', 0)
+    assert FuzzyWordIndex(['Baggie'], ignore_case=False).nearest('baggie') == ('Baggie', 1)
+
+def test_results_are_cached(index):
+    index.nearest('horsie')
+    index.nearest('horsie')
+    assert index._nearest_cached.cache_info().hits == 1
+    index.clear_cache()
+    assert index._nearest_cached.cache_info().currsize == 0
+
+def test_pickle(index):
+    index.nearest('horsie')
+    restored = pickle.loads(pickle.dumps(index))
+    assert restored.nearest('horsie') == ('horse', 1)
+    assert restored._nearest_cached.cache_info().maxsize == index.cache_size
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        FuzzyWordIndex(['dog'], max_distance=-1)
+    with pytest.raises(ValueError):
+        FuzzyWordIndex(['dog'], max_distance=2, prefix_length=2)
+    with pytest.raises(ValueError):
+        FuzzyWordIndex(['dog', 'cat'], priorities=[1])
@@ -1,5 +1,9 @@
+import os
+import pickle
 import pytest
-from src.iconicity_model import IconicityModel
+import numpy as np
+import pandas as pd
+from src.iconicity_model import IconicityModel, normalize_token, token_candidates
 
 @pytest.fixture
 def sample_data():
@@ -166,4 +170,341 @@ def test_get_all_word_data(model):
     assert gato_data['n'] == 15
     assert gato_data['prop_known'] == 0.7
     assert gato_data['rating'] == 4.2
-    assert gato_data['rating_sd'] == 1.1 
\ No newline at end of file
+    assert gato_data['rating_sd'] == 1.1
+
+def test_array_backed_columns(model):
+    # Columnas paralelas alineadas con el índice palabra -> posición
+    index = model.word_index['perro']
+    assert model.words[index] == 'perro'
+    assert model.rating[index] == 3.8
+    assert model.n_ratings[index] == 12
+    assert model.n_ratings.dtype.kind == 'i'
+    assert model.prop_known.dtype.kind == 'f'
+
+def test_missing_counts_are_kept_as_float(sample_data):
+    sample_data[1]['n'] = None
+    sample_data[2]['n_ratings'] = float('nan')
+    model = IconicityModel(sample_data)
+    
+    # Como en el modelo basado en diccionarios, los conteos ausentes no impiden construirlo
+    assert model.n.dtype.kind == 'f'
+    assert np.isnan(model.get_word_data('casa')['n'])
+    assert np.isnan(model.get_word_data('perro')['n_ratings'])
+    assert model.get_word_data('gato')['n_ratings'] == 8
+    assert model.get_word_data('gato')['n'] == 15
+
+def test_non_numeric_entries_are_dropped(sample_data, caplog):
+    sample_data[2]['rating'] = 'N/A'
+    sample_data[3]['n'] = '15'
+    with caplog.at_level('WARNING', logger='src.iconicity_model'):
+        model = IconicityModel(sample_data)
+    # Las entradas se validan al construir el modelo, antes de la primera consulta
+    assert not model.is_loaded
+    assert 'Entradas descartadas por datos incompletos: 1' in caplog.text
+    assert model.get_all_words() == ['casa', 'gato']
+    # Los números como texto se convierten y el modelo sigue respondiendo a las consultas
+    assert model.get_word_data('gato')['n'] == 15
+    assert list(model.get_words_by_rating(min_rating=4.0)) == ['gato', 'casa']
+
+def test_filters_return_python_values(model):
+    words = model.get_words_by_rating(min_rating=4.3)
+    assert words == {'casa': {'n_ratings': 10, 'n': 15, 'prop_known': 0.8, 'rating': 4.5, 'rating_sd': 1.2}}
+    assert type(words['casa']['rating']) is float
+    assert type(words['casa']['n']) is int
+    assert model.get_words_by_rating(min_rating=10) == {}
+
+def test_duplicate_word_overrides(sample_data):
+    sample_data[4] = dict(sample_data[1], rating=1.0)
+    model = IconicityModel(sample_data)
+    assert len(model.get_all_words()) == 3
+    assert model.get_word_data('casa')['rating'] == 1.0
+
+def test_get_words_in_range_sorted(model):
+    words = model.get_words_in_range('rating', 4.0, 5.0)
+    assert list(words) == ['gato', 'casa']
+    assert list(model.get_words_in_range('rating_sd', max_value=1.1)) == ['perro', 'gato']
+    assert model.get_words_in_range('rating', 4.6, 4.7) == {}
+    with pytest.raises(ValueError):
+        model.get_words_in_range('n', 1, 2)
+
+def test_get_top_words(model):
+    assert list(model.get_top_words('rating', 2)) == ['casa', 'gato']
+    assert list(model.get_top_words('prop_known', 1, highest=False)) == ['gato']
+    assert len(model.get_top_words('rating', 10)) == 3
+
+def test_query_combined_ranges(model):
+    words = model.query(rating=(4.0, None), prop_known=(0.75, None))
+    assert list(words) == ['casa']
+    assert set(model.query(rating=(3.0, 4.3), rating_sd=(None, 1.05))) == {'perro'}
+    assert model.query(rating=(4.0, None), prop_known=(0.95, None)) == {}
+    assert len(model.query()) == 3
+
+def test_range_ignores_nan(sample_data):
+    sample_data[4] = dict(sample_data[1], word='sin_rating', rating=float('nan'))
+    model = IconicityModel(sample_data)
+    assert 'sin_rating' not in model.get_words_by_rating(min_rating=0)
+    assert 'sin_rating' not in model.get_top_words('rating', 4)
+
+def test_lookup_many_words(model):
+    ratings, found = model.lookup_many(['gato', 'mesa', 'casa'])
+    assert found.tolist() == [True, False, True]
+    assert ratings[0] == 4.2
+    assert np.isnan(ratings[1])
+    assert ratings[2] == 4.5
+    
+    known, _ = model.lookup_many(['perro'], field='prop_known')
+    assert known.tolist() == [0.9]
+
+def test_lookup_many_token_ids(model):
+    with pytest.raises(ValueError):
+        model.lookup_many(np.array([0, 1]))
+    
+    model.bind_vocabulary({'mesa': 0, 'perro': 1, 'casa': 2})
+    ratings, found = model.lookup_many(np.array([2, 0, 1, 2]))
+    assert found.tolist() == [True, False, True, True]
+    assert ratings[[0, 2, 3]].tolist() == [4.5, 3.8, 4.5]
+    
+    model.bind_vocabulary(['gato', 'silla'])
+    assert model.lookup_many(np.array([1, 0]))[1].tolist() == [False, True]
+
+def test_save_and_load_snapshot(model, tmp_path):
+    csv_path = tmp_path / 'ratings.csv'
+    csv_path.write_text('word,n_ratings,n,prop_known,rating,rating_sd\n')
+    snapshot_path = str(tmp_path / 'ratings.npz')
+    model.save(snapshot_path, source_path=str(csv_path))
+    
+    loaded = IconicityModel.load(snapshot_path, source_path=str(csv_path))
+    assert loaded.get_all_word_data() == model.get_all_word_data()
+    assert list(loaded.get_top_words('rating', 1)) == ['casa']
+    
+    # Un CSV distinto invalida el snapshot
+    csv_path.write_text('word,n_ratings,n,prop_known,rating,rating_sd\nguau,1,1,1.0,6.5,0.1\n')
+    with pytest.raises(ValueError):
+        IconicityModel.load(snapshot_path, source_path=str(csv_path))
+
+def test_load_or_build(tmp_path):
+    csv_path = str(tmp_path / 'ratings.csv')
+    snapshot_path = str(tmp_path / 'ratings.npz')
+    with open(csv_path, 'w') as f:
+        f.write('word,n_ratings,n,prop_known,rating,rating_sd\nguau,10,12,0.9,6.5,0.5\n')
+    
+    built = IconicityModel.load_or_build(csv_path, snapshot_path)
+    assert built.get_word_data('guau')['rating'] == 6.5
+    assert IconicityModel.load_or_build(csv_path, snapshot_path).get_all_words() == ['guau']
+    
+    # Si el CSV cambia se reconstruye el modelo
+    with open(csv_path, 'a') as f:
+        f.write('miau,10,12,0.8,6.0,0.5\n')
+    assert set(IconicityModel.load_or_build(csv_path, snapshot_path).get_all_words()) == {'guau', 'miau'}
+
+@pytest.mark.parametrize('size', [0, 100, None])
+def test_load_or_build_rebuilds_damaged_snapshot(tmp_path, size):
+    csv_path = str(tmp_path / 'ratings.csv')
+    snapshot_path = str(tmp_path / 'ratings.npz')
+    with open(csv_path, 'w') as f:
+        f.write('word,n_ratings,n,prop_known,rating,rating_sd\nguau,10,12,0.9,6.5,0.5\n')
+    IconicityModel.load_or_build(csv_path, snapshot_path)
+    
+    # Snapshot vacío, truncado o cortado a la mitad, como tras una escritura interrumpida
+    with open(snapshot_path, 'rb') as f:
+        content = f.read()
+    with open(snapshot_path, 'wb') as f:
+        f.write(content[:len(content) // 2 if size is None else size])
+    assert IconicityModel.load_or_build(csv_path, snapshot_path).get_all_words() == ['guau']
+    # El snapshot se ha vuelto a escribir completo, sin dejar archivos temporales
+    assert IconicityModel.load(snapshot_path, source_path=csv_path).get_all_words() == ['guau']
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['ratings.csv', 'ratings.npz']
+
+def test_from_dataframe(sample_data):
+    df = pd.DataFrame(list(sample_data.values()))
+    model = IconicityModel.from_dataframe(df)
+    assert model.get_all_word_data() == IconicityModel(sample_data).get_all_word_data()
+
+def test_from_dataframe_drops_bad_rows():
+    df = pd.DataFrame({
+        'word': ['guau', None, 'miau', 'pío', 'guau'],
+        'n_ratings': [10, 10, 'x', 10, 12],
+        'n': [12, 12, 12, 12, 12],
+        'prop_known': [0.9, 0.9, 0.9, None, 0.8],
+        'rating': [6.5, 6.0, 6.0, 6.0, 6.1],
+        'rating_sd': [0.5, 0.5, 0.5, 0.5, 0.4]
+    })
+    model = IconicityModel.from_dataframe(df)
+    assert model.get_all_words() == ['guau']
+    assert model.get_word_data('guau')['rating'] == 6.1
+    
+    with pytest.raises(ValueError):
+        IconicityModel.from_dataframe(df.drop(columns=['rating_sd']))
+
+def test_from_dataframe_matches_constructor(sample_data):
+    sample_data[4] = dict(sample_data[1], rating=1.5, n_ratings=10.5)
+    df = pd.DataFrame(list(sample_data.values()))
+    model = IconicityModel.from_dataframe(df)
+    
+    # Una palabra repetida conserva su primera posición con los datos de la última fila
+    expected = IconicityModel(sample_data)
+    assert model.get_all_words() == expected.get_all_words() == ['casa', 'perro', 'gato']
+    assert model.get_all_word_data() == expected.get_all_word_data()
+    # Los conteos no enteros no se truncan
+    assert model.get_word_data('casa')['rating'] == 1.5
+    assert model.get_word_data('casa')['n_ratings'] == 10.5
+
+def test_from_csv(tmp_path):
+    csv_path = tmp_path / 'ratings.csv'
+    csv_path.write_text('word,n_ratings,n,prop_known,rating,rating_sd\n'
+                        'null,10,11,0.9,5.6,1.8\n'
+                        'guau,10,12,,6.5,0.5\n')
+    model = IconicityModel.from_csv(str(csv_path))
+    # 'null' es una palabra, no un valor ausente
+    assert model.get_all_words() == ['null']
+    assert model.get_word_data('null')['n'] == 11
+
+def test_normalize_token():
+    assert normalize_token('Doggie') == 'doggie'
+    assert normalize_token('&-uh') == 'uh'
+    assert normalize_token('an(d)') == 'and'
+    assert normalize_token('no:') == 'no'
+    assert normalize_token('gaga@b') == 'gaga'
+    assert normalize_token('choo+choo') == 'choo+choo'
+
+def test_token_candidates():
+    assert token_candidates('Choo+choo') == ['Choo+choo', 'choo+choo', 'choo-choo', 'choochoo', 'choo choo']
+    assert token_candidates('dogs', {'dogs': 'dog'}) == ['dogs', 'dog']
+
+def test_resolve_normalized_tokens(sample_data):
+    sample_data[4] = dict(sample_data[1], word='choo-choo')
+    model = IconicityModel(sample_data)
+    assert model.resolve_index('casa') == model.word_index['casa']
+    assert model.get_normalized_word_data('CASA') is model.get_word_data('casa')
+    assert model.get_normalized_word_data('choo+choo') is model.get_word_data('choo-choo')
+    assert model.resolve_index('gatos') == -1
+    
+    model.configure_normalization(lemma_map={'gatos': 'gato'})
+    assert model.get_normalized_word_data('Gatos')['rating'] == 4.2
+    ratings, found = model.lookup_many(['Gatos', 'mesa'], normalize=True)
+    assert found.tolist() == [True, False]
+    assert ratings[0] == 4.2
+
+def test_normalization_cache_is_bounded(model):
+    model.configure_normalization(cache_size=2)
+    for token in ['A', 'B', 'C', 'A']:
+        model.resolve_index(token)
+    info = model._resolve_cached.cache_info()
+    assert info.currsize == 2
+    assert info.misses == 4
+
+def test_pickle_with_normalization_cache(model):
+    model.configure_normalization(lemma_map={'gatos': 'gato'}, cache_size=8)
+    assert model.resolve_index('Gatos') == model.word_index['gato']
+    
+    restored = pickle.loads(pickle.dumps(model))
+    assert restored.resolve_index('Gatos') == restored.word_index['gato']
+    info = restored._resolve_cached.cache_info()
+    assert info.maxsize == 8
+    assert info.currsize == 1
+    
+    # También con el índice aproximado ya construido
+    model.find_nearest_word('Gatto')
+    assert pickle.loads(pickle.dumps(model)).find_nearest_word('Gatto') == ('gato', 1)
+
+def test_weighted_rating_stats(model):
+    stats = model.weighted_rating_stats({'casa': {'count': 3}, 'perro': {'count': 1}, 'mesa': {'count': 5}})
+    assert stats['total_count'] == 4
+    assert stats['matched_words'] == 2
+    assert stats['weighted_mean'] == pytest.approx((3 * 4.5 + 3.8) / 4)
+    assert stats['weighted_sd'] == pytest.approx(np.sqrt((3 * 0.175 ** 2 + 0.525 ** 2) / 4))
+    expected_se = np.sqrt(9 * 1.2 ** 2 / 10 + 1.0 ** 2 / 12) / 4
+    assert stats['standard_error'] == pytest.approx(expected_se)
+    
+    # Conteos como array alineado con el modelo
+    counts = np.zeros(3)
+    counts[model.word_index['gato']] = 2
+    assert model.weighted_rating_stats(counts)['weighted_mean'] == pytest.approx(4.2)
+    empty = model.weighted_rating_stats({'mesa': 1})
+    assert np.isnan(empty['weighted_mean'])
+    assert type(empty['total_count']) is type(stats['total_count']) is float
+
+def test_rating_bins_and_histogram(model):
+    edges = model.get_rating_bin_edges(2)
+    assert edges.tolist() == pytest.approx([3.8, 4.2, 4.5])
+    assert model.get_rating_bin_edges(2) is edges
+    
+    histogram, _ = model.weighted_rating_histogram({'casa': 3, 'perro': 1, 'gato': 2}, n_bins=2)
+    assert histogram.tolist() == [1, 5]
+    with pytest.raises(ValueError):
+        model.get_rating_bin_edges(0)
+
+def test_lazy_construction(sample_data, caplog):
+    model = IconicityModel(sample_data)
+    assert not model.is_loaded
+    assert model.load_time is None
+    with caplog.at_level('INFO', logger='src.iconicity_model'):
+        assert model.get_word_data('gato')['rating'] == 4.2
+    assert model.is_loaded
+    assert model.load_time >= 0
+    assert 'Modelo de iconicidad cargado: 3 palabras' in caplog.text
+
+def test_lazy_construction_snapshots_inputs(sample_data, tmp_path):
+    # Modificar las entradas después de construir el modelo no le afecta
+    model = IconicityModel(sample_data)
+    sample_data[1]['rating'] = 1.0
+    sample_data[4] = dict(sample_data[2], word='mesa')
+    assert model.get_all_words() == ['casa', 'perro', 'gato']
+    assert model.get_word_data('casa')['rating'] == 4.5
+    
+    df = pd.DataFrame(list(sample_data.values()))
+    model = IconicityModel.from_dataframe(df)
+    df.loc[0, 'rating'] = 7.0
+    assert model.get_word_data('casa')['rating'] == 1.0
+    
+    # El CSV se lee y su cabecera se comprueba al construir el modelo
+    path = tmp_path / 'ratings.csv'
+    with pytest.raises(FileNotFoundError):
+        IconicityModel.from_csv(str(path))
+    path.write_text("word,rating\nsol,3.0\n")
+    with pytest.raises(ValueError):
+        IconicityModel.from_csv(str(path))
+    path.write_text("word,n_ratings,n,prop_known,rating,rating_sd\nsol,5,6,1.0,3.0,0.5\n")
+    model = IconicityModel.from_csv(str(path))
+    assert not model.is_loaded
+    path.write_text("word,n_ratings,n,prop_known,rating,rating_sd\nluna,5,6,1.0,3.0,0.5\n")
+    assert model.get_all_words() == ['sol']
+    
+    # Las columnas de un snapshot son las que se validaron en load
+    snapshot_path = str(tmp_path / 'model.npz')
+    model.save(snapshot_path)
+    loaded = IconicityModel.load(snapshot_path)
+    IconicityModel.from_csv(str(path)).save(snapshot_path)
+    assert loaded.get_all_words() == ['sol']
+
+def test_incomplete_entries_are_logged(sample_data, caplog):
+    sample_data[4] = {'word': 'mesa', 'rating': 2.0}
+    with caplog.at_level('DEBUG', logger='src.iconicity_model'):
+        model = IconicityModel(sample_data)
+        assert len(model.get_all_words()) == 3
+    assert 'Entrada 4 no tiene todos los campos requeridos' in caplog.text
+    assert 'Entradas descartadas por datos incompletos: 1' in caplog.text
+
+def test_fuzzy_resolution(model):
+    assert model.find_nearest_word('Gatto') == ('gato', 1)
+    assert model.find_nearest_word('elefante') is None
+    assert model.get_fuzzy_index(2) is model.get_fuzzy_index(2)
+    
+    assert model.resolve_index('perrito') == -1
+    model.configure_normalization(max_distance=2)
+    assert model.resolve_index('perrito') == model.word_index['perro']
+    values, found = model.lookup_many(['casita', 'perrito'], normalize=True)
+    assert found.tolist() == [True, True]
+    assert values[1] == 3.8
+
+def test_fuzzy_resolution_on_ratings_csv():
+    csv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'iconicity_ratings_cleaned.csv')
+    model = IconicityModel.from_csv(csv_path)
+    assert model.find_nearest_word('doggie') == ('doggy', 2)
+    assert model.find_nearest_word('Doggie') == ('doggy', 2)
+    assert model.find_nearest_word('nana') in (('nanny', 2), ('banana', 2))
+    assert model.find_nearest_word('dogs') == ('dog', 1)
+    assert model.find_nearest_word('kitty') == ('kitty', 0)
+    # Las palabras con mayúsculas del CSV se encuentran desde tokens en minúsculas
+    assert model.find_nearest_word('baggie') == ('Baggie', 0)
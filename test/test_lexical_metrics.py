@@ -0,0 +1,56 @@
+import pytest
+from src.lexical_metrics import LexicalMetrics, count_morphemes
+
+@pytest.fixture
+def metrics():
+    return LexicalMetrics(window_size=3)
+
+def test_count_morphemes():
+    mor = [
+        ('pron', 'he', ('Prs', 'Nom', 'S3')),
+        ('verb', 'want', ('Fin', 'Ind', 'Pres', 'S3')),
+        ('noun', 'dog', ('Plur',)),
+        ('verb', 'go', ('Part', 'Pres', 'S')),
+        ('aux', 'be', ('Fin', 'Ind', 'Pres', 'S3'))
+    ]
+    # he + want-s + dog-s + go-ing + is
+    assert count_morphemes(mor) == 8
+
+def test_mlu_and_ttr(metrics):
+    metrics.add_utterance(['guau', 'guau'], {'age_group': '01Y01Q'})
+    metrics.add_utterance(['el', 'perro', 'guau', 'guau'], {'age_group': '01Y01Q'})
+    
+    result = metrics.get_metrics('age_group')['01Y01Q']
+    assert result['utterances'] == 2
+    assert result['tokens'] == 6
+    assert result['types'] == 3
+    assert result['mlu_words'] == 3.0
+    assert result['ttr'] == 0.5
+    assert result['mlu_morphemes'] is None
+
+def test_mattr_sliding_window(metrics):
+    # Ventanas de 3: [a b a] [b a c] [a c c] -> (2 + 3 + 2) / 3 / 3
+    metrics.add_utterance(['a', 'b', 'a', 'c', 'c'], {'file': 'f1'})
+    result = metrics.get_metrics('file')['f1']
+    assert result['mattr'] == pytest.approx(7 / 9)
+    
+    # Con menos palabras que la ventana el MATTR es el TTR
+    metrics.add_utterance(['a', 'a'], {'file': 'f2'})
+    assert metrics.get_metrics('file')['f2']['mattr'] == 0.5
+
+def test_several_levels_in_one_pass(metrics):
+    metrics.add_text('Choo choo', {'child': 'Lew', 'age_group': '01Y01Q'},
+                     mor_items=[('noun', 'choochoo', ())])
+    metrics.add_text('more', {'child': 'Lew', 'age_group': '01Y02Q'},
+                     mor_items=[('adj', 'more', ())])
+    
+    assert metrics.get_metrics('child')['Lew']['utterances'] == 2
+    assert metrics.get_metrics('child')['Lew']['mlu_morphemes'] == 1.0
+    assert set(metrics.get_metrics('age_group')) == {'01Y01Q', '01Y02Q'}
+    assert metrics.get_metrics('age_group')['01Y01Q']['mlu_words'] == 2.0
+    metrics.clear()
+    assert metrics.get_metrics('child') == {}
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        LexicalMetrics(window_size=0)
@@ -0,0 +1,72 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.lexical_norm_store import LexicalNormStore
+from src.iconicity_model import IconicityModel
+
+@pytest.fixture
+def norm_files(tmp_path):
+    aoa_path = tmp_path / 'aoa.csv'
+    aoa_path.write_text('word,aoa,freq\ncasa,2.5,100\nperro,3.0,80\nmesa,4.0,\n')
+    concreteness_path = tmp_path / 'concreteness.csv'
+    concreteness_path.write_text('palabra,concreteness\nperro,4.9\nsilla,4.8\n')
+    return {'aoa': str(aoa_path), 'concreteness': str(concreteness_path)}
+
+@pytest.fixture
+def store(norm_files):
+    store = LexicalNormStore()
+    store.add_norm('aoa', norm_files['aoa'])
+    store.add_norm('concreteness', norm_files['concreteness'], word_column='palabra')
+    return store
+
+def test_columns_load_lazily(store):
+    assert set(store.get_column_names()) == {'aoa', 'freq', 'concreteness'}
+    assert store.words == []
+    
+    aoa = store.get_column('aoa')
+    assert store.words == ['casa', 'perro', 'mesa']
+    assert aoa.tolist() == [2.5, 3.0, 4.0]
+    assert 'freq' not in store._columns
+
+def test_join_by_index_alignment(store):
+    words, columns = store.join(['aoa', 'concreteness'])
+    assert words == ['perro']
+    assert columns['aoa'].tolist() == [3.0]
+    assert columns['concreteness'].tolist() == [4.9]
+    
+    words, columns = store.join(['aoa', 'concreteness'], how='outer')
+    assert words == ['casa', 'perro', 'mesa', 'silla']
+    assert np.isnan(columns['aoa'][3])
+
+def test_to_dict_and_lookup(store):
+    assert store.to_dict(['aoa', 'freq']) == {
+        'casa': {'aoa': 2.5, 'freq': 100.0},
+        'perro': {'aoa': 3.0, 'freq': 80.0}
+    }
+    outer = store.to_dict(['freq', 'concreteness'], how='outer')
+    assert outer['silla'] == {'concreteness': 4.8}
+    assert 'mesa' not in outer
+    values, found = store.lookup_many(['silla', 'gato'], 'concreteness')
+    assert found.tolist() == [True, False]
+    assert values[0] == 4.8
+
+def test_add_iconicity_model_and_dataframe():
+    model = IconicityModel.from_dataframe(pd.DataFrame({
+        'word': ['casa', 'perro'], 'n_ratings': [10, 12], 'n': [15, 15],
+        'prop_known': [0.8, 0.9], 'rating': [4.5, 3.8], 'rating_sd': [1.2, 1.0]
+    }))
+    store = LexicalNormStore()
+    store.add_iconicity_model(model)
+    store.add_dataframe('aoa', pd.DataFrame({'word': ['perro', 'gato'], 'rating': [3.0, 3.5]}),
+                        prefix='aoa_')
+    assert store.to_dict(['rating', 'aoa_rating']) == {'perro': {'rating': 3.8, 'aoa_rating': 3.0}}
+
+def test_invalid_norms(store, norm_files):
+    with pytest.raises(ValueError):
+        store.add_norm('aoa', norm_files['aoa'])
+    with pytest.raises(ValueError):
+        store.add_norm('aoa2', norm_files['aoa'])
+    with pytest.raises(ValueError):
+        store.add_norm('otra', norm_files['concreteness'])
+    with pytest.raises(ValueError):
+        store.get_column('inexistente')
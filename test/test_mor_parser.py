@@ -0,0 +1,61 @@
+import pytest
+import os
+from src.mor_parser import MorParser
+
+@pytest.fixture
+def parser():
+    return MorParser()
+
+@pytest.fixture
+def test_cha(tmp_path):
+    test_cha_path = tmp_path / 'test_data.cha'
+    test_cha_path.write_text("""@UTF8
+@Participants: CHI Target_Child, MOT Mother
+*MOT: that's a doggie . 1525_4985
+%mor:	pron|that-Dem-S1~aux|be-Fin-Ind-Pres-S3 det|a-Ind-Art noun|doggie .
+%gra:	1|4|NSUBJ 2|4|COP 3|4|DET 4|0|ROOT 5|4|PUNCT
+*CHI: dogs 1555_4975
+%mor:	noun|dog-Plur .
+*CHI: xxx 1585_7985""", encoding='utf-8')
+    return str(test_cha_path)
+
+def test_parse_mor_line(parser):
+    items = parser.parse_mor_line('verb|eat-Fin-Imp-S noun|dinner~pron|it-Prs-Acc-S3 noun|choo-choo .')
+    assert items == [
+        ('verb', 'eat', ('Fin', 'Imp', 'S')),
+        ('noun', 'dinner', ()),
+        ('pron', 'it', ('Prs', 'Acc', 'S3')),
+        ('noun', 'choo-choo', ())
+    ]
+
+def test_parse_mor_line_leading_hyphen(parser):
+    # Un lema que no encaja con el patrón se conserva entero en lugar de fallar
+    items = parser.parse_mor_line('suffix|-ing noun|dog-Plur')
+    assert items == [('suffix', '-ing', ()), ('noun', 'dog', ('Plur',))]
+
+def test_parse_file(parser, test_cha):
+    utterances = parser.parse_file(test_cha)
+    assert len(utterances) == 2
+    assert utterances[0]['speaker'] == 'MOT'
+    assert [lemma for _, lemma, _ in utterances[0]['mor']] == ['that', 'be', 'a', 'doggie']
+    assert utterances[1] == {'speaker': 'CHI', 'mor': [('noun', 'dog', ('Plur',))]}
+
+def test_parse_file_cached(parser, test_cha):
+    first = parser.parse_file(test_cha)
+    assert parser.parse_file(test_cha) is first
+    
+    # Si el archivo cambia se vuelve a analizar
+    with open(test_cha, 'a', encoding='utf-8') as f:
+        f.write("\n*CHI: more\n%mor:\tadj|more .")
+    assert len(parser.parse_file(test_cha)) == 3
+
+def test_parse_file_disk_cache(test_cha, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    expected = MorParser(cache_dir=cache_dir).parse_file(test_cha)
+    assert len(os.listdir(cache_dir)) == 1
+    
+    # Un parser nuevo reutiliza el análisis guardado en disco
+    assert MorParser(cache_dir=cache_dir).parse_file(test_cha) == expected
+
+def test_parse_missing_file(parser):
+    assert parser.parse_file('no_existe.cha') is None
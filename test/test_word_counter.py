@@ -1,5 +1,5 @@
 import pytest
-from src.word_counter import WordCounter
+from src.word_counter import WordCounter, GroupedWordCounter
 
 @pytest.fixture
 def word_counter():
@@ -68,4 +68,149 @@ def test_case_insensitive(word_counter):
     # Verificar resultados
     assert counts['hola']['count'] == 2
     assert counts['mundo']['count'] == 2
-    assert counts['python']['count'] == 1 
\ No newline at end of file
+    assert counts['python']['count'] == 1 
+
+def test_approximate_exact_when_under_capacity():
+    # Con menos palabras que la capacidad el modo aproximado es exacto
+    counter = WordCounter(approximate=True, capacity=10)
+    counter.count_words({1: {'text': 'hola mundo hola'}, 2: {'text': 'mundo python'}})
+    counts = counter.get_word_counts()
+    assert counts['hola'] == {'count': 2, 'error': 0}
+    assert counts['mundo'] == {'count': 2, 'error': 0}
+    assert counts['python'] == {'count': 1, 'error': 0}
+
+def test_approximate_bounded_memory():
+    counter = WordCounter(approximate=True, capacity=5)
+    text = ' '.join(['guau'] * 50 + ['miau'] * 30 + [f'raro{i}' for i in range(40)])
+    counter.count_words(text)
+    
+    # Nunca se monitorizan más palabras que la capacidad
+    assert len(counter.get_word_counts()) <= 5
+    
+    # Space-Saving conserva las palabras con frecuencia > N / capacity (120 / 5)
+    heavy = {word: (count, error) for word, count, error in counter.get_heavy_hitters(2)}
+    assert set(heavy) == {'guau', 'miau'}
+    for word, real in [('guau', 50), ('miau', 30)]:
+        count, error = heavy[word]
+        assert count - error <= real <= count
+
+def test_approximate_count_estimate(word_counter):
+    counter = WordCounter(approximate=True, capacity=1)
+    counter.count_words('guau guau guau miau')
+    
+    # El Count-Min sketch nunca subestima
+    assert counter.get_count_estimate('guau') >= 3
+    assert counter.get_count_estimate('miau') >= 1
+    word_counter.count_words('guau guau')
+    assert word_counter.get_count_estimate('Guau') == 2
+
+def test_approximate_clear():
+    counter = WordCounter(approximate=True, capacity=2)
+    counter.count_words('a b c d')
+    counter.clear()
+    assert counter.get_word_counts() == {}
+    assert counter.get_count_estimate('a') == 0
+
+def test_approximate_invalid_capacity():
+    with pytest.raises(ValueError):
+        WordCounter(approximate=True, capacity=0)
+
+def test_ngram_counts_within_utterance():
+    counter = WordCounter(ngram_sizes=(2, 3))
+    counter.count_words({
+        1: {'text': 'choo choo train'},
+        2: {'text': 'uh oh choo choo'}
+    })
+    
+    bigrams = counter.get_ngram_counts(2)
+    assert bigrams['choo choo']['count'] == 2
+    assert bigrams['uh oh']['count'] == 1
+    # Sin cruzar el límite entre expresiones
+    assert 'train uh' not in bigrams
+    
+    trigrams = counter.get_ngram_counts(3)
+    assert trigrams == {
+        'choo choo train': {'count': 1},
+        'uh oh choo': {'count': 1},
+        'oh choo choo': {'count': 1}
+    }
+    
+    # Los unigramas se cuentan en la misma pasada
+    assert counter.get_word_counts()['choo']['count'] == 4
+    assert counter.get_most_common_ngrams(2, 1) == [('choo choo', 2)]
+
+def test_ngram_counts_across_utterances():
+    counter = WordCounter(ngram_sizes=(2,), ngrams_within_utterance=False)
+    counter.count_words('uh')
+    counter.count_words('oh')
+    assert counter.get_ngram_counts(2) == {'uh oh': {'count': 1}}
+
+def test_ngram_counts_approximate_bounded():
+    counter = WordCounter(approximate=True, capacity=3, ngram_sizes=(2,))
+    counter.count_words({i: {'text': f'uh oh raro{i}'} for i in range(30)})
+    
+    # Los n-gramas también respetan la capacidad y no crece el vocabulario
+    bigrams = counter.get_ngram_counts(2)
+    assert len(bigrams) <= 3
+    assert counter.vocabulary == {}
+    count, error = bigrams['uh oh']['count'], bigrams['uh oh']['error']
+    assert count - error <= 30 <= count
+    assert counter.get_most_common_ngrams(2, 1)[0][0] == 'uh oh'
+    
+    counter.clear()
+    assert counter.get_ngram_counts(2) == {}
+
+def test_ngram_invalid_size(word_counter):
+    with pytest.raises(ValueError):
+        WordCounter(ngram_sizes=(1,))
+    with pytest.raises(ValueError):
+        word_counter.get_ngram_counts(2)
+
+def test_grouped_counter_one_pass():
+    utterances = {
+        1: {'speaker': 'CHI', 'text': 'guau guau'},
+        2: {'speaker': 'MOT', 'text': 'el perro hace guau'},
+        3: {'speaker': 'FAT', 'text': 'guau'},
+        4: {'speaker': 'CHI', 'text': 'perro'}
+    }
+    counter = GroupedWordCounter()
+    counter.count_utterances(utterances)
+    
+    speakers = counter.get_speaker_counts()
+    assert set(speakers) == {'CHI', 'MOT', 'FAT'}
+    assert speakers['CHI']['guau']['count'] == 2
+    assert speakers['FAT']['guau']['count'] == 1
+    
+    roles = counter.get_role_counts()
+    assert roles['children']['perro']['count'] == 1
+    assert roles['adults']['guau']['count'] == 2
+    assert roles['adults']['perro']['count'] == 1
+
+def test_grouped_counter_roles_and_options():
+    counter = GroupedWordCounter(role_by_speaker={'CHI': 'target', 'INV': 'investigator'},
+                                 ngram_sizes=(2,))
+    counter.count_utterances([
+        {'speaker': 'CHI', 'text': 'uh oh'},
+        {'speaker': 'INV', 'text': 'uh oh'},
+        {'speaker': 'MOT', 'text': 'uh oh', 'role': 'target'}
+    ])
+    
+    assert counter.get_role_counter('target').get_ngram_counts(2)['uh oh']['count'] == 2
+    assert counter.get_role_counter('investigator').get_word_counts()['oh']['count'] == 1
+    assert counter.get_speaker_counter('XXX') is None
+    counter.clear()
+    assert counter.get_speaker_counts() == {}
+
+def test_count_lemmas(word_counter):
+    utterances = [
+        {'speaker': 'CHI', 'mor': [('noun', 'dog', ('Plur',))]},
+        {'speaker': 'MOT', 'mor': [('noun', 'dog', ()), ('verb', 'eat', ('Fin', 'Imp', 'S'))]}
+    ]
+    word_counter.count_lemmas(utterances)
+    counts = word_counter.get_word_counts()
+    assert counts['dog']['count'] == 2
+    assert counts['eat']['count'] == 1
+    
+    pos_counter = WordCounter()
+    pos_counter.count_lemmas(utterances[1]['mor'], include_pos=True)
+    assert set(pos_counter.get_word_counts()) == {'noun|dog', 'verb|eat'}
@@ -1,3 +1,4 @@
+import json
 import pytest
 from src.word_dictionary_merger import WordDictionaryMerger
 
@@ -178,4 +179,161 @@ def test_sort_by_parameter_non_numeric():
     sorted_words = merger.sort_by_parameter('rating', 'gt')
     assert len(sorted_words) == 1
     assert 'perro' in sorted_words
-    assert 'casa' not in sorted_words 
\ No newline at end of file
+    assert 'casa' not in sorted_words
+
+def test_obtain_merge_disjoint_and_order(merger):
+    merger.add_dictionary({'b': {'x': 1}, 'a': {'x': 2}, 'c': {'x': 3}})
+    merger.add_dictionary({'a': {'y': 1}, 'b': {'y': 2}})
+    merger.add_dictionary({'d': {'z': 1}})
+    merged, unmerged = merger.obtain_merge()
+    assert merged == {}
+    assert len(unmerged) == 3
+    
+    merger.dictionaries.pop()
+    merged, unmerged = merger.obtain_merge()
+    # El orden del merge sigue al primer diccionario y las entradas no se modifican
+    assert list(merged) == ['b', 'a']
+    assert merged['a'] == {'x': 2, 'y': 1}
+    assert merger.dictionaries[0]['a'] == {'x': 2}
+    assert unmerged == [{'c': {'x': 3}}]
+
+def test_sort_by_parameter_does_not_mutate_inputs():
+    merger = WordDictionaryMerger()
+    dict1 = {'casa': {'rating': 4.5}, 'perro': {'rating': 3.8}}
+    dict2 = {'casa': {'n_ratings': 10, 'rating': 5.0}}
+    merger.add_dictionary(dict1)
+    merger.add_dictionary(dict2)
+    
+    sorted_words = merger.sort_by_parameter('rating', 'gt')
+    # Los diccionarios posteriores tienen prioridad
+    assert list(sorted_words) == ['casa', 'perro']
+    assert sorted_words['casa'] == {'rating': 5.0, 'n_ratings': 10}
+    assert dict1 == {'casa': {'rating': 4.5}, 'perro': {'rating': 3.8}}
+    assert dict2 == {'casa': {'n_ratings': 10, 'rating': 5.0}}
+    
+    # Los datos son diccionarios propios: se pueden serializar y modificar sin tocar las entradas
+    assert type(sorted_words['casa']) is dict
+    assert json.loads(json.dumps(sorted_words)) == sorted_words
+    sorted_words['perro']['rating'] = 0.0
+    assert dict1['perro'] == {'rating': 3.8}
+    assert merger.sort_by_parameter('rating', 'lt', 4.0)['perro']['rating'] == 3.8
+
+def test_incremental_merge_matches_full_merge(sample_dictionaries):
+    merger = WordDictionaryMerger()
+    merger.add_dictionary(sample_dictionaries[0])
+    # El merge se puede pedir en cualquier momento y sigue actualizándose después
+    merged, unmerged = merger.obtain_merge()
+    assert set(merged) == {'casa', 'perro', 'gato'}
+    assert unmerged == []
+    for dictionary in sample_dictionaries[1:]:
+        merger.add_dictionary(dictionary)
+        assert merger.sort_by_parameter('rating', 'gt')['casa']['rating'] == 4.5
+    
+    merged, unmerged = merger.obtain_merge()
+    assert set(merged) == {'casa', 'perro'}
+    assert merged['perro']['frequency'] == 80
+    assert unmerged == [{'gato': sample_dictionaries[0]['gato']},
+                        {'mesa': sample_dictionaries[1]['mesa']},
+                        {'silla': sample_dictionaries[2]['silla']}]
+    
+    # Una palabra que deja de ser común pasa a los no mergeados de todos los anteriores
+    merger.add_dictionary({'perro': {'aoa': 3.1}})
+    merged, unmerged = merger.obtain_merge()
+    assert merged == {'perro': {'n_ratings': 12, 'rating': 3.8, 'prop_known': 0.9,
+                                'rating_sd': 1.0, 'frequency': 80, 'length': 5, 'aoa': 3.1}}
+    assert [sorted(unmerged_dict) for unmerged_dict in unmerged] == [
+        ['casa', 'gato'], ['casa', 'mesa'], ['casa', 'silla']]
+
+def test_obtain_merge_results_are_independent(merger):
+    merger.add_dictionary({'a': {'x': 1}, 'b': {'x': 2}})
+    merger.add_dictionary({'a': {'y': 1}, 'b': {'y': 2}})
+    merged, unmerged = merger.obtain_merge()
+    
+    # Los resultados ya devueltos no cambian al añadir diccionarios
+    merger.add_dictionary({'a': {'z': 1}})
+    assert merged == {'a': {'x': 1, 'y': 1}, 'b': {'x': 2, 'y': 2}}
+    assert unmerged == []
+    later_merged, later_unmerged = merger.obtain_merge()
+    assert later_merged == {'a': {'x': 1, 'y': 1, 'z': 1}}
+    assert later_unmerged == [{'b': {'x': 2}}, {'b': {'y': 2}}]
+    
+    # Ni al modificar lo devuelto cambia el estado del merger
+    later_merged['a']['x'] = 0
+    later_unmerged[0].clear()
+    assert merger.obtain_merge() == ({'a': {'x': 1, 'y': 1, 'z': 1}}, [{'b': {'x': 2}}, {'b': {'y': 2}}])
+
+def test_smaller_second_dictionary_is_walked(merger):
+    class WatchedDict(dict):
+        walked = False
+        
+        def items(self):
+            self.walked = True
+            return super().items()
+    
+    first = WatchedDict((word, {'x': index}) for index, word in enumerate('abcdef'))
+    merger.add_dictionary(first)
+    merger.add_dictionary({'e': {'y': 1}, 'b': {'y': 2}, 'z': {'y': 3}})
+    # La intersección se hace desde el segundo diccionario, sin recorrer el primero
+    assert not first.walked
+    merger.add_dictionary({'e': {'w': 1}})
+    assert not first.walked
+    
+    merged, unmerged = merger.obtain_merge()
+    assert merged == {'e': {'x': 4, 'y': 1, 'w': 1}}
+    # Los no mergeados del primero mantienen su orden, con las palabras que dejan de ser comunes al final
+    assert list(unmerged[0]) == ['a', 'c', 'd', 'f', 'b']
+    assert unmerged[1:] == [{'z': {'y': 3}, 'b': {'y': 2}}]
+
+def test_merged_order_follows_first_dictionary(merger):
+    merger.add_dictionary({word: {'x': 1} for word in 'dcbaef'})
+    merger.add_dictionary({word: {'y': 1} for word in 'abcd'})
+    merged, unmerged = merger.obtain_merge()
+    assert list(merged) == ['d', 'c', 'b', 'a']
+    assert list(unmerged[0]) == ['e', 'f']
+
+def test_replaced_dictionary_is_detected(merger):
+    merger.add_dictionary({'a': {'x': 1}, 'b': {'x': 2}})
+    merger.add_dictionary({'a': {'y': 1}})
+    merger.dictionaries[1] = {'b': {'y': 2}}
+    assert merger.obtain_merge()[0] == {'b': {'x': 2, 'y': 2}}
+    
+    merger.dictionaries[0] = {'c': {'x': 3}}
+    merger.add_dictionary({'c': {'z': 3}})
+    merged, unmerged = merger.obtain_merge()
+    assert merged == {}
+    assert len(unmerged) == 3
+
+def test_query_multiple_keys_filters_and_limit():
+    merger = WordDictionaryMerger()
+    merger.add_dictionary({
+        'casa': {'rating': 4.5, 'prop_known': 0.9},
+        'perro': {'rating': 3.8, 'prop_known': 1.0},
+        'gato': {'rating': 4.5, 'prop_known': 0.95},
+        'mesa': {'rating': 2.0, 'prop_known': 0.5},
+        'silla': {'rating': 'alto', 'prop_known': 0.99}
+    })
+    merger.add_dictionary({'casa': {'count': 10}, 'perro': {'count': 30}, 'gato': {'count': 5}})
+    
+    result = merger.query([('rating', 'desc'), ('prop_known', 'desc')])
+    assert list(result) == ['gato', 'casa', 'perro', 'mesa']
+    assert result['casa']['count'] == 10
+    
+    result = merger.query([('rating', 'desc'), ('prop_known', 'asc')], limit=2)
+    assert list(result) == ['casa', 'gato']
+    
+    result = merger.query([('count', 'asc')], filters={'prop_known': ('ge', 0.9), 'rating': ('gt', 4.0)})
+    assert list(result) == ['gato', 'casa']
+    
+    # Las columnas se recalculan al añadir diccionarios
+    merger.add_dictionary({'mesa': {'count': 1}})
+    assert list(merger.query([('count', 'asc')], limit=1)) == ['mesa']
+    assert merger.query([('rating', 'desc')], limit=0) == {}
+
+def test_query_invalid_arguments(merger):
+    merger.add_dictionary({'casa': {'rating': 4.5}})
+    with pytest.raises(ValueError):
+        merger.query([])
+    with pytest.raises(ValueError):
+        merger.query([('rating', 'up')])
+    with pytest.raises(ValueError):
+        merger.query([('rating', 'desc')], filters={'rating': ('ne', 1)})